@@ -0,0 +1,339 @@
+"""
+MSP430 statik zamanlama ve yığın analizi.
+
+Derlenmiş modülün komutlarını (pass1 adresleri + pass2 word'leri) simülatörün
+çözücüsüyle çözer, her komuta adresleme moduna göre cycle maliyeti verir,
+basic block'ları ve CALL/RET/jump hedeflerinden çağrı grafiğini kurar. Her
+.text label'ı için döngüsüz yollar üzerindeki en kötü cycle sayısı ve en
+fazla yığın kullanımı raporlanır. Döngü geri kenarları ve özyineleme bir kez
+sayılır ve sonuçta işaretlenir; extern çağrıların gövdesi bilinmez.
+
+    python msp430_analysis.py main.asm [--json analiz.json] [--listing main.lst]
+"""
+import argparse
+import json
+import os
+import sys
+from array import array
+from bisect import bisect_left
+
+from msp430_assembler import MSP430Assembler, clean_source, write_listing
+from msp430_sim import decode, JUMPS, REG, INC, CONST, IMM, PC, SP
+
+# blok sonlandıran komut türleri
+FALL, BRANCH, COND, RETURN, HALT, INDIRECT = range(6)
+
+
+class Node:
+    """Tek bir komut: kaynak satırı, çözülmüş komut, akış türü ve çağrı hedefi."""
+    __slots__ = ("index", "ins", "kind", "callee", "stack")
+
+    def __init__(self, index, ins, kind=FALL, callee=None, stack=0):
+        self.index = index    # kaynak satırı (0 tabanlı)
+        self.ins = ins
+        self.kind = kind
+        self.callee = callee  # CALL: label adı
+        self.stack = stack    # SP değişimi (PUSH +2, POP -2...)
+
+
+class Block:
+    __slots__ = ("start", "nodes", "succs")
+
+    def __init__(self, start):
+        self.start = start
+        self.nodes = []
+        self.succs = []
+
+
+def _classify(ins):
+    # komutun akış türü ve yığına etkisi
+    name = ins.mnemonic
+    if name in JUMPS:
+        if ins.target == ins.addr:
+            return HALT, 0
+        return (BRANCH if name == "JMP" else COND), 0
+    if name in ("RET", "RETI"):
+        return RETURN, 0
+    if name == "PUSH":
+        return FALL, 2
+    dst = ins.dst
+    if dst is not None and dst.mode == REG:
+        src = ins.src
+        if dst.reg == PC:
+            if src.mode == INC and src.reg == SP:
+                return RETURN, 0              # MOV @SP+, PC
+            return INDIRECT, 0
+        if dst.reg == SP and src.mode in (CONST, IMM) and name in ("ADD", "SUB"):
+            v = _signed(src.value)
+            return FALL, (-v if name == "ADD" else v)
+    if ins.src is not None and ins.src.mode == INC and ins.src.reg == SP:
+        return FALL, -2                       # POP
+    return FALL, 0
+
+
+def _signed(v):
+    return v - 0x10000 if v & 0x8000 else v
+
+
+class Analysis:
+    """
+    Bir MSP430Assembler örneğinin son derlemesi üzerinde analiz. Sonuçlar
+    label başına: en kötü cycle (cycles), en fazla yığın (stack, bayt),
+    doğrudan çağrılar (calls) ve işaretler (loop, recursion, extern:..., indirect).
+    """
+    def __init__(self, asm, source_lines):
+        self.asm = asm
+        self.source_lines = source_lines
+        self.nodes = []
+        self.blocks = []
+        self.block_at = {}     # başlangıç adresi -> blok indeksi
+        self.cycles = []       # blok -> en kötü cycle (bloktan çıkışa)
+        self.stack = []        # blok -> en fazla yığın
+        self.flags = []        # blok -> işaret kümesi
+        self.starts = []
+        self._build_nodes()
+        self._build_blocks()
+        self._solve()
+
+    # --- IR ---------------------------------------------------------------
+
+    def _build_nodes(self):
+        asm = self.asm
+        cleaned, _ = clean_source(self.source_lines)
+        for i, out in enumerate(asm.line_output):
+            addr = asm.source_addresses[i] if i < len(asm.source_addresses) else -1
+            if addr < 0 or not isinstance(out, array) or not len(out):
+                continue        # .text dışı ya da kod üretmeyen satır
+            words = {addr + 2 * k: w for k, w in enumerate(out)}
+            ins = decode(lambda a: words.get(a, 0), addr)
+            kind, stack = _classify(ins)
+            callee = None
+            if ins.mnemonic == "CALL":
+                # assembler CALL hedefini word'e yazmaz; hedef kaynaktaki operanddır
+                body = cleaned[i].split(":", 1)[1] if ":" in cleaned[i] else cleaned[i]
+                parts = body.split()
+                callee = parts[1].lstrip("#&") if len(parts) > 1 else None
+            self.nodes.append(Node(i, ins, kind, callee, stack))
+        self.nodes.sort(key=lambda n: n.ins.addr)
+
+    def _build_blocks(self):
+        nodes = self.nodes
+        if not nodes:
+            return
+        leaders = {nodes[0].ins.addr}
+        leaders.update(s.address for s in self.asm.labels.values() if s.section == ".text")
+        for k, n in enumerate(nodes):
+            if n.kind != FALL:
+                if n.ins.target is not None:
+                    leaders.add(n.ins.target)
+                if k + 1 < len(nodes):
+                    leaders.add(nodes[k + 1].ins.addr)
+        for n in nodes:
+            if n.ins.addr in leaders or not self.blocks:
+                self.block_at[n.ins.addr] = len(self.blocks)
+                self.blocks.append(Block(n.ins.addr))
+            self.blocks[-1].nodes.append(n)
+        self.starts = [blk.start for blk in self.blocks]
+        for b, blk in enumerate(self.blocks):
+            last = blk.nodes[-1]
+            nxt = b + 1 if b + 1 < len(self.blocks) else None
+            if last.kind in (BRANCH, COND):
+                tgt = self.block_at.get(last.ins.target)
+                if tgt is not None:
+                    blk.succs.append(tgt)
+            if last.kind in (FALL, COND) and nxt is not None:
+                blk.succs.append(nxt)
+
+    def _block_from(self, addr):
+        # addr'da komut yoksa (desteklenmeyen satır) sonraki ilk blok
+        b = self.block_at.get(addr)
+        if b is None:
+            b = bisect_left(self.starts, addr)
+            if b == len(self.starts):
+                return None
+        return b
+
+    def _callee_block(self, node):
+        sym = self.asm.labels.get(node.callee)
+        if sym is None or sym.section != ".text":
+            return None
+        return self._block_from(sym.address)
+
+    def _deps(self, b):
+        for s in self.blocks[b].succs:
+            yield s
+        for n in self.blocks[b].nodes:
+            if n.callee is not None:
+                c = self._callee_block(n)
+                if c is not None:
+                    yield c
+
+    # --- en kötü durum ----------------------------------------------------
+
+    def _solve(self):
+        """
+        Bloklar ve çağrılar üzerinde tek bir derinlik öncelikli gezinti. Yığında
+        olan bir bloğa giden kenar geri kenardır (döngü ya da özyineleme) ve
+        atlanır; kalan graf DAG olduğu için en uzun yol alt sıradan hesaplanır.
+        """
+        nb = len(self.blocks)
+        self.cycles = [0] * nb
+        self.stack = [0] * nb
+        self.flags = [frozenset()] * nb
+        state = [0] * nb          # 0: görülmedi, 1: yığında, 2: bitti
+        back = [set() for _ in range(nb)]
+        for root in range(nb):
+            if state[root]:
+                continue
+            state[root] = 1
+            todo = [(root, self._deps(root))]
+            while todo:
+                b, it = todo[-1]
+                for d in it:
+                    if state[d] == 0:
+                        state[d] = 1
+                        todo.append((d, self._deps(d)))
+                        break
+                    if state[d] == 1:
+                        back[b].add(d)
+                else:
+                    todo.pop()
+                    self._finish(b, back[b])
+                    state[b] = 2
+
+    def _finish(self, b, back):
+        blk = self.blocks[b]
+        total = depth = peak = 0
+        flags = set()
+        for n in blk.nodes:
+            total += n.ins.cycles
+            if n.ins.mnemonic == "CALL":
+                c = self._callee_block(n)
+                inner = 0
+                if c is None:
+                    flags.add(f"extern:{n.callee}")
+                elif c in back:
+                    flags.add("recursion")
+                else:
+                    total += self.cycles[c]
+                    inner = self.stack[c]
+                    flags |= self.flags[c]
+                peak = max(peak, depth + 2 + inner)
+            elif n.stack:
+                depth += n.stack
+                peak = max(peak, depth)
+            if n.kind == INDIRECT:
+                flags.add("indirect")
+        best = best_stack = 0
+        for s in blk.succs:
+            if s in back:
+                flags.add("loop")
+                continue
+            best = max(best, self.cycles[s])
+            best_stack = max(best_stack, self.stack[s])
+            flags |= self.flags[s]
+        self.cycles[b] = total + best
+        self.stack[b] = max(peak, depth + best_stack)
+        self.flags[b] = frozenset(flags)
+
+    # --- sonuçlar ---------------------------------------------------------
+
+    def routines(self):
+        """Her .text label'ı için özet; çağrılar label'ın rutinine (bir sonraki label'a kadar) göre."""
+        labels = sorted((s.address, s.name) for s in self.asm.labels.values() if s.section == ".text")
+        calls = {}
+        owner = 0
+        for n in self.nodes:
+            while owner + 1 < len(labels) and labels[owner + 1][0] <= n.ins.addr:
+                owner += 1
+            if n.callee is not None and labels and labels[owner][0] <= n.ins.addr:
+                lst = calls.setdefault(labels[owner][1], [])
+                if n.callee not in lst:
+                    lst.append(n.callee)
+        out = []
+        for addr, name in labels:
+            b = self._block_from(addr)
+            if b is None:
+                continue        # komut içermeyen label
+            sym = self.asm.labels[name]
+            out.append({
+                "label": name, "address": addr, "line": sym.line,
+                "cycles": self.cycles[b], "stack": self.stack[b],
+                "calls": calls.get(name, []), "flags": sorted(self.flags[b]),
+            })
+        return out
+
+    def call_graph(self):
+        return {r["label"]: r["calls"] for r in self.routines() if r["calls"]}
+
+    def to_json(self):
+        return {
+            "module": self.asm.source_file,
+            "routines": self.routines(),
+            "call_graph": self.call_graph(),
+            "instructions": [{"address": n.ins.addr, "line": n.index + 1,
+                              "cycles": n.ins.cycles, "instruction": str(n.ins)}
+                             for n in self.nodes],
+        }
+
+    def listing_columns(self):
+        """iter_listing için ek sütun: komut cycle'ı ve label satırlarında en kötü durum."""
+        cols = {n.index: f"{n.ins.cycles:>3}" for n in self.nodes}
+        for r in self.routines():
+            i = r["line"] - 1
+            mark = "+" if r["flags"] else ""
+            cols[i] = f"{cols.get(i, ''):>3} {r['cycles']:>6}c {r['stack']:>4}B{mark}"
+        return cols
+
+
+LISTING_TITLE = "Cyc  EnKötü Yığın"
+
+
+def analyze(source, name="module.obj", base_dir=".", source_file=None):
+    """Kaynağı derler, (Analysis, MSP430Assembler) döner."""
+    asm = MSP430Assembler()
+    asm.assemble(source, name, base_dir, 1, source_file).close()   # sadece .text çıktısı kullanılır
+    return Analysis(asm, source.splitlines()), asm
+
+
+def format_routines(routines):
+    # çağrılar ve işaretler ayrı sütunlar; çağrı sütunu en uzun listeye göre hizalanır
+    calls = [", ".join(r["calls"]) or "-" for r in routines]
+    width = max(map(len, calls + ["Çağrılar"]))
+    lines = [f"{'Label':<24} {'Adres':<6} {'Cycle':>8} {'Yığın':>6}  {'Çağrılar':<{width}} | İşaretler"]
+    for r, c in zip(routines, calls):
+        flags = ", ".join(r["flags"]) or "-"
+        lines.append(f"{r['label']:<24} {r['address']:04X}   {r['cycles']:>8} {r['stack']:>6}  {c:<{width}} | {flags}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="MSP430 statik cycle ve yığın analizi")
+    ap.add_argument("source", help=".asm dosyası")
+    ap.add_argument("--json", help="JSON çıktısı (- ise stdout)")
+    ap.add_argument("--listing", help="cycle sütunlu listing dosyası")
+    args = ap.parse_args(argv)
+
+    try:
+        with open(args.source, encoding="utf-8") as f:
+            source = f.read()
+        an, asm = analyze(source, os.path.basename(args.source), os.path.dirname(args.source) or ".",
+                          args.source)
+        if args.listing:
+            write_listing(args.listing, asm.iter_listing(an.source_lines, an.listing_columns(),
+                                                         LISTING_TITLE))
+    except Exception as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    if args.json == "-":
+        print(json.dumps(an.to_json(), indent=2))
+        return 0
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(an.to_json(), f, indent=2)
+    print(format_routines(an.routines()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,182 +1,1014 @@
 import os
 import re
-import tkinter as tk
-from tkinter import ttk, scrolledtext, filedialog, messagebox
-import time
-
-
-class LineNumberedText(tk.Frame):
-    def __init__(self, parent, *args, **kwargs):
-        tk.Frame.__init__(self, parent)
-        self.text = scrolledtext.ScrolledText(self, *args, **kwargs)
-        self.linenumbers = tk.Canvas(self, width=30, bg='#f0f0f0')
-        
-        self.linenumbers.pack(side=tk.LEFT, fill=tk.Y)
-        self.text.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
-
-        self.text.tag_config('label',     foreground='#499C81')
-        self.text.tag_config('directive', foreground='#FF8800')
-        self.text.tag_config('opcode',    foreground='blue')
-        self.text.tag_config('operand1',  foreground='green')
-        self.text.tag_config('operand2',  foreground='purple')
-        self.text.tag_config('error',     foreground='red')
-        
-        for seq in ('<KeyRelease>', '<ButtonRelease-1>', '<MouseWheel>'):
-            self.text.bind(seq, lambda e: self._on_text_change())
-
-        self.text.config(yscrollcommand=self.on_text_scroll)
-        self.textscroll = self.text.vbar
-        
-        self.update_line_numbers()
-
-    def on_text_scroll(self, *args):
-        self.textscroll.set(*args)
-        self.update_line_numbers()
-
-    def _on_text_change(self):
-        self.update_line_numbers()
-        self._highlight_syntax()
-
-    def _highlight_syntax(self):
-        lines = self.text.get('1.0', tk.END).splitlines()
-        for tag in ('label','directive','opcode','operand1','operand2','error'):
-            self.text.tag_remove(tag, '1.0', tk.END)
-
-        asm = MSP430Assembler()
-
-        for row, line in enumerate(lines, start=1):
-            raw = line
-            m_label = re.match(r"\s*([A-Za-z_]\w*):", raw)
-            if m_label:
-                start, end = m_label.start(1), m_label.end(1)
-                self.text.tag_add('label', f"{row}.{start}", f"{row}.{end}")
-                offset = m_label.end()
-            else:
-                offset = 0
-
-            rest = raw[offset:]
-            if rest.lstrip().startswith(';'):
-                continue
+import json
+import hashlib
+import mmap
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from itertools import chain, repeat
+import threading
+import tracemalloc
+import linecache
+from types import MappingProxyType
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:  # numpy opsiyonel, yoksa array modülü kullanılır
+    np = None
+
+
+class Section:
+    """pass1'in section bilgisi: başlangıç, boyut, semboller ve referanslar."""
+    __slots__ = ("name", "start", "size", "symbols", "references")
+
+    def __init__(self, name, start, size=0):
+        self.name = sys.intern(name)
+        self.start = start
+        self.size = size
+        self.symbols = {}      # label -> adres
+        self.references = []   # (sembol, satır no, adres)
+
+
+class ObjectModule:
+    """
+    Assembler çıktısı, obj okuma/yazma ve linker'ın ortak modül modeli.
+    text: array('H') word'ler, data: SegmentBuffer, bss: [ZeroFill].
+    """
+    __slots__ = ("name", "text", "data", "bss", "exports", "relocations",
+                 "labels", "sections", "lines", "placement", "linked")
+
+    def __init__(self, name=""):
+        self.name = name
+        self.text = array('H')
+        self.data = SegmentBuffer()
+        self.bss = []
+        self.exports = {}       # isim -> Symbol (adres None olabilir)
+        self.relocations = []   # [Relocation]
+        self.labels = {}        # isim -> Symbol (sadece assembler çıktısında)
+        self.sections = {}      # isim -> Section (sadece assembler çıktısında)
+        self.lines = LineTable()  # adres -> kaynak satırı
+        self.placement = {}     # linker: section -> gerçek başlangıç adresi
+        self.linked = False     # COFF_LINKED çıktısı mı
+
+    def section_size(self, sec):
+        if sec == ".text":
+            return 2 * len(self.text)
+        if sec == ".data":
+            return len(self.data)
+        if sec == ".bss":
+            return zero_fills_size(self.bss)
+        return 0
+
+    def close(self):
+        """.incbin mmap'lerini bırakır (data buffer'ı artık okunamaz)."""
+        self.data.close()
+
+    def copy(self):
+        """İçeriği paylaşan, linker yerleşimi boş yeni kayıt (önbellekteki modüller için)."""
+        m = ObjectModule(self.name)
+        m.text, m.data, m.bss = self.text, self.data, self.bss
+        m.exports, m.relocations = self.exports, self.relocations
+        m.labels, m.sections, m.lines = self.labels, self.sections, self.lines
+        m.linked = self.linked
+        return m
+
+
+class LineTable:
+    """
+    Adres -> (kaynak dosyası, satır) tablosu. Kayıtlar adrese göre sıralı
+    tutulur; her kayıt bir sonraki kayda kadar olan adresleri kapsar, sorgu
+    bisect ile O(log n)'dir. Dosyada satır başına iki delta ("adres satır")
+    olarak saklanır; dosya değişimleri "F <no>" satırıyla işaretlenir.
+    """
+    __slots__ = ("files", "addrs", "file_ids", "lines")
 
-            m_dir = re.match(r"\s*(\.(?:word|byte|space|text|data|bss|org|end|def|ref))", rest, re.IGNORECASE)
-            if m_dir:
-                ds, de = m_dir.start(1)+offset, m_dir.end(1)+offset
-                self.text.tag_add('directive', f"{row}.{ds}", f"{row}.{de}")
-                continue
+    def __init__(self):
+        self.files = []             # dosya no -> yol
+        self.addrs = array('L')
+        self.file_ids = array('H')
+        self.lines = array('L')
 
-            m_ins = re.match(
-                r"\s*(\w+(?:\.\w+)?)(?:\s+([^,\s]+))?"
-                r"(?:\s*,\s*([^,\s]+))?", rest
-            )
-            if not m_ins:
-                continue
+    def file_id(self, name):
+        try:
+            return self.files.index(name)
+        except ValueError:
+            self.files.append(name)
+            return len(self.files) - 1
+
+    def add(self, addr, file_id, line):
+        self.addrs.append(addr)
+        self.file_ids.append(file_id)
+        self.lines.append(line)
+
+    def sort(self):
+        a = self.addrs
+        if all(a[i] <= a[i+1] for i in range(len(a) - 1)):
+            return
+        order = sorted(range(len(a)), key=a.__getitem__)
+        self.addrs = array('L', (a[i] for i in order))
+        self.file_ids = array('H', (self.file_ids[i] for i in order))
+        self.lines = array('L', (self.lines[i] for i in order))
 
-            op, opd1, opd2 = m_ins.group(1), m_ins.group(2), m_ins.group(3)
-            os_, oe = m_ins.start(1)+offset, m_ins.end(1)+offset
+    def extend_rebased(self, other, rebase):
+        """
+        other'ın kayıtlarını rebase(adres) ile taşıyarak ekler; rebase None
+        dönerse kayıt atlanır. Sıralama çağırana aittir.
+        """
+        ids = [self.file_id(f) for f in other.files]
+        for a, fid, ln in zip(other.addrs, other.file_ids, other.lines):
+            a = rebase(a)
+            if a is not None:
+                self.add(a, ids[fid], ln)
 
-            if op.upper() in asm.instructions:
-                self.text.tag_add('opcode', f"{row}.{os_}", f"{row}.{oe}")
+    def replace_range(self, start, end, other, rebase):
+        """
+        [start, end) aralığındaki kayıtları other'ın rebase ile taşınıp bu
+        aralığa düşen kayıtlarıyla değiştirir; tablo sıralı kalır.
+        """
+        def inside(a):
+            a = rebase(a)
+            return a if a is not None and start <= a < end else None
+        part = LineTable()
+        part.files = self.files     # yeni dosya adları bu tabloya eklensin
+        part.extend_rebased(other, inside)
+        part.sort()
+        lo, hi = bisect_left(self.addrs, start), bisect_left(self.addrs, end)
+        self.addrs[lo:hi] = part.addrs
+        self.file_ids[lo:hi] = part.file_ids
+        self.lines[lo:hi] = part.lines
+
+    def lookup(self, addr):
+        """(dosya, satır) ya da adres ilk kayıttan önceyse None."""
+        i = bisect_right(self.addrs, addr) - 1
+        if i < 0:
+            return None
+        return self.files[self.file_ids[i]], self.lines[i]
+
+    def lookup_many(self, addrs):
+        """Çok sayıda adres için lookup; numpy varsa tek searchsorted çağrısı."""
+        if np is not None and len(self.addrs):
+            keys = np.frombuffer(self.addrs, dtype=f"u{self.addrs.itemsize}")
+            idx = np.searchsorted(keys, np.asarray(addrs, dtype=keys.dtype), side="right") - 1
+        else:
+            # bisect list üzerinde array'den hızlı (karşılaştırmalarda kutulama yok)
+            idx = map((-1).__add__, map(bisect_right, repeat(self.addrs.tolist()), addrs))
+        files, fids, lines = self.files, self.file_ids, self.lines
+        return [(files[fids[i]], lines[i]) if i >= 0 else None for i in map(int, idx)]
+
+    def __len__(self):
+        return len(self.addrs)
+
+    def iter_rows(self):
+        for i, f in enumerate(self.files):
+            yield f"FILE {i} {f}\n"
+        cur, pa, pl = -1, 0, 0
+        for a, fid, ln in zip(self.addrs, self.file_ids, self.lines):
+            if fid != cur:
+                yield f"F {fid}\n"
+                cur = fid
+            yield f"{a - pa} {ln - pl}\n"
+            pa, pl = a, ln
+
+    def parse_row(self, row, state):
+        """iter_rows çıktısının bir satırını okur; state [dosya, adres, satır] okuyucunun durumu."""
+        if row[0] == "F":
+            if row.startswith("FILE "):
+                self.files.append(row.split(None, 2)[2])
             else:
-                self.text.tag_add('error', f"{row}.{os_}", f"{row}.{oe}")
-
-            if opd1:
-                s1, e1 = m_ins.start(2)+offset, m_ins.end(2)+offset
-                self.text.tag_add('operand1', f"{row}.{s1}", f"{row}.{e1}")
-            if opd2:
-                s2, e2 = m_ins.start(3)+offset, m_ins.end(3)+offset
-                self.text.tag_add('operand2', f"{row}.{s2}", f"{row}.{e2}")
-
-    def update_line_numbers(self):
-        self.linenumbers.delete("all")
-        i = self.text.index("@0,0")
-        while True:
-            dline = self.text.dlineinfo(i)
-            if dline is None:
+                state[0] = int(row[2:])
+            return
+        da, dl = row.split()
+        state[1] += int(da)
+        state[2] += int(dl)
+        self.add(state[1], state[0], state[2])
+
+
+def read_line_table(path):
+    """obj ya da linklenmiş çıktının LINES bölümünü okur."""
+    table, state, reading = LineTable(), [0, 0, 0], False
+    with open(path) as f:
+        for ln in f:
+            ln = ln.strip()
+            if ln == "LINES":
+                reading = True
+            elif ln == "EOF":
                 break
-            y = dline[1]
-            linenum = str(i).split(".")[0]
-            self.linenumbers.create_text(
-                15, y, anchor="n",
-                text=linenum,
-                font=self.text.cget("font")
-            )
-            i = self.text.index(f"{i}+1line")
+            elif reading and ln:
+                table.parse_row(ln, state)
+    return table
+
+
+def iter_word_lines(words, chunk=0x8000):
+    """array('H') word'leri "0xHHHH" satırlarına çevirir."""
+    for i in range(0, len(words), chunk):
+        part = words[i:i+chunk]
+        if sys.byteorder == "big":
+            part.byteswap()
+        yield _hex_word_lines(part.tobytes())
+
+
+def _decode_data_lines(lines):
+    # "0xHHHH" -> little-endian 2 byte, eski obj'lerdeki "0xHH" -> 1 byte
+    if all(len(ln) == 6 for ln in lines):
+        return _swap16(bytes.fromhex("".join(ln[2:] for ln in lines)))
+    out = bytearray()
+    for ln in lines:
+        v = int(ln, 16)
+        out += v.to_bytes(1 if len(ln) <= 4 else 2, "little")
+    return out
+
+
+def _section_of(addr):
+    # section bilgisi olmayan eski obj'ler için adresten tahmin
+    best = ".text"
+    for sec, base in BASE_ADDRS.items():
+        if addr >= base >= BASE_ADDRS[best]:
+            best = sec
+    return best
+
+
+def read_object(lines, name=""):
+    """COFF benzeri obj satırlarını ObjectModule'e çevirir."""
+    m = ObjectModule(name)
+    section = None
+    data_lines = []
+    line_state = [0, 0, 0]
+    for ln in lines:
+        ln = ln.strip()
+        if ln == "COFF_LINKED EXECUTABLE FILE":
+            m.linked = True; break
+        if ln == "SECTION .text":
+            section = "text"; continue
+        if ln == "SECTION .data":
+            section = "data"; continue
+        if ln == "SECTION .bss":
+            section = "bss"; continue
+        if ln == "EXPORTS":
+            section = "exports"; continue
+        if ln == "RELOCATIONS":
+            section = "relocs"; continue
+        if ln == "LINES":
+            section = "lines"; continue
+        if ln == "EOF":
+            break
+        if not ln:
+            continue
+
+        if section == "text":
+            m.text.append(int(ln, 16))
+        elif section == "data":
+            data_lines.append(ln)
+        elif section == "bss":
+            # “ZERO 0x0000 0x0004” (section içi başlangıç, uzunluk); eski obj'lerde “SIZE 0x0004”
+            parts = ln.split()
+            if parts[0] == "SIZE":
+                m.bss.append(ZeroFill(0, int(parts[1], 16)))
+            else:
+                m.bss.append(ZeroFill(int(parts[1], 16), int(parts[2], 16)))
+        elif section == "exports":
+            # “sym addr .section” (eski obj'lerde section yok, adresten çıkar)
+            parts = ln.split()
+            addr = None if "?" in parts[1] else int(parts[1], 16)
+            sec = parts[2] if len(parts) > 2 else (addr is not None and _section_of(addr)) or None
+            m.exports[parts[0]] = Symbol(parts[0], sec and sys.intern(sec), addr)
+        elif section == "relocs":
+            # “sym .text 0x0010 1” (komut sırası, ek word); eski obj'lerde word yok
+            sym, sec, off, *word = ln.split()
+            m.relocations.append(Relocation(sym, sys.intern(sec), int(off, 16),
+                                            int(word[0]) if word else 1))
+        elif section == "lines":
+            m.lines.parse_row(ln, line_state)
+    m.data.append(_decode_data_lines(data_lines))
+    return m
+
+
+def write_listing(path, rows):
+    """Listing satırlarını tek bir tamponlu akışla yazar."""
+    with open(path, "w", buffering=1 << 16) as f:
+        f.writelines(rows)
+
+
+def read_object_file(path):
+    with open(path) as f:
+        return read_object(f, os.path.basename(path))
+
+
+def write_object(path, module):
+    """
+    Common Object File Format (COFF) dosyası:
+    - Bölümler (text/data) ikili verileri (hex), .bss sadece (başlangıç, uzunluk) olarak
+    - EXPORTS: .def ile tanımlanan semboller ve adresleri
+    - RELOCATIONS: .ref ile toplanmış relocation girdileri
+    - LINES: adres -> kaynak satırı tablosu (delta kodlu)
+    - EOF
+    """
+    with memory_phase("write_object"), open(path, "w") as f:
+        f.write("COFF\n")
+        # önce text
+        f.write("SECTION .text\n")
+        f.writelines(iter_word_lines(module.text))
+        # sonra data (little-endian word'ler halinde)
+        f.write("SECTION .data\n")
+        f.writelines(iter_data_word_lines(module.data))
+        # bss byte'ları yazılmaz, sadece sıfır bölgeleri
+        f.write("SECTION .bss\n")
+        for z in module.bss:
+            f.write(f"ZERO 0x{z.start:04X} 0x{z.length:04X}\n")
+        # exports
+        f.write("EXPORTS\n")
+        for sym in module.exports.values():
+            if sym.address is None:
+                f.write(f"{sym.name} 0x????\n")
+            else:
+                f.write(f"{sym.name} 0x{sym.address:04X} {sym.section}\n")
+        # relocations
+        f.write("RELOCATIONS\n")
+        for r in module.relocations:
+            f.write(f"{r.symbol} {r.section} 0x{r.offset:04X} {r.word}\n")
+        f.write("LINES\n")
+        f.writelines(module.lines.iter_rows())
+        f.write("EOF\n")
+
+
+# pass1'in her section için kullandığı başlangıç adresleri
+BASE_ADDRS = {".text":0x0000, ".data":0xC000, ".bss":0xE000}
+
+# listing'de bir satırda gösterilen word sayısı
+LISTING_WORDS = 4
+
+# .incbin: bundan küçük dosyalar kopyalanır, büyükleri mmap ile kopyasız tutulur
+INCBIN_COPY_MAX = 64 * 1024
+
+# workers > 1 istense bile bundan kısa .text'lerde process pool açılmaz (kurulum maliyeti baskın)
+PASS2_PARALLEL_MIN_LINES = 20000
+PASS2_CHUNK_LINES = 5000
+
+
+# açık bir MemoryProfiler varsa faz sınırlarında snapshot alınır
+_memory_profiler = None
+
+
+class _NoPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+def memory_phase(name):
+    """Bellek profili açıksa name fazını ölçen context manager, değilse hiçbir şey yapmaz."""
+    prof = _memory_profiler
+    return _NO_PHASE if prof is None else _MemoryPhase(prof, name)
+
+
+class _MemoryPhase:
+    __slots__ = ("prof", "name", "snapshot", "start", "peak")
+
+    def __init__(self, prof, name):
+        self.prof = prof
+        self.name = name
+
+    def __enter__(self):
+        self.prof._enter(self)
+        return self
+
+    def __exit__(self, *exc):
+        self.prof._exit(self)
+        return False
+
+
+class MemoryProfiler:
+    """
+    tracemalloc ile isteğe bağlı bellek ölçümü. Açıkken pass1, pass2,
+    write_object, load, link ve write fazlarının başında ve sonunda snapshot
+    alınır; her faz için tepe kullanım ve en çok bellek ayıran kaynak satırları
+    (hangi yapının büyüdüğü) faz adı başına toplanır. tracemalloc süreç genelinde
+    çalıştığı için tek thread'li derlemelerde kullanılmalıdır.
+
+        with MemoryProfiler() as prof:
+            ...
+        print(prof.format_report())
+    """
+    def __init__(self, top=10, frames=1):
+        self.top = top
+        self.frames = frames
+        self.peak = 0
+        self.baseline = 0
+        self.phases = {}    # faz -> {"calls", "peak", "peak_delta", "delta", "sites"}
+        self._open = []     # iç içe açık fazlar (load, link içinde olabilir)
+        self._started = False
+        self._filters = (tracemalloc.Filter(False, tracemalloc.__file__),
+                         tracemalloc.Filter(False, linecache.__file__),
+                         tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"))
+
+    def __enter__(self):
+        global _memory_profiler
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started = True
+        self.baseline = tracemalloc.get_traced_memory()[0]
+        _memory_profiler = self
+        return self
+
+    def __exit__(self, *exc):
+        global _memory_profiler
+        _memory_profiler = None
+        self._fold_peak(tracemalloc.get_traced_memory()[1])
+        if self._started:
+            tracemalloc.stop()
+        return False
+
+    def _fold_peak(self, peak):
+        # reset_peak öncesi tepe değeri açık fazlara ve toplam tepeye aktarılır
+        self.peak = max(self.peak, peak)
+        for ph in self._open:
+            ph.peak = max(ph.peak, peak)
+
+    def _snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(self._filters)
+
+    def _enter(self, ph):
+        cur, peak = tracemalloc.get_traced_memory()
+        self._fold_peak(peak)
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+        ph.snapshot = self._snapshot()
+        ph.start = ph.peak = cur
+        self._open.append(ph)
+
+    def _exit(self, ph):
+        cur, peak = tracemalloc.get_traced_memory()
+        self._fold_peak(peak)
+        self._open.remove(ph)
+        stats = self._snapshot().compare_to(ph.snapshot, "lineno")
+        entry = self.phases.setdefault(ph.name, {"calls": 0, "peak": 0, "peak_delta": 0,
+                                                 "delta": 0, "sites": {}})
+        entry["calls"] += 1
+        entry["peak"] = max(entry["peak"], ph.peak)
+        entry["peak_delta"] = max(entry["peak_delta"], ph.peak - ph.start)
+        entry["delta"] += cur - ph.start
+        sites = entry["sites"]
+        for st in stats:
+            if st.size_diff <= 0:
+                continue
+            frame = st.traceback[0]
+            key = (frame.filename, frame.lineno)
+            size, count = sites.get(key, (0, 0))
+            sites[key] = (size + st.size_diff, count + st.count_diff)
+        ph.snapshot = None
+
+    def report(self):
+        """JSON'a yazılabilir rapor: toplam tepe ve faz başına en çok ayıran satırlar."""
+        phases = []
+        for name, e in self.phases.items():
+            top = sorted(e["sites"].items(), key=lambda kv: kv[1][0], reverse=True)[:self.top]
+            phases.append({
+                "phase": name, "calls": e["calls"], "peak": e["peak"],
+                "peak_delta": e["peak_delta"], "delta": e["delta"],
+                "top": [{"file": os.path.basename(f), "line": ln,
+                         "code": linecache.getline(f, ln).strip(),
+                         "size": size, "count": count}
+                        for (f, ln), (size, count) in top],
+            })
+        return {"peak": self.peak, "baseline": self.baseline, "phases": phases}
+
+    def format_report(self):
+        rep = self.report()
+        out = [f"Bellek tepe: {rep['peak'] / 1024:.1f} KiB (başlangıç {rep['baseline'] / 1024:.1f} KiB)"]
+        for ph in rep["phases"]:
+            out.append("")
+            out.append(f"[{ph['phase']}] x{ph['calls']}  tepe {ph['peak'] / 1024:.1f} KiB  "
+                       f"faz içi tepe +{ph['peak_delta'] / 1024:.1f} KiB  kalan {ph['delta'] / 1024:+.1f} KiB")
+            for t in ph["top"]:
+                out.append(f"  {t['size'] / 1024:>10.1f} KiB {t['count']:>8}  "
+                           f"{t['file']}:{t['line']}  {t['code']}")
+        return "\n".join(out)
+
+
+# paylaşılan komut kodlama önbelleğinin kapasitesi (farklı komut metni)
+ENCODING_CACHE_SIZE = 4096
+
+# konumdan bağımsız operand: register ya da sayısal immediate (label içeremez)
+_PI_OPERAND = re.compile(r"#?(?:R\d{1,2}|(?:0[xX])?[0-9A-Fa-f]+),?$")
+# bu karakterlerden oluşan bir label yukarıdaki operandların içinde geçebilir
+_PI_CHARS = frozenset("R0123456789ABCDEFabcdefxX#,")
+# kodlaması operandlardan bağımsız komutlar
+_FIXED_ENCODING = frozenset(("NOP", "RET"))
+_DUAL_OPERAND = frozenset(("MOV", "MOV.W", "ADD", "ADD.W", "SUB", "SUB.W", "CMP"))
+# operandı konumdan bağımsızsa (register/sayı) operandlarıyla önbelleğe alınanlar
+_OPERAND_ENCODING = _DUAL_OPERAND | {"CALL"}
+
+
+class EncodingCache:
+    """
+    Konumdan bağımsız komutların (MOV R4, R7 / NOP / RET...) word'leri için
+    sınırlı LRU önbellek. Anahtar normalize edilmiş komut metnidir; aynı
+    süreçteki bütün assembler örnekleri (AssemblerPool thread'leri, batch
+    derlemedeki modüller) tek örneği paylaştığı için kilitle korunur.
+    """
+    def __init__(self, size=ENCODING_CACHE_SIZE):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            words = self._data.get(key)
+            if words is None:
+                self.misses += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+            return words
+
+    def put(self, key, words):
+        with self._lock:
+            self._data[sys.intern(key)] = words
+            if len(self._data) > self.size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"entries": len(self._data), "capacity": self.size, "hits": self.hits,
+                    "misses": self.misses, "hit_rate": round(self.hits / total, 4) if total else 0.0}
+
+
+ENCODING_CACHE = EncodingCache()
+
+
+_WS_TABLE = str.maketrans("", "", " \t")
+# rakam -> "0", harf/_ -> "a", diğer her şey -> ","  (sembol taraması için)
+_WORD_CLASS = bytes(
+    ord("0") if chr(b).isdigit() else
+    ord("a") if chr(b).isalpha() or chr(b) == "_" else ord(",")
+    for b in range(128)) + b"," * 128
+
+
+def _has_empty_field(flat):
+    return flat.startswith(",") or flat.endswith(",") or ",," in flat
+
+
+def may_contain_symbol(body):
+    """Satırda bir kelime sınırından sonra harfle başlayan token var mı (regex'siz ön kontrol)."""
+    cls = body.encode("ascii", "replace").translate(_WORD_CLASS)
+    return cls.startswith(b"a") or b",a" in cls
+
+
+def count_data_values(body):
+    """.word/.byte satırındaki değer sayısı; değerler listeye çevrilmez."""
+    flat = body.translate(_WS_TABLE)
+    if not flat:
+        return 0
+    if _has_empty_field(flat):
+        return len([v for v in flat.split(",") if v])
+    return flat.count(",") + 1
+
+
+def _swap16(raw):
+    # big-endian word byte'larını little-endian'a çevirir (ya da tersi)
+    if np is not None:
+        return np.frombuffer(raw, dtype=np.uint16).byteswap().tobytes()
+    words = array('H')
+    words.frombytes(raw)
+    words.byteswap()
+    return words.tobytes()
+
+
+def encode_data_values(body, width):
+    """
+    .word (width=2) veya .byte (width=1) değerlerini toplu olarak
+    little-endian byte'lara çevirir. .word değerleri hex; .byte değerleri
+    0x önekliyse hex, değilse ondalık yorumlanır (pass2'nin eski kuralı).
+    Sabit genişlikli hex tablolar tek bytes.fromhex çağrısıyla çözülür.
+    """
+    flat = body.translate(_WS_TABLE)
+    if not flat:
+        return b""
+    if _has_empty_field(flat):
+        flat = ",".join(v for v in flat.split(",") if v)
+    n = flat.count(",") + 1
+    digits = flat.replace("0x", "").replace("0X", "")
+    step = 2 * width
+    hex_ok = width == 2 or len(flat) - len(digits) == 2 * n
+    if (hex_ok and len(digits) == (step + 1) * n - 1
+            and digits[step::step+1] == "," * (n - 1)):
+        try:
+            raw = bytes.fromhex(digits.replace(",", ""))
+            return _swap16(raw) if width == 2 else raw
+        except ValueError:
+            pass    # genel yola düş, hatalı değeri orada raporla
+
+    tokens = flat.split(",")
+    try:
+        if width == 2:
+            words = array('H', map(int, tokens, repeat(16)))
+            if sys.byteorder == "big":
+                words.byteswap()
+            return words.tobytes()
+        if "x" not in flat and "X" not in flat:
+            return bytes(map(int, tokens))
+        return bytes(int(v, 16) if v[:2] in ("0x", "0X") else int(v) for v in tokens)
+    except (ValueError, OverflowError) as e:
+        kind = ".word" if width == 2 else ".byte"
+        raise Exception(f"Geçersiz {kind} değeri: {e}")
+
+
+_INCBIN_RE = re.compile(r'\.incbin\s+"([^"]+)"\s*(?:,\s*(\w+)\s*)?(?:,\s*(\w+)\s*)?$', re.IGNORECASE)
+
+
+_INDEXED_RE = re.compile(r"(.+)\((R\d{1,2})\)$")
+
+
+def split_operands(line):
+    """Komut satırını (MNEMONIC, [operandlar]) olarak ayırır; operandlar virgülle ayrılır."""
+    parts = line.split(None, 1)
+    ops = [o.strip() for o in parts[1].split(",")] if len(parts) > 1 else []
+    return parts[0].upper(), [o for o in ops if o]
+
+
+def parse_operand(op):
+    """
+    Operandı (As, register, ek word ifadesi) olarak çözer; ek word yoksa ifade None.
+    Rn, @Rn, @Rn+, #x (R0), &x (R2), x(Rn); çıplak sembol/sayı mutlak adrestir (&x).
+    Register'ın geçerliliğini kodlayıcı kontrol eder.
+    """
+    if op in REGISTERS:
+        return 0, op, None
+    if op.startswith("@"):
+        return (3, op[1:-1], None) if op.endswith("+") else (2, op[1:], None)
+    if op.startswith("#"):
+        return 3, "R0", op[1:]
+    if op.startswith("&"):
+        return 1, "R2", op[1:]
+    m = _INDEXED_RE.match(op)
+    if m:
+        return 1, m.group(2), m.group(1)
+    return 1, "R2", op
+
+
+def extension_exprs(line):
+    """Komutun ek word ifadeleri, yazıldıkları sırayla (kaynak, sonra hedef)."""
+    mnemonic, ops = split_operands(line)
+    if mnemonic in _DUAL_OPERAND:
+        ops = ops[:2]
+    elif mnemonic == "CALL":
+        ops = ops[:1]   # CALL #x / CALL x / CALL &x / CALL x(Rn)
+    else:
+        return []
+    return [x for x in (parse_operand(o)[2] for o in ops) if x is not None]
+
+
+def instruction_size(line):
+    """Komutun byte boyutu: bir komut word'ü ve operand başına en fazla bir ek word."""
+    return 2 + 2 * len(extension_exprs(line))
+
+
+def line_size(line, section, base_dir="."):
+    """
+    pass1'in label'ı ayrılmış bir satıra verdiği boyut (byte); pass2'nin o satır
+    için ürettiği byte sayısıyla aynıdır. LSP de aynı kuralı kullanır; .incbin
+    dosyanın boyutunu okur, hatalı .space ValueError verir.
+    """
+    if line[:7].lower() == ".incbin":
+        return parse_incbin(line, base_dir)[2]
+    if section == ".text":
+        # kod üretmeyen satırlar (.exdef, bilinmeyen direktifler) yer kaplamaz
+        return instruction_size(line) if line.split(None, 1)[0].upper() in INSTRUCTIONS else 0
+    if line.startswith(".space"):
+        return 2 * int(line.split(".space", 1)[1])
+    if section == ".data":
+        if line.startswith(".word"):
+            return 2 * count_data_values(line[5:])
+        if line.startswith(".byte"):
+            return count_data_values(line[5:])
+        return 0
+    return 2    # .bss'te diğer satırlar birer word
+
+
+def parse_incbin(line, base_dir="."):
+    """
+    `.incbin "dosya"[, offset, length]` satırını çözer.
+    (yol, offset, uzunluk) döner; uzunluk dosya okunmadan boyutundan bulunur.
+    """
+    m = _INCBIN_RE.match(line)
+    if not m:
+        raise Exception(f"Geçersiz .incbin satırı: {line}")
+    path = os.path.join(base_dir, m.group(1))
+    size = os.path.getsize(path)
+    offset = int(m.group(2), 0) if m.group(2) else 0
+    length = int(m.group(3), 0) if m.group(3) else size - offset
+    if offset < 0 or length < 0 or offset + length > size:
+        raise Exception(f".incbin aralığı dosya dışında: {m.group(1)} ({size} byte)")
+    return path, offset, length
+
+
+class ZeroFill:
+    """Sıfırla dolu bölge; byte'lar üretilmez, sadece (start, length) tutulur."""
+    __slots__ = ("start", "length")
+
+    def __init__(self, start, length):
+        self.start = start
+        self.length = length
+
+    @property
+    def end(self):
+        return self.start + self.length
+
+    def __len__(self):
+        return self.length
+
+    def __bytes__(self):
+        return bytes(self.length)
+
+
+def zero_fills_size(fills):
+    return max((z.end for z in fills), default=0)
+
+
+class SegmentBuffer:
+    """
+    Section içeriği için parça listesi. Assembler'ın ürettiği byte'lar
+    bytearray'de birleştirilir, .incbin ile gelen dosyalar ise mmap üzerinden
+    memoryview dilimi olarak kopyalanmadan tutulur. .space/.bss gibi sıfır
+    alanlar ZeroFill olarak kalır; byte'lara sadece gerektiğinde çevrilir.
+    mmap'ler buffer'a aittir, iş bitince close() (ya da with) ile bırakılır.
+    """
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+        self.maps = []          # append_file'ın açtığı mmap'ler
+
+    def append(self, data):
+        if not data:
+            return
+        if self.chunks and isinstance(self.chunks[-1], bytearray):
+            self.chunks[-1] += data
+        else:
+            self.chunks.append(bytearray(data))
+        self.size += len(data)
+
+    def append_view(self, view):
+        if len(view):
+            self.chunks.append(view)
+            self.size += len(view)
+
+    def append_zeros(self, length):
+        if not length:
+            return
+        last = self.chunks[-1] if self.chunks else None
+        if isinstance(last, ZeroFill):
+            last.length += length
+        else:
+            self.chunks.append(ZeroFill(self.size, length))
+        self.size += length
+
+    def extend(self, other):
+        """Başka bir buffer'ın parçalarını kopyalamadan sona ekler."""
+        for c in other:
+            if isinstance(c, ZeroFill):
+                self.append_zeros(c.length)
+            else:
+                self.append_view(memoryview(c))
+
+    def zero_fills(self):
+        return [c for c in self.chunks if isinstance(c, ZeroFill)]
+
+    def append_file(self, path, offset, length):
+        if not length:
+            return
+        with open(path, "rb") as f:
+            if length < INCBIN_COPY_MAX:
+                f.seek(offset)
+                data = f.read(length)
+                self.append(data)
+                return data
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.maps.append(mm)
+        view = memoryview(mm)[offset:offset+length]
+        self.append_view(view)
+        return view
+
+    def close(self):
+        """mmap'leri kapatır; .incbin dilimleri bundan sonra okunamaz."""
+        for c in self.chunks:
+            if isinstance(c, memoryview):
+                c.release()
+        for mm in self.maps:
+            try:
+                mm.close()
+            except BufferError:
+                pass    # dilim başka bir buffer'a aktarılmış, son görünüm bırakılınca kapanır
+        self.maps = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        return iter(self.chunks)
+
+    def __bytes__(self):
+        return b"".join(bytes(c) if isinstance(c, ZeroFill) else c for c in self.chunks)
+
+
+def data_words(buf):
+    """Data buffer'ını little-endian 16-bit word'ler olarak döner (tek byte 0 ile tamamlanır)."""
+    raw = bytes(buf)
+    if len(raw) % 2:
+        raw += b"\0"
+    words = array('H', raw)
+    if sys.byteorder == "big":
+        words.byteswap()
+    return words
+
+
+def _hex_word_lines(raw):
+    hx = _swap16(raw).hex("\n", 2).upper()
+    return "0x" + hx.replace("\n", "\n0x") + "\n"
+
+
+def iter_data_word_lines(buf):
+    """
+    Data buffer'ını obj dosyasındaki "0xHHHH" satırlarına çevirir. Parçalar
+    doğrudan okunur; parça sınırına denk gelen word için tek byte taşınır.
+    """
+    chunks = buf.chunks if isinstance(buf, SegmentBuffer) else [buf]
+    carry = b""
+    for chunk in chunks:
+        if isinstance(chunk, ZeroFill):
+            n = chunk.length
+            if carry:
+                yield _hex_word_lines(carry + b"\0")
+                carry = b""
+                n -= 1
+            yield "0x0000\n" * (n // 2)
+            if n % 2:
+                carry = b"\0"
+            continue
+        mv = memoryview(chunk)
+        if not len(mv):
+            continue
+        if carry:
+            yield _hex_word_lines(carry + bytes(mv[:1]))
+            mv = mv[1:]
+            carry = b""
+        even = len(mv) & ~1
+        if even:
+            yield _hex_word_lines(mv[:even])
+        if len(mv) > even:
+            carry = bytes(mv[even:])
+    if carry:
+        yield _hex_word_lines(carry + b"\0")
+
+
+class Symbol:
+    """Sembol tablosu kaydı; adres düz integer, line tanımlandığı kaynak satırı (biliniyorsa)."""
+    __slots__ = ("name", "section", "address", "line")
+
+    def __init__(self, name, section, address, line=None):
+        self.name = name
+        self.section = section
+        self.address = address
+        self.line = line
+
+
+class Relocation:
+    """
+    Bir komutun ek word'üne yazılacak adres. offset section içindeki komut sırası,
+    word komutun kaçıncı word'ü olduğu (1: ilk ek word). symbol .ref sembolüdür
+    ya da yerel label'lar için label'ın section'ı (.text/.data/.bss); bu durumda
+    word'deki modül içi adres section'ın yerleşimine taşınır.
+    """
+    __slots__ = ("symbol", "section", "offset", "word")
+
+    def __init__(self, symbol, section, offset, word=1):
+        self.symbol = symbol
+        self.section = section
+        self.offset = offset
+        self.word = word
+
+    @property
+    def local(self):
+        return self.symbol in BASE_ADDRS
+
+
+# instruction ve register tabloları: modül yüklenirken bir kez kurulur,
+# salt okunur olduğu için bütün assembler örnekleri ve thread'ler paylaşır
+INSTRUCTIONS = MappingProxyType({
+    "MOV": "0100", "MOV.W": "0100",
+    "ADD": "0101", "ADD.W": "0101",
+    "SUB": "1000", "SUB.W": "1000",
+    "CMP": "1001", "RET": "000100110",
+    "JNE": "001000", "JEQ": "001001",
+    "JNC": "001010", "JC": "001011",
+    "JN": "001100", "JGE": "001101",
+    "JL": "001110", "JMP": "001111",
+    "NOP": "0000", "CALL": "000100101"
+})
+REGISTERS = MappingProxyType({f"R{i}": format(i, '04b') for i in range(16)})
+
+
+def clean_source(source):
+    """
+    Kaynağı yorumlardan temizler. (satırlar, orijinal satır numaraları) döner;
+    source tek string ya da satır listesi olabilir.
+    """
+    if isinstance(source, str):
+        source = source.splitlines()
+    cleaned = [line.split(";")[0].strip() for line in source]
+    return cleaned, list(range(1, len(cleaned) + 1))
 
 
 class MSP430Assembler:
     def __init__(self):
-        # instruction ve register tabloları
-        self.instructions = {
-            "MOV": "0100", "MOV.W": "0100",
-            "ADD": "0101", "ADD.W": "0101",
-            "SUB": "1000", "SUB.W": "1000",
-            "CMP": "1001", "RET": "000100110",
-            "JNE": "001000", "JEQ": "001001",
-            "JNC": "001010", "JC": "001011",
-            "JN": "001100", "JGE": "001101",
-            "JL": "001110", "JMP": "001111",
-            "NOP": "0000", "CALL": "000100101"
-        }
-        self.registers = {
-            "R0": "0000",
-            "R1": "0001",
-            "R2": "0010",
-            "R3": "0011",
-            "R4": "0100",
-            "R5": "0101",
-            "R6": "0110",
-            "R7": "0111",
-            "R8": "1000",
-            "R9": "1001",   
-            "R10": "1010",
-            "R11": "1011",
-            "R12": "1100",
-            "R13": "1101",
-            "R14": "1110",
-            "R15": "1111"
-        }
+        self.instructions = INSTRUCTIONS
+        self.registers = REGISTERS
 
         self.labels = {}
         self.sections = {}
         self.exports = {}   # .def ile tanımlanan sembolleri tutacak
         self.imports = {}    # .ref ile extern ilan edilenleri tutacak
-        self.relocations = [] # (symbol, section, offset) kayıtlarımız
-
-    def hexadec_to_binary(self, hexadec):
-        return bin(int(hexadec, 16))[2:].zfill(16)
+        self.relocations = [] # Relocation kayıtlarımız
+        self.line_addresses = array('L')
+        self.line_table = LineTable()
+        self.line_numbers = []              # temizlenmiş satır -> orijinal satır no
+        self.source_addresses = array('l')  # kaynak satırı -> adres (-1: yok)
+        self.line_output = []                # kaynak satırı -> pass2 çıktısı
+        self.org_pads = {}                   # ORG satırı -> pass2'nin yazacağı sıfır byte sayısı
+        self.base_dir = "."   # .incbin yolları buna göre çözülür
+        self.encoding_cache = ENCODING_CACHE
+        self.source_file = "" # satır tablosuna yazılan kaynak dosya adı
+
+    def assemble(self, source, name="module.obj", base_dir=".", workers=1, source_file=None):
+        """
+        Kaynağı iki geçişte derleyip ObjectModule döner. Bütün durum pass1'de
+        sıfırlandığı için aynı örnek art arda (aynı anda değil) tekrar kullanılabilir.
+        """
+        self.base_dir = base_dir
+        self.source_file = source_file or name
+        cleaned, mapping = clean_source(source)
+        with memory_phase("pass1"):
+            self.pass1(cleaned, mapping)
+        with memory_phase("pass2"):
+            codes = self.pass2(cleaned, workers)
+        return self.to_module(name, *codes)
 
     def binary_to_hex(self, binary):
         if len(binary) % 4 != 0:
             binary = binary.zfill((len(binary)//4 + 1)*4)
         return hex(int(binary, 2))[2:].upper().zfill(len(binary)//4)
 
-    def msp430_hex_addition(self, h1, h2):
-        total = (int(h1, 16) + int(h2, 16)) & 0xFFFF
-        return format(total, '04x')
-
     def pass1(self, lines, mapping):
+        # kaynak satırı başına adres (listing için), eklenen .text satırı hariç
+        self.source_addresses = array('l', [-1]) * len(lines)
+        self.line_numbers = mapping     # satır tablosunu pass2 doldurur
+        shift = 0
         # otomatik .text ekleme
         if not any(l.strip().startswith(('.text','.data','.bss')) for l in lines):
             lines = ['.text'] + lines
             mapping = [0] + mapping
+            shift = 1
 
-        address = "0000"
+        address = 0
         current_section = ".text"
-        base_addrs = {".text":"0000", ".data":"C000", ".bss":"E000"}
+        base_addrs = BASE_ADDRS
+        # section'a geri dönüldüğünde kaldığı adresten devam edilir (pass2 aynı section'ın
+        # satırlarını arka arkaya yazar)
+        cursors = dict(base_addrs)
 
-        self.labels.clear()
-        self.sections.clear()
-        self.exports.clear()
-        self.imports.clear()
-        self.line_addresses = []
+        # yeni tablolar: önceki çalışmanın ObjectModule'leri eski tabloları tutmaya devam eder
+        self.labels = {}
+        self.sections = {}
+        self.exports = {}
+        self.imports = {}
+        self.relocations = []
+        self.line_addresses = array('L')
+        self.line_table = LineTable()
+        self.org_pads = {}
         label_set = set()
+        pending = []     # (komut sırası, ek word ifadeleri)
 
-        self.sections[current_section] = {
-            "start": base_addrs[current_section],
-            "size": 0,
-            "symbols": {},
-            "references": []
-        }
+        self.sections[current_section] = Section(current_section, base_addrs[current_section])
 
         for idx, ln in enumerate(lines):
             orig_no = mapping[idx]
@@ -185,7 +1017,7 @@ class MSP430Assembler:
                 continue
 
             # --- .def: export tanımı (export table'a isim ekle, adresi henüz bilinmiyor) ---
-            if line.upper().startswith(".DEF"):
+            if line[:4].upper() == ".DEF":
                 names = re.split(r'[\s,]+', line, maxsplit=1)[1].split(",")
                 for n in names:
                     n = n.strip()
@@ -195,8 +1027,8 @@ class MSP430Assembler:
                 continue
 
             # --- .ref: import tanımı (import table'a isim ekle) ---
-            # case-insensitive .ref
-            if line.lower().startswith(".ref"):
+            # case-insensitive .ref; .exdef (örnek kodlarda) aynı anlamda
+            if line[:4].lower() == ".ref" or line[:6].lower() == ".exdef":
                 names = re.split(r'[\s,]+', line, maxsplit=1)[1].split(",")
                 for n in names:
                     n = n.strip()
@@ -206,20 +1038,25 @@ class MSP430Assembler:
 
             # yeni section
             if line.startswith((".text",".data",".bss")):
-                current_section = line
-                address = base_addrs[current_section]
-                self.sections[current_section] = {
-                    "start": address,
-                    "size": 0,
-                    "symbols": {},
-                    "references": []
-                }
+                cursors[current_section] = address
+                current_section = sys.intern(line)
+                address = cursors[current_section]
+                if current_section not in self.sections:
+                    self.sections[current_section] = Section(current_section, address)
                 continue
 
-            # ORG
-            if line.upper().startswith("ORG"):
-                address = line.split()[1]
+            # ORG: pass2 aradaki boşluğu sıfırla doldurur, bu yüzden sadece ileri gidilebilir
+            if line[:3].upper() == "ORG":
+                target = int(line.split()[1], 16)
+                pad = target - address
+                if pad < 0 or (pad & 1 and current_section == ".text"):
+                    raise Exception(f"ORG 0x{target:04X} geçersiz: adres 0x{address:04X} (satır {orig_no})")
+                if pad:
+                    self.org_pads[idx - shift] = pad
+                    self.sections[current_section].size += pad
+                address = target
                 continue
+            self.source_addresses[idx - shift] = address
 
             # label
             if ":" in line:
@@ -229,8 +1066,8 @@ class MSP430Assembler:
                 label_set.add(lbl)
                 if lbl in self.exports:
                     self.exports[lbl] = address
-                self.labels[lbl] = (current_section, address)
-                self.sections[current_section]["symbols"][lbl] = address
+                self.labels[lbl] = Symbol(lbl, current_section, address, orig_no)
+                self.sections[current_section].symbols[lbl] = address
                 line = rest.strip()
                 if not line:
                     continue
@@ -238,18 +1075,17 @@ class MSP430Assembler:
             # 1) .word / .byte directive
             if line.startswith(".word") or line.startswith(".byte"):
                 parts = re.split(r'[\s,]+', line, maxsplit=1)
-                if len(parts) > 1:
+                if len(parts) > 1 and may_contain_symbol(parts[1]):
                     for tok in re.findall(r"\b[A-Za-z_]\w*\b", parts[1]):
                         if tok not in self.registers:
-                            self.sections[current_section]["references"].append((tok, orig_no))
+                            self.sections[current_section].references.append((tok, orig_no, address))
                 # boyut hesabı aşağıda
             # 2) kod satırları
-            tok0 = line.split()[0].upper()
-            if tok0 in self.instructions:
-                inst_idx = len(self.line_addresses)
-                for sym in self.imports:
-                    if re.search(r'\b{}\b'.format(sym), line):
-                        self.relocations.append((sym, current_section, inst_idx))
+            tok0 = line.split(None, 1)[0].upper()
+            if tok0 in self.instructions and current_section == ".text":
+                exprs = extension_exprs(line)
+                if exprs:
+                    pending.append((len(self.line_addresses), exprs))
                 self.line_addresses.append(address)
                 parts = re.split(r'[\s,]+', line)
                 for opd in parts[1:]:
@@ -258,48 +1094,178 @@ class MSP430Assembler:
                     if (re.match(r'^[A-Za-z_]\w*$', opd)
                             and opd not in self.registers
                             and opd.upper() not in self.instructions):
-                        self.sections[current_section]["references"].append((opd, orig_no))
+                        self.sections[current_section].references.append((opd, orig_no, address))
 
             # boyut hesaplama
-            inc = 2
-            if current_section == ".text" and any(x in line for x in ['#','&','(']):
-                inc = 4
-            elif current_section == ".data":
-                if line.startswith(".word"):
-                    cnt = len([v for v in line.split(".word",1)[1].split(",") if v.strip()])
-                    inc = 2*cnt
-                elif line.startswith(".byte"):
-                    cnt = len([v for v in line.split(".byte",1)[1].split(",") if v.strip()])
-                    inc = cnt
-            elif current_section == ".bss" and line.startswith(".space"):
-                sz = int(line.split(".space",1)[1])
-                inc = 2*sz
-
-            self.sections[current_section]["size"] += inc
-            address = format(int(address,16) + inc, '04X')
+            if line[:7].lower() == ".incbin" and current_section != ".data":
+                raise Exception(f".incbin sadece .data section'ında kullanılabilir (satır {orig_no})")
+            inc = line_size(line, current_section, self.base_dir)
+
+            self.sections[current_section].size += inc
+            address += inc
+
+        # ek word'lerdeki semboller (label'lar ileride tanımlanmış olabilir): .ref'leri
+        # linker çözer, yerel label'ların adresi section'ın yerleşimine göre kaydırılır
+        for inst_idx, exprs in pending:
+            for word, expr in enumerate(exprs, 1):
+                sym = self.labels.get(expr)
+                if sym is not None:
+                    self.relocations.append(Relocation(sym.section, ".text", inst_idx, word))
+                elif expr in self.imports:
+                    self.relocations.append(Relocation(expr, ".text", inst_idx, word))
 
         return self.labels, self.sections
 
-    def get_operand_binary_dual_operand(self, o1, o2):
+    def operand_value(self, expr):
+        """Ek word değeri: label adresi, .ref sembolü için 0 (linker yamar) ya da hex sayı."""
+        sym = self.labels.get(expr)
+        if sym is not None:
+            return sym.address
+        if expr in self.imports:
+            return 0
         try:
-            if o1 in self.registers and o2 in self.registers:
-                return (self.registers[o1], self.registers[o2], "00")
-            if o1 or o2 in self.imports:
-                if o1 or o2 in self.registers:
-                    if o1 in self.registers:
-                        return (self.registers[o1], "0000", "00")
-                    else:
-                        return ("0000", self.registers[o2], "00")
-                else:
-                    return ("0000", "0000", "00")
-            if o1.startswith("#"):
-                imm = self.hexadec_to_binary(o1[1:])
-                return (self.registers["R3"], self.registers[o2], "11", imm)
-            return f"Unsupported operands {o1},{o2}"
-        except:
-            return f"Unsupported operands {o1},{o2}"
+            value = int(expr, 16)
+        except ValueError:
+            raise Exception(f"Undefined label {expr}")
+        if not -0x8000 <= value <= 0xFFFF:
+            raise Exception(f"Değer 16 bite sığmıyor: {expr}")
+        return value & 0xFFFF
 
-    def pass2(self, lines):
+    def get_operand_binary_dual_operand(self, o1, o2):
+        """(kaynak reg, hedef reg, As, Ad, [ek word'ler]); boyut instruction_size ile aynıdır."""
+        s_as, s_reg, s_ext = parse_operand(o1)
+        d_as, d_reg, d_ext = parse_operand(o2)
+        if s_reg not in self.registers or d_reg not in self.registers or d_as > 1:
+            return f"Unsupported operands {o1},{o2}"
+        ext = [format(self.operand_value(x), '016b') for x in (s_ext, d_ext) if x is not None]
+        return (self.registers[s_reg], self.registers[d_reg], format(s_as, '02b'), str(d_as), ext)
+
+    def _strip_text_line(self, ln):
+        # yorum/section satırlarında ve sadece label olan satırlarda None
+        ln = ln.strip()
+        if not ln or ln.startswith((".text",";")):
+            return None
+        if ":" in ln:
+            ln = ln.split(":",1)[1].strip()
+            if not ln:
+                return None
+        return ln
+
+    def _encode_text_line(self, ln, text_ptr):
+        """Tek bir .text satırını kodlar; komut üretmeyen satırlar için None."""
+        parts = ln.split()
+        instr = parts[0].upper()
+        if instr in ["MOV","MOV.W","ADD","ADD.W","SUB","SUB.W","CMP"]:
+            ops = split_operands(ln)[1]
+            if len(ops) != 2:
+                raise Exception(f"Unsupported operands {','.join(ops)}")
+            opi = self.get_operand_binary_dual_operand(*ops)
+            if isinstance(opi,str):
+                raise Exception(opi)
+            code = self.instructions[instr]
+            bw = "1"
+            s,d,a,ad,ext = opi
+            return f"{code}{s}{ad}{bw}{a}{d}" + "".join(ext)
+
+        elif instr in ["JMP","JEQ","JNE","JC","JN","JNC","JGE","JL"]:
+            tgt = parts[1]
+            if tgt not in self.labels:
+                raise Exception(f"Undefined label {tgt}")
+            opcode = self.instructions[instr]
+            cur_addr = self.line_addresses[text_ptr]
+            dest = self.labels[tgt].address
+            off = ((dest-(cur_addr+2))//2) & 0x3FF
+            return f"{opcode}{bin(off)[2:].zfill(10)}"
+
+        elif instr=="NOP":
+            return self.instructions["NOP"].ljust(16,"0")
+        elif instr=="RET":
+            code = self.instructions["RET"]
+            ad,bw = "00","0"
+            return f"{code}{bw}{ad}{'0000'}"
+
+        elif instr=="CALL":
+            ops = split_operands(ln)[1]
+            if len(ops) != 1:
+                raise Exception(f"Unsupported operands {','.join(ops)}")
+            a, reg, ext = parse_operand(ops[0])
+            if a == 1 and reg == "R2" and not ops[0].startswith("&"):
+                a, reg = 3, "R0"     # CALL hedef -> CALL #hedef
+            if reg not in self.registers:
+                raise Exception(f"Unsupported operands {ops[0]}")
+            code = self.instructions[instr]
+            bw = "0"
+            binstr = f"{code}{bw}{a:02b}{self.registers[reg]}"
+            if ext is not None:
+                binstr += format(self.operand_value(ext), '016b')
+            return binstr
+        return None
+
+    def _encode_text_chunk(self, chunk, text_ptr):
+        # text_ptr: chunk'ın ilk komutunun line_addresses içindeki sırası
+        # counts: chunk'taki her satırın ürettiği word sayısı (listing için)
+        codes = array('H')
+        counts = array('H')
+        cache = self.encoding_cache
+        # label'lar operandlara alt dize olarak yerleştirildiği için, register/sayı
+        # içinde geçebilecek bir label varsa bu modülde önbellek kullanılmaz
+        if cache is not None and any(_PI_CHARS.issuperset(s) for s in chain(self.labels, self.imports)):
+            cache = None
+        for ln in chunk:
+            ln = self._strip_text_line(ln)
+            if ln is None:
+                counts.append(0)
+                continue
+            key = words = None
+            if cache is not None:
+                parts = ln.split()
+                instr = parts[0].upper()
+                if instr in _FIXED_ENCODING:
+                    key = instr
+                elif instr in _OPERAND_ENCODING and all(_PI_OPERAND.match(p) for p in parts[1:]):
+                    key = " ".join([instr] + parts[1:])
+                if key is not None:
+                    words = cache.get(key)
+            if words is None:
+                binstr = self._encode_text_line(ln, text_ptr)
+                if binstr is None:
+                    counts.append(0)
+                    continue
+                words = tuple(int(binstr[i:i+16], 2) for i in range(0, len(binstr), 16))
+                if key is not None:
+                    cache.put(key, words)
+            text_ptr += 1
+            codes.extend(words)
+            counts.append(len(words))
+        return codes, counts
+
+    def _encode_text_parallel(self, text_lines, workers):
+        """
+        pass1 bütün adresleri sabitlediği için satırlar birbirinden bağımsız
+        kodlanabilir. Satırlar parçalara bölünür, her parçanın ilk komut sırası
+        önceden sayılır ve parçalar process pool'da kodlanıp sırayla birleştirilir.
+        Sembol tablosu her worker'a bir kez (initializer ile) gönderilir.
+        """
+        tasks = []
+        text_ptr = 0
+        for i in range(0, len(text_lines), PASS2_CHUNK_LINES):
+            chunk = text_lines[i:i+PASS2_CHUNK_LINES]
+            tasks.append((chunk, text_ptr))
+            for ln in chunk:
+                ln = self._strip_text_line(ln)
+                if ln is not None and ln.split()[0].upper() in self.instructions:
+                    text_ptr += 1
+
+        text_codes = array('H')
+        text_counts = array('H')
+        with ProcessPoolExecutor(max_workers=workers, initializer=_pass2_worker_init,
+                                 initargs=(self.labels, self.line_addresses, self.imports)) as ex:
+            for codes, counts in ex.map(_pass2_worker_encode, tasks):
+                text_codes.extend(codes)
+                text_counts.extend(counts)
+        return text_codes, text_counts
+
+    def pass2(self, lines, workers=1):
         section_indices = {".text":[], ".data":[], ".bss":[]}
         current = ".text"
         for i,ln in enumerate(lines):
@@ -307,12 +1273,21 @@ class MSP430Assembler:
                 current = ln.strip().split()[0]
             section_indices[current].append(i)
 
-        data_codes = []
-        text_codes = []
-        bss_codes  = []
+        data_codes = SegmentBuffer()
+        bss_codes  = SegmentBuffer()
+        # satır başına üretilen içerik: text word'leri, data byte'ları, bss uzunluğu
+        self.line_output = [None] * len(lines)
+        # satır tablosu üretilen word/byte konumundan kurulur; pass1 adresleriyle aynıdır
+        line_table = self.line_table = LineTable()
+        file_id = line_table.file_id(self.source_file)
+        line_no = self.line_numbers
+        pads = self.org_pads
 
         # DATA
         for idx in section_indices[".data"]:
+            if idx in pads:
+                data_codes.append_zeros(pads[idx])
+                continue
             ln = lines[idx].strip()
             if not ln or ln.startswith((".data",";")):
                 continue
@@ -320,513 +1295,994 @@ class MSP430Assembler:
                 ln = ln.split(":",1)[1].strip()
                 if not ln:
                     continue
-            if ln.startswith(".word"):
-                for v in ln.split(".word",1)[1].split(","):
-                    data_codes.append(self.hexadec_to_binary(v.strip()))
-            elif ln.startswith(".byte"):
-                for v in ln.split(".byte",1)[1].split(","):
-                    val=v.strip()
-                    if val.lower().startswith("0x"):
-                        data_codes.append(bin(int(val,16))[2:].zfill(8))
-                    else:
-                        data_codes.append(bin(int(val))[2:].zfill(8))
-
-        
-        
+            offset = len(data_codes)
+            if ln.startswith((".word", ".byte")):
+                raw = encode_data_values(ln[5:], 2 if ln.startswith(".word") else 1)
+                data_codes.append(raw)
+                self.line_output[idx] = raw
+            elif ln[:7].lower() == ".incbin":
+                self.line_output[idx] = data_codes.append_file(*parse_incbin(ln, self.base_dir))
+            elif ln.startswith(".space"):
+                sz = int(ln.split(".space",1)[1])
+                data_codes.append_zeros(2*sz)
+                self.line_output[idx] = 2*sz
+            if len(data_codes) > offset:
+                line_table.add(BASE_ADDRS[".data"] + offset, file_id, line_no[idx])
+
         # TEXT
-        text_ptr = 0
-        for idx in section_indices[".text"]:
-            ln = lines[idx].strip()
-            if not ln or ln.startswith((".text",";")):
-                continue
-            if ":" in ln:
-                ln = ln.split(":",1)[1].strip()
-                if not ln:
-                    continue
-            parts = ln.split()
-            instr = parts[0].upper()
-            if instr in ["MOV","MOV.W","ADD","ADD.W","SUB","SUB.W","CMP"]:
-                # replace labels
-                for lbl,(sec,addr) in self.labels.items():
-                    for j in (1,2):
-                        if lbl in parts[j]:
-                            parts[j] = parts[j].replace(lbl, addr)
-                src,dst = parts[1].rstrip(","), parts[2].rstrip(",")
-                opi = self.get_operand_binary_dual_operand(src,dst)
-                if isinstance(opi,str):
-                    raise Exception(opi)
-                code = self.instructions[instr]
-                ad,bw = "0","1"
-                if len(opi)==3:
-                    s,d,a = opi; binstr=f"{code}{s}{ad}{bw}{a}{d}"
-                elif len(opi)==2:
-                    s,d,a,imm = opi; binstr=f"{code}{s}{ad}{bw}{a}{d}{imm}"
-                else:
-                    r3,d,a,imm = opi; binstr=f"{code}{r3}{ad}{bw}{a}{d}{imm}"
-                text_codes.append(binstr); text_ptr+=1
-
-            elif instr in ["JMP","JEQ","JNE","JC","JN","JNC","JGE","JL"]:
-                tgt = parts[1]
-                if tgt not in self.labels:
-                    raise Exception(f"Undefined label {tgt}")
-                opcode = self.instructions[instr]
-                cur_addr = int(self.line_addresses[text_ptr],16)
-                dest = int(self.labels[tgt][1],16)
-                off = ((dest-(cur_addr+2))//2) & 0x3FF
-                text_codes.append(f"{opcode}{bin(off)[2:].zfill(10)}"); text_ptr+=1
-
-            elif instr=="NOP":
-                text_codes.append(self.instructions["NOP"].ljust(16,"0")); text_ptr+=1
-            elif instr=="RET":
-                code = self.instructions["RET"]
-                ad,bw = "00","0"
-                binstr=f"{code}{bw}{ad}{'0000'}"
-                text_codes.append(binstr); text_ptr+=1
-                
-            elif instr=="CALL":
-                code = self.instructions[instr]
-                ad,bw = "00","1"
-                binstr=f"{code}{bw}{ad}{'0000'}"
-                text_codes.append(binstr); text_ptr+=1
+        text_lines = [lines[idx] for idx in section_indices[".text"]]
+        # paralel kodlama sadece açıkça istenirse (CLI/daemon); arayüz Tk yüklü süreci fork etmemeli
+        if workers > 1 and len(text_lines) >= PASS2_PARALLEL_MIN_LINES:
+            text_codes, text_counts = self._encode_text_parallel(text_lines, workers)
+        else:
+            text_codes, text_counts = self._encode_text_chunk(text_lines, 0)
+        # ORG boşlukları sıfır word olarak araya girer
+        padded = array('H') if pads else text_codes
+        pos = 0
+        for idx, n in zip(section_indices[".text"], text_counts):
+            if idx in pads:
+                padded.extend(repeat(0, pads[idx] // 2))
+            if n:
+                self.line_output[idx] = text_codes[pos:pos+n]
+                line_table.add(BASE_ADDRS[".text"] + 2 * (len(padded) if pads else pos),
+                               file_id, line_no[idx])
+                if pads:
+                    padded.extend(self.line_output[idx])
+                pos += n
+        text_codes = padded
+        line_table.sort()
 
                 # BSS
         for idx in section_indices[".bss"]:
             ln = lines[idx].strip()
             if not ln or ln.startswith((".bss",";")):
                 continue
+            if idx in pads:
+                bss_codes.append_zeros(pads[idx])
+                continue
+            if self.source_addresses[idx] < 0:
+                continue    # pass1'in yer vermediği satırlar (.def/.ref, ORG)
             if ":" in ln:
                 ln=ln.split(":",1)[1].strip()
                 if not ln:
                     continue
+            # pass1 ile aynı boyutlar: .space N -> N word, diğer satırlar 1 word
             if ln.startswith(".space"):
                 sz=int(ln.split(".space",1)[1])
-                for _ in range(sz):
-                    bss_codes.append("0"*16)
-        
-        all_codes = data_codes + text_codes
-        return data_codes, text_codes, all_codes
+                bss_codes.append_zeros(2*sz)
+                self.line_output[idx] = 2*sz
+            else:
+                bss_codes.append_zeros(2)
+                self.line_output[idx] = 2
+
+        return data_codes, text_codes, bss_codes
+
+    def iter_listing(self, source_lines, extra=None, extra_title=""):
+        """
+        pass1 adresleri ve pass2'nin satır başına ürettiği word'lerden listing
+        satırları üretir. Dört word'ü aşan satırlar devam satırlarına bölünür.
+        extra ({satır indeksi: metin}) kaynaktan önce ek bir sütun ekler.
+        """
+        xw = len(extra_title)
+        yield f"; MSP430 listing: {self.source_file}\n"
+        yield (f"{'Satır':>6}  Adres  {'Kod':<{LISTING_WORDS * 5 - 1}}  "
+               + (f"{extra_title}  " if extra is not None else "") + "Kaynak\n")
+        width = 4 * LISTING_WORDS
+        for i, src in enumerate(source_lines):
+            addr = self.source_addresses[i] if i < len(self.source_addresses) else -1
+            out = self.line_output[i] if i < len(self.line_output) else None
+            if isinstance(out, array):
+                hx = "".join(f"{w:04X}" for w in out)
+            elif out is None or isinstance(out, int):
+                hx = ""     # kod üretmeyen satır ya da .bss
+            else:
+                even = len(out) & ~1
+                hx = _swap16(bytes(out[:even])).hex().upper()
+                if len(out) > even:
+                    hx += f"{out[even]:02X}"
+            col = f"{addr:04X}" if addr >= 0 else "    "
+            first = hx[:width]
+            x = f"{extra.get(i, ''):<{xw}}  " if extra is not None else ""
+            yield f"{i + 1:6d}  {col}   {' '.join(first[j:j+4] for j in range(0, len(first), 4)):<{LISTING_WORDS * 5 - 1}}  {x}{src}\n"
+            for k in range(width, len(hx), width):
+                part = hx[k:k+width]
+                cont = f"{addr + k // 2:04X}" if addr >= 0 else "    "
+                yield f"{'':6}  {cont}   {' '.join(part[j:j+4] for j in range(0, len(part), 4))}\n"
+
+    def to_module(self, name, data_codes, text_codes, bss_codes):
+        """pass2 çıktısını obj yazıcısı ve linker'ın kullandığı ObjectModule'e çevirir."""
+        m = ObjectModule(name)
+        m.text = text_codes
+        m.data = data_codes
+        m.bss = bss_codes.zero_fills()
+        for sym, addr in self.exports.items():
+            label = self.labels.get(sym) if addr is not None else None
+            m.exports[sym] = Symbol(sym, label and label.section, addr, label and label.line)
+        m.relocations = list(self.relocations)
+        m.labels = self.labels
+        m.sections = self.sections
+        m.lines = self.line_table
+        return m
+
+def assemble(source, name="module.obj", base_dir=".", workers=1, source_file=None):
+    """Durumsuz giriş noktası: her çağrı kendi assembler örneğini kullanır."""
+    return MSP430Assembler().assemble(source, name, base_dir, workers, source_file)
+
+
+class AssemblerPool:
+    """
+    Eş zamanlı derleme istekleri için thread havuzu. Her thread kendi
+    MSP430Assembler örneğini bir kez oluşturup sonraki isteklerde tekrar
+    kullanır; ISA tabloları zaten paylaşıldığı için ek kurulum maliyeti yoktur.
+    """
+    def __init__(self, workers=None):
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def assembler(self):
+        """Çağıran thread'in assembler örneği (ilk çağrıda oluşturulur)."""
+        asm = getattr(self._local, "asm", None)
+        if asm is None:
+            asm = self._local.asm = MSP430Assembler()
+        return asm
+
+    def _assemble(self, source, name, base_dir, source_file):
+        # thread içinde process pool açılmasın
+        return self.assembler().assemble(source, name, base_dir, 1, source_file)
+
+    def submit(self, source, name="module.obj", base_dir=".", source_file=None):
+        return self._executor.submit(self._assemble, source, name, base_dir, source_file)
+
+    def call(self, fn, *args):
+        """Herhangi bir işi aynı sınırlı havuzda çalıştırır (link, dönüştürme...)."""
+        return self._executor.submit(fn, *args)
+
+    def map(self, sources, base_dir="."):
+        """{isim: kaynak} sözlüğünü derler, {isim: ObjectModule} döner."""
+        futures = {n: self.submit(src, n, base_dir) for n, src in sources.items()}
+        return {n: f.result() for n, f in futures.items()}
+
+    def close(self):
+        self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# pass2 process pool worker'ı: sembol tablosu initializer ile bir kez gelir
+_pass2_asm = None
+
+def _pass2_worker_init(labels, line_addresses, imports):
+    global _pass2_asm
+    _pass2_asm = MSP430Assembler()
+    _pass2_asm.labels = labels
+    _pass2_asm.line_addresses = line_addresses
+    _pass2_asm.imports = imports
+
+def _pass2_worker_encode(task):
+    chunk, text_ptr = task
+    return _pass2_asm._encode_text_chunk(chunk, text_ptr)
+
+
+class MemoryRegion:
+    """Hedef bellekte bir bölge ve oraya yerleştirilecek section'lar."""
+    def __init__(self, name, origin, length, sections=()):
+        self.name = name
+        self.origin = origin
+        self.length = length
+        self.sections = tuple(sections)
+
+    @property
+    def end(self):
+        return self.origin + self.length
+
+
+# pass1 taban adresleriyle uyumlu varsayılan bellek haritası
+DEFAULT_MEMORY_MAP = (
+    MemoryRegion("FLASH",   0x0000, 0xC000, (".text",)),
+    MemoryRegion("DATA",    0xC000, 0x2000, (".data",)),
+    MemoryRegion("RAM",     0xE000, 0x1FE0, (".bss",)),
+    MemoryRegion("VECTORS", 0xFFE0, 0x0020, (".vectors",)),
+)
+
+
+class IntervalIndex:
+    """
+    Başlangıç adresine göre sıralı [start, end) aralıkları.
+    Ekleme sırasında komşularla çakışma kontrolü ve adres sorgusu bisect ile
+    O(log n); binlerce section için de hızlı kalır.
+    """
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.owners = []
+
+    def add(self, start, end, owner):
+        i = bisect_right(self.starts, start)
+        if i and self.ends[i-1] > start:
+            raise Exception(f"Overlap: {owner} [0x{start:04X}-0x{end:04X}) ile "
+                            f"{self.owners[i-1]} [0x{self.starts[i-1]:04X}-0x{self.ends[i-1]:04X})")
+        if i < len(self.starts) and self.starts[i] < end:
+            raise Exception(f"Overlap: {owner} [0x{start:04X}-0x{end:04X}) ile "
+                            f"{self.owners[i]} [0x{self.starts[i]:04X}-0x{self.ends[i]:04X})")
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.owners.insert(i, owner)
+
+    def find(self, addr):
+        i = bisect_right(self.starts, addr) - 1
+        if i >= 0 and addr < self.ends[i]:
+            return self.owners[i]
+        return None
+
+    def __iter__(self):
+        return zip(self.starts, self.ends, self.owners)
+
+    def __len__(self):
+        return len(self.starts)
+
+
+# Jxx komutlarının erişimi ±512 word; daha uzak hedefler uzun form (BR/CALL #adres) ister
+JUMP_REACH = 1024
+
+
+def read_profile(path):
+    """Simülatörün --profile çıktısı: {"dosya:satır": çalışma sayısı}."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["lines"]
+
+
+class ObjArchive:
+    """
+    Statik kütüphane (.lib): birden fazla .obj dosyasını tek dosyada toplar.
+    Dosyanın başında sembol -> üye indeksi bulunur; böylece linker üye
+    içeriklerini parse etmeden hangi üyeye ihtiyacı olduğunu bulabilir.
+
+        COFFLIB
+        INDEX <üye sayısı> <sembol sayısı>
+        MEMBER <no> <offset> <uzunluk> <isim>
+        SYMBOL <sembol> <no>
+        ENDINDEX
+        <üyelerin obj içerikleri art arda>
+    """
+    MAGIC = "COFFLIB"
+
+    def __init__(self, path):
+        self.path = path
+        self.members = []   # [(isim, offset, uzunluk)]
+        self.index = {}     # sembol -> üye no
+        self.loaded = set() # linklenmek üzere çekilmiş üyeler
+        with open(path, "rb") as f:
+            if f.readline().decode().strip() != self.MAGIC:
+                raise Exception(f"Geçersiz arşiv dosyası: {path}")
+            for raw in f:
+                parts = raw.decode().split()
+                if not parts:
+                    continue
+                if parts[0] == "ENDINDEX":
+                    break
+                if parts[0] == "MEMBER":
+                    # isim satırın geri kalanıdır, boşluk içerebilir
+                    _, _, off, length, name = raw.decode().rstrip("\r\n").split(" ", 4)
+                    self.members.append((name, int(off), int(length)))
+                elif parts[0] == "SYMBOL":
+                    self.index[parts[1]] = int(parts[2])
+            self.payload_start = f.tell()
+
+    def lookup(self, sym):
+        return self.index.get(sym)
+
+    def read_member(self, idx):
+        name, offset, length = self.members[idx]
+        with open(self.path, "rb") as f:
+            f.seek(self.payload_start + offset)
+            return name, f.read(length).decode()
+
+    @staticmethod
+    def _scan_exports(text):
+        # sadece EXPORTS bölümünü okur, adresi belirsiz (????) olanları atlar
+        syms = []
+        in_exports = False
+        for ln in text.splitlines():
+            ln = ln.strip()
+            if ln == "EXPORTS":
+                in_exports = True; continue
+            if ln in ("RELOCATIONS", "EOF") or ln.startswith("SECTION"):
+                in_exports = False; continue
+            if in_exports and ln:
+                sym, addr = ln.split()[:2]
+                if "?" not in addr:
+                    syms.append(sym)
+        return syms
+
+    @classmethod
+    def create(cls, path, obj_paths):
+        members = []
+        index = {}
+        offset = 0
+        for i, op in enumerate(obj_paths):
+            with open(op, "rb") as f:
+                payload = f.read()
+            for sym in cls._scan_exports(payload.decode()):
+                if sym in index:
+                    raise Exception(f"Duplicate export {sym} ({os.path.basename(op)})")
+                index[sym] = i
+            members.append((os.path.basename(op), offset, payload))
+            offset += len(payload)
+
+        header = [cls.MAGIC, f"INDEX {len(members)} {len(index)}"]
+        for i, (name, off, payload) in enumerate(members):
+            header.append(f"MEMBER {i} {off} {len(payload)} {name}")
+        for sym, i in index.items():
+            header.append(f"SYMBOL {sym} {i}")
+        header.append("ENDINDEX")
+        with open(path, "wb") as f:
+            f.write(("\n".join(header) + "\n").encode())
+            for _, _, payload in members:
+                f.write(payload)
+
+
+# obj klasöründeki çapraz referans indeksinin klasörü (modül başına bir kayıt)
+XREF_DIR = "xref"
+
+
+class XrefIndex:
+    """
+    Proje genelinde sembol -> tanım ve referans yerleri. Her modülün (kaynak
+    dosyası) kayıtları ayrı tutulur; bir modül yeniden derlendiğinde sadece
+    onun kayıtları değiştirilir. Sorgular sembol başına sözlükten O(1)'dir.
+    Adresler modülün kendi (link öncesi) adresleridir.
+
+    Diskte her modül indeks klasöründe kendi küçük JSON dosyasındadır; bir
+    modülün güncellemesi sadece o dosyayı yazar, load() kayıtları birleştirir.
+    """
+    VERSION = 2
+
+    def __init__(self):
+        self.modules = {}   # modül -> {"file", "defs": {sym: [satır, adres, section]}, "refs": [[sym, satır, adres]]}
+        self._defs = {}     # sym -> {modül: (satır, adres, section)}
+        self._refs = {}     # sym -> {modül: [(satır, adres)]}
+
+    def update(self, key, source, labels, sections):
+        """key modülünün kayıtlarını pass1 çıktısıyla (labels, sections) değiştirir."""
+        defs = {n: [s.line, s.address, s.section] for n, s in labels.items()}
+        refs = [[sym, line, addr] for sec in sections.values()
+                for sym, line, addr in sec.references]
+        self._set(key, {"file": source, "defs": defs, "refs": refs})
+
+    def update_module(self, key, source, module):
+        self.update(key, source, module.labels, module.sections)
+
+    def remove(self, key):
+        old = self.modules.pop(key, None)
+        if old is None:
+            return
+        for sym in old["defs"]:
+            self._drop(self._defs, sym, key)
+        for sym, _, _ in old["refs"]:
+            self._drop(self._refs, sym, key)
+
+    @staticmethod
+    def _drop(table, sym, key):
+        entry = table.get(sym)
+        if entry is not None:
+            entry.pop(key, None)
+            if not entry:
+                del table[sym]
+
+    def _set(self, key, rec):
+        self.remove(key)
+        self.modules[key] = rec
+        for sym, (line, addr, sec) in rec["defs"].items():
+            self._defs.setdefault(sym, {})[key] = (line, addr, sec)
+        for sym, line, addr in rec["refs"]:
+            self._refs.setdefault(sym, {}).setdefault(key, []).append((line, addr))
+
+    def definitions(self, sym):
+        """[(dosya, satır, adres, section)]"""
+        return [(self.modules[k]["file"],) + d for k, d in self._defs.get(sym, {}).items()]
+
+    def references(self, sym):
+        """[(dosya, satır, adres)]"""
+        return [(self.modules[k]["file"], line, addr)
+                for k, sites in self._refs.get(sym, {}).items() for line, addr in sites]
+
+    def lookup(self, sym):
+        return {"symbol": sym,
+                "definitions": [dict(zip(("file", "line", "address", "section"), d))
+                                for d in self.definitions(sym)],
+                "references": [dict(zip(("file", "line", "address"), r))
+                               for r in self.references(sym)]}
+
+    def symbols(self):
+        return sorted(set(self._defs) | set(self._refs))
+
+    @staticmethod
+    def record_path(path, key):
+        # modül anahtarı bir dosya yolu olabilir, dosya adı özetinden türetilir
+        return os.path.join(path, hashlib.sha1(key.encode()).hexdigest()[:16] + ".json")
+
+    def save_module(self, path, key):
+        """Sadece key modülünün kaydını yazar (modül silinmişse dosyasını siler)."""
+        os.makedirs(path, exist_ok=True)
+        rec_path = self.record_path(path, key)
+        rec = self.modules.get(key)
+        if rec is None:
+            if os.path.exists(rec_path):
+                os.unlink(rec_path)
+            return
+        tmp = rec_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": self.VERSION, "key": key, "record": rec}, f)
+        os.replace(tmp, rec_path)
+
+    def save(self, path):
+        for key in self.modules:
+            self.save_module(path, key)
+
+    @classmethod
+    def load(cls, path):
+        idx = cls()
+        if os.path.isdir(path):
+            for e in os.scandir(path):
+                if not e.name.endswith(".json"):
+                    continue
+                with open(e.path) as f:
+                    data = json.load(f)
+                if data.get("version") == cls.VERSION:
+                    idx._set(data["key"], data["record"])
+        return idx
+
+    @classmethod
+    def update_file(cls, obj_dir, key, source, labels, sections):
+        """Tek modülün kaydını obj_dir'deki indekse yazar; diğer kayıtlar okunmaz."""
+        idx = cls()
+        idx.update(key, source, labels, sections)
+        idx.save_module(os.path.join(obj_dir, XREF_DIR), key)
+        return idx
+
 
 class LinkEditor:
-    def __init__(self, obj_dir):
+    """
+    obj_dir verilirse oradaki .obj/.lib dosyaları yüklenir. obj_dir None ise
+    modüller add_module() ile geldikçe eklenir (paralel build); çözülemeyen
+    extern'ler unresolved'da bekler, resolve_archives() kalanları arşivlerden çeker.
+
+    pool_data=True ise .data label'lı bloklar halinde yerleştirilir; daha önce
+    yazılmış bir blokla birebir aynı olan blok imaja yazılmaz, o bloğa ait
+    semboller ve relocation'lar ilk kopyayı gösterir (sabit tablolar içindir;
+    .data'sına yazan modüllerde kullanılmamalı).
+    """
+    def __init__(self, obj_dir, libs=(), memory_map=DEFAULT_MEMORY_MAP, reader=read_object_file,
+                 pool_data=False):
         self.obj_dir = obj_dir
-        self.modules = []   # her modül: { text: [...], data: [...], exports: {sym:addr}, relocs:[(sym,sec,off)] }
-        self.global_exports = {}
-        self.global_text = []
-        self.global_data = []
-        self._load_modules()
+        self.reader = reader    # path -> ObjectModule (daemon önbellekli okuyucu verir)
+        self.modules = []   # [ObjectModule]
+        self.archives = [ObjArchive(p) for p in libs]
+        self.memory_map = tuple(memory_map)
+        self.global_exports = {} # sym -> (ObjectModule, Symbol)
+        self.global_text = array('H')
+        self.global_data = SegmentBuffer()
+        self.global_bss = []     # [ZeroFill] gerçek adreslerle
+        self.global_lines = LineTable()  # gerçek adres -> kaynak satırı
+        self.symbols = {}        # sym -> link sonrası gerçek adres
+        self.placements = IntervalIndex()
+        self.region_origins = {} # section -> bölge başlangıcı
+        self.region_usage = {}   # bölge adı -> kullanılan byte
+        self.unresolved = {}     # sym -> henüz tanımı gelmemiş relocation sayısı
+        self.pool_data = pool_data
+        self.pooled = []         # [(modül, blok ofseti, boyut, paylaşılan adres, ilk kopyanın modülü)]
+        self.pool_saved = 0      # havuzlama ile yazılmayan byte
+        self.data_maps = {}      # id(modül) -> (blok başlangıçları, [(baş, son, adres, yazıldı mı)])
+        if obj_dir is not None:
+            with memory_phase("load"):
+                self._load_modules()
+
+    def _scan_dir(self):
+        """obj_dir'deki arşivlerin yolları ve modüller."""
+        libs, modules = [], []
+        # os.listdir sırası dosya sistemine bağlı; yerleşim (imaj) her yerde aynı olsun
+        for fn in sorted(os.listdir(self.obj_dir)):
+            path = os.path.join(self.obj_dir, fn)
+            if fn.endswith(".lib"):
+                libs.append(path)
+            elif fn.endswith(".obj"):
+                m = self.reader(path)
+                if not m.linked:   # önceki link çıktısı (final.obj) girdi değildir
+                    modules.append(m)
+        return libs, modules
 
     def _load_modules(self):
-        for fn in os.listdir(self.obj_dir):
-            if not fn.endswith(".obj"): continue
-            path = os.path.join(self.obj_dir, fn)
-            self.modules.append(self._parse_obj(path))
+        libs, modules = self._scan_dir()
+        self.archives.extend(ObjArchive(p) for p in libs)
+        for m in modules:
+            self.add_module(m)
+        self.resolve_archives()
+
+    def add_module(self, m):
+        """Modülün export'larını kaydeder, relocation'larını çözer ya da bekletir."""
+        self.modules.append(m)
+        self._add_exports(m)
+        for name in m.exports:
+            self.unresolved.pop(name, None)
+        for r in m.relocations:
+            if not r.local and r.symbol not in self.global_exports:
+                self.unresolved[r.symbol] = self.unresolved.get(r.symbol, 0) + 1
+
+    def sort_modules(self, key):
+        """Modül sırasını (dolayısıyla yerleşimi) değiştirir; export'lar da yeni sırayı izler."""
+        self.modules.sort(key=key)
+        rank = {id(m): i for i, m in enumerate(self.modules)}
+        self.global_exports = dict(sorted(self.global_exports.items(),
+                                          key=lambda kv: rank[id(kv[1][0])]))
+
+    @staticmethod
+    def _inst_offsets(m):
+        """
+        Modülün komutlarının .text içindeki byte ofsetleri, komut sırasıyla.
+        Relocation.offset komut sırasıdır ve komutlar farklı boyutta olabilir;
+        pass2'nin yazdığı satır tablosunda her komut için bir .text kaydı vardır.
+        """
+        base = BASE_ADDRS[".text"]
+        end = base + m.section_size(".text")
+        return [a - base for a in m.lines.addrs if base <= a < end]
 
-        # önce tüm export’ları topluyoruz
-        for m in self.modules:
-            for sym, addr in m["exports"].items():
-                if addr is None:
-                    raise Exception(f"Undefined exported symbol {sym}")
-                if sym in self.global_exports:
-                    raise Exception(f"Duplicate export {sym}")
-                # global_exports’de tutulacak adresi modülün kendi .text + base’e göre hesaplayacağız
-                self.global_exports[sym] = (m, addr)
-
-    def _parse_obj(self, path):
-        section = None
-        data = []
-        text = []
-        exports = {}
-        relocs = []
-        with open(path) as f:
-            for ln in f:
-                ln = ln.strip()
-                if ln == "SECTION .text":
-                    section = "text"; continue
-                if ln == "SECTION .data":
-                    section = "data"; continue
-                if ln == "EXPORTS":
-                    section = "exports"; continue
-                if ln == "RELOCATIONS":
-                    section = "relocs"; continue
-                if ln == "EOF":
+    def _text_refs(self, profile=None):
+        """
+        Modüller arası .text -> .text referansları: [(i, byte ofseti, j, hedef ofseti, ağırlık)].
+        Ağırlık 1; profile verilirse referansın bulunduğu satırın çalışma sayısı eklenir.
+        """
+        index = {id(m): i for i, m in enumerate(self.modules)}
+        refs = []
+        for i, m in enumerate(self.modules):
+            offsets = None
+            for r in m.relocations:
+                target = self.global_exports.get(r.symbol)
+                if r.section != ".text" or target is None:
+                    continue
+                mod, sym = target
+                j = index[id(mod)]
+                if j == i or sym.section != ".text" or sym.address is None:
+                    continue
+                if offsets is None:
+                    offsets = self._inst_offsets(m)
+                # satır tablosu eksikse (eski obj) her komut bir word sayılır
+                off = offsets[r.offset] if r.offset < len(offsets) else 2 * r.offset
+                w = 1
+                if profile:
+                    src = m.lines.lookup(BASE_ADDRS[".text"] + off)
+                    if src is not None:
+                        w += profile.get(f"{src[0]}:{src[1]}", 0)
+                refs.append((i, off, j, sym.address - BASE_ADDRS[".text"], w))
+        return refs
+
+    def _long_refs(self, refs, order):
+        # order sırasıyla .text'ler arka arkaya dizilince jump erişimini aşan referanslar
+        start, cursor = {}, 0
+        for i in order:
+            start[i] = cursor
+            cursor += self.modules[i].section_size(".text")
+        return sum(1 for i, off, j, tgt, _ in refs
+                   if abs(start[j] + tgt - start[i] - off) > JUMP_REACH)
+
+    def order_by_call_graph(self, profile=None):
+        """
+        Modül .text'lerini çağrı grafiğine göre sıralar (Pettis-Hansen): en ağır
+        kenardan başlayarak modül zincirleri birleştirilir, birleşmede kenarın iki
+        ucunu en yakın getiren yön seçilir. Giriş modülü ('start'ı export eden,
+        yoksa ilk modül) başta kalır, bağlantısız zincirler eski sıralarını korur.
+        Yeni sıra uzun referans sayısını azaltmıyorsa sıra değiştirilmez.
+        layout()/link() öncesi çağrılır.
+        """
+        refs = self._text_refs(profile)
+        n = len(self.modules)
+        if n < 2:
+            return {"edges": 0, "long_before": 0, "long_after": 0, "avoided": 0,
+                    "order": [m.name for m in self.modules]}
+        sizes = [m.section_size(".text") for m in self.modules]
+        entry = 0
+        if "start" in self.global_exports:
+            entry = self.modules.index(self.global_exports["start"][0])
+        edges = {}
+        for i, _, j, _, w in refs:
+            key = (i, j) if i < j else (j, i)
+            edges[key] = edges.get(key, 0) + w
+
+        def distance(chain, a, b):
+            # zincirde a ve b modüllerinin ortaları arasındaki byte
+            pos, mid = 0, {}
+            for k in chain:
+                mid[k] = pos + sizes[k] // 2
+                pos += sizes[k]
+            return abs(mid[a] - mid[b])
+
+        chains = {i: [i] for i in range(n)}
+        chain_of = list(range(n))
+        for (a, b), _ in sorted(edges.items(), key=lambda kv: (-kv[1], kv[0])):
+            ca, cb = chain_of[a], chain_of[b]
+            if ca == cb:
+                continue
+            x, y = chains[ca], chains[cb]
+            best = None
+            for cand in (x + y, x + y[::-1], x[::-1] + y, x[::-1] + y[::-1],
+                         y + x, y + x[::-1], y[::-1] + x, y[::-1] + x[::-1]):
+                if entry in cand and cand[0] != entry:
+                    continue
+                d = distance(cand, a, b)
+                if best is None or d < best[0]:
+                    best = (d, cand)
+            keep = min(ca, cb)
+            chains[keep] = best[1]
+            del chains[max(ca, cb)]
+            for k in best[1]:
+                chain_of[k] = keep
+
+        order = [k for c in sorted(chains.values(), key=lambda c: (c[0] != entry, min(c))) for k in c]
+        before = self._long_refs(refs, range(n))
+        after = self._long_refs(refs, order)
+        if after >= before:
+            order, after = list(range(n)), before
+        rank = {id(self.modules[k]): r for r, k in enumerate(order)}
+        self.sort_modules(lambda m: rank[id(m)])
+        return {"edges": len(edges), "long_before": before, "long_after": after,
+                "avoided": before - after, "order": [m.name for m in self.modules]}
+
+    def resolve_archives(self):
+        # çözülemeyen extern'ler için sadece gereken arşiv üyelerini çek
+        pending = list(self.unresolved)
+        while pending:
+            sym = pending.pop()
+            if sym in self.global_exports:
+                continue
+            for lib in self.archives:
+                idx = lib.lookup(sym)
+                if idx is not None and idx not in lib.loaded:
+                    lib.loaded.add(idx)
+                    name, text = lib.read_member(idx)
+                    m = read_object(text.splitlines(), f"{os.path.basename(lib.path)}({name})")
+                    self.add_module(m)
+                    pending.extend(r.symbol for r in m.relocations if not r.local)
                     break
 
-                if section == "text":
-                    val = int(ln, 16)
-                    text.append(format(val, '016b'))
-                elif section == "data":
-                    data.append(ln)
-                elif section == "exports":
-                    # “sym addr”
-                    parts=ln.split()
-                    exports[parts[0]] = int(parts[1],16)
-                elif section == "relocs":
-                    # “sym .text 0x0010”
-                    sym, sec, off = ln.split()
-                    relocs.append((sym, sec, int(off,16)))
-        return {"text":text, "data":data, "exports":exports, "relocs":relocs}
+    def _add_exports(self, m):
+        for sym in m.exports.values():
+            if sym.address is None:
+                raise Exception(f"Undefined exported symbol {sym.name}")
+            if sym.name in self.global_exports:
+                raise Exception(f"Duplicate export {sym.name}")
+            # global_exports’de tutulacak adresi modülün kendi .text + base’e göre hesaplayacağız
+            self.global_exports[sym.name] = (m, sym)
+
+    def layout(self):
+        """
+        Her modülün section'larını bellek haritasındaki bölgelere sırayla
+        yerleştirir. Bölge taşmaları ve çakışmalar IntervalIndex ile yakalanır.
+        """
+        regions = IntervalIndex()
+        for r in self.memory_map:
+            regions.add(r.origin, r.end, r.name)
+
+        for m in self.modules:
+            m.placement = {}
+        self.placements = IntervalIndex()
+        self.region_origins = {}
+        self.region_usage = {}
+        self.pooled = []
+        self.pool_saved = 0
+        self.data_maps = {}
+        seen = {}                # blok özeti -> (adres, modül indeksi, blok)
+        for r in self.memory_map:
+            cursor = r.origin
+            for sec in r.sections:
+                self.region_origins[sec] = r.origin
+                for i, m in enumerate(self.modules):
+                    size = m.section_size(sec)
+                    start = (cursor + 1) & ~1   # word hizalama
+                    m.placement[sec] = start
+                    if not size:
+                        continue
+                    if sec == ".data" and self.pool_data:
+                        cursor = self._place_pooled(i, m, cursor, r, seen)
+                        continue
+                    end = start + size
+                    if end > r.end:
+                        raise Exception(f"Region {r.name} overflow: modül {i} {sec} "
+                                        f"0x{end - r.end:04X} byte taşıyor")
+                    self.placements.add(start, end, (i, sec))
+                    cursor = end
+            self.region_usage[r.name] = cursor - r.origin
+
+        for i, m in enumerate(self.modules):
+            for sec in BASE_ADDRS:
+                if sec not in m.placement:
+                    if m.section_size(sec):
+                        raise Exception(f"Bellek haritasında {sec} için bölge yok (modül {i})")
+                    m.placement[sec] = self.region_origins.get(sec, 0)
+
+    def _data_blocks(self, m):
+        """
+        Modülün .data'sını label'lı bloklara böler: [(başlangıç, bitiş)] ofsetleri.
+        Sınırlar .data export'ları, (varsa) label'lar ve kodun yerel .data
+        relocation'larının gösterdiği adreslerdir; kod .data'ya sadece bu
+        adreslerden eriştiği için her blok ayrı yerleştirilebilir.
+        """
+        base, size = BASE_ADDRS[".data"], m.section_size(".data")
+        cuts = {0, size}
+        cuts.update(s.address - base for s in chain(m.exports.values(), m.labels.values())
+                    if s.section == ".data" and s.address is not None)
+        offsets = None
+        for r in m.relocations:
+            if r.symbol == ".data":
+                if offsets is None:
+                    offsets = self._inst_offsets(m)
+                cuts.add(m.text[self._reloc_index(r, offsets)] - base)
+        cuts = sorted(c for c in cuts if 0 <= c <= size)
+        return list(zip(cuts, cuts[1:]))
+
+    def _place_pooled(self, i, m, cursor, region, seen):
+        """
+        .data'yı bloklar halinde cursor'dan itibaren yerleştirir, yeni cursor'ı döner.
+        Daha önce yazılmış bir blokla aynı olan blok yazılmaz (özet eşleşmesi byte
+        byte doğrulanır); yazılan bloklar modüldeki tek/çift hizasını korur.
+        """
+        raw = bytes(m.data)
+        blocks = []
+        for start, end in self._data_blocks(m):
+            chunk = raw[start:end]
+            key = hashlib.blake2b(chunk, digest_size=16).digest()
+            first = seen.get(key)
+            if first is not None and first[2] == chunk:
+                blocks.append((start, end, first[0], False))
+                self.pooled.append((i, start, end - start, first[0], first[1]))
+                self.pool_saved += end - start
+                continue
+            addr = cursor + ((start - cursor) & 1)
+            if addr + len(chunk) > region.end:
+                raise Exception(f"Region {region.name} overflow: modül {i} .data "
+                                f"0x{addr + len(chunk) - region.end:04X} byte taşıyor")
+            self.placements.add(addr, addr + len(chunk), (i, ".data"))
+            seen.setdefault(key, (addr, i, chunk))
+            blocks.append((start, end, addr, True))
+            cursor = addr + len(chunk)
+        m.placement[".data"] = blocks[0][2]
+        self.data_maps[id(m)] = ([b[0] for b in blocks], blocks)
+        return cursor
+
+    def _data_block(self, m, off):
+        # ofseti içeren blok (section sonu son bloğa düşer)
+        starts, blocks = self.data_maps[id(m)]
+        return blocks[max(bisect_right(starts, off) - 1, 0)]
+
+    def _rebase(self, m, sec, addr):
+        if sec == ".data" and id(m) in self.data_maps:
+            start, _, base, _ = self._data_block(m, addr - BASE_ADDRS[sec])
+            return base + addr - BASE_ADDRS[sec] - start
+        return m.placement[sec] + addr - BASE_ADDRS[sec]
+
+    def _rebase_line(self, m, addr):
+        # modülün section'ı dışına düşen satırlar (kod üretmeyenler) ve
+        # havuzlanıp yazılmayan .data blokları tabloya girmez
+        sec = _section_of(addr)
+        off = addr - BASE_ADDRS[sec]
+        if off >= m.section_size(sec):
+            return None
+        if sec == ".data" and id(m) in self.data_maps and not self._data_block(m, off)[3]:
+            return None
+        return self._rebase(m, sec, addr)
+
+    @staticmethod
+    def _reloc_index(r, offsets):
+        """Relocation'ın yamalanacağı word'ün modülün .text'i içindeki sırası."""
+        # komut sırası -> komutun byte ofseti (satır tablosu eksikse her komut bir word)
+        off = offsets[r.offset] if r.offset < len(offsets) else 2 * r.offset
+        return off // 2 + r.word
 
     def link(self):
-        # her modülde text segmente bir base adres ata
-        txt_base_idx = 0
-        dat_base_idx = 0
-        layout = []
+        with memory_phase("link"):
+            self._link()
+
+    def _link(self):
+        # aynı linker tekrar link edilebilir (ör. sıralama değişince), çıktılar baştan kurulur
+        self.global_text = array('H')
+        self.global_data = SegmentBuffer()
+        self.global_bss = []
+        self.global_lines = LineTable()
+        self.symbols = {}
+        self.layout()
+        text_origin = self.region_origins.get(".text", 0)
+
+        # global text/data birleştir, modüller arasındaki hizalama boşluklarını doldur
         for m in self.modules:
-            m["txt_base_idx"] = txt_base_idx
-            m["dat_base_idx"] = dat_base_idx
-            txt_base_idx += len(m["text"])
-            dat_base_idx += len(m["data"])
-            layout.append(m)
+            gap = (m.placement[".text"] - text_origin) // 2 - len(self.global_text)
+            self.global_text.extend(repeat(0, gap))
+            self.global_text.extend(m.text)
+        self._merge_data()
+        for m in self.modules:
+            self.global_lines.extend_rebased(m.lines, lambda a, m=m: self._rebase_line(m, a))
+        self.global_lines.sort()
 
-        # global text/data birleştir
-        for m in layout:
-            self.global_text.extend(m["text"])
-            self.global_data.extend(m["data"])
+        # export'ları modülün yerleşimine göre gerçek adreslere taşı
+        for name, (mod, sym) in self.global_exports.items():
+            self.symbols[name] = self._rebase(mod, sym.section, sym.address)
 
         # relocation: her modülde kendi base’e göre patch et
-        for m in layout:
-            for sym, sec, inst_idx in m["relocs"]:
-                if sym not in self.global_exports:
-                    raise Exception(f"Unresolved extern: {sym}")
-                mod, sym_addr = self.global_exports[sym]
-                # global_text’e gömülecek index:
-                base_idx = m["txt_base_idx"]   # aşağıda def edeceğiz
-                idx      = base_idx + inst_idx
-
-                old_bin = self.global_text[idx]       # örn. "0001001011000000" == 0x12C0
-                # high bits (üst 8 bit) koru:
-                high = old_bin[:8]                    # "00010010" == 0x12
-                # düşük baytı yeni adresin alt byte’ı ile değiştir
-                low  = format(sym_addr & 0xFF, '08b') # eğer sym_addr=0x000A -> "00001010"
-                self.global_text[idx] = high + low    # "00010010"+"00001010" == "0001001000001010" == 0x120A
-
-
-    def write(self, path):
-        with open(path, "w") as f:
-            f.write("COFF_LINKED EXECUTABLE FILE\n")
-            f.write("SECTION .text\n")
-            for b in self.global_text:
-                h = hex(int(b,2))[2:].upper().zfill(len(b)//4)
-                f.write(f"0x{h}\n")
-            f.write("SECTION .data\n")
-            for d in self.global_data:
-                # eğer data’yı binary olarak parse etmediyseniz, d zaten "0x12A4" formundaysa doğrudan:
-                if re.match(r'^[01]{8,16}$', d):
-                    h = hex(int(d,2))[2:].upper().zfill(len(d)//4)
-                    f.write(f"0x{h}\n")
-                else:
-                    f.write(f"{d}\n")
-            f.write("EOF\n")
+        for m in self.modules:
+            self._patch(m, text_origin)
 
+    def _merge_data(self):
+        """global_data ve global_bss'i modüllerin yerleşiminden kurar."""
+        data_origin = self.region_origins.get(".data", 0)
+        self.global_data = SegmentBuffer()
+        self.global_bss = []
+        for m in self.modules:
+            blocks = self.data_maps.get(id(m))
+            if blocks is None:
+                self.global_data.append_zeros(m.placement[".data"] - data_origin - len(self.global_data))
+                self.global_data.extend(m.data)
+            else:
+                raw = bytes(m.data)
+                for start, end, addr, kept in blocks[1]:
+                    if kept:
+                        self.global_data.append_zeros(addr - data_origin - len(self.global_data))
+                        self.global_data.append(raw[start:end])
+            for z in m.bss:
+                start = m.placement[".bss"] + z.start
+                last = self.global_bss[-1] if self.global_bss else None
+                if last is not None and last.end == start:
+                    last.length += z.length
+                else:
+                    self.global_bss.append(ZeroFill(start, z.length))
 
+    def _patch(self, m, text_origin, extern_only=False):
+        """Modülün relocation'larını global_text'e uygular."""
+        offsets = None
+        for r in m.relocations:
+            if extern_only and r.local:
+                continue
+            if offsets is None:
+                offsets = self._inst_offsets(m)
+            idx = (m.placement[r.section] - text_origin) // 2 + self._reloc_index(r, offsets)
+            if r.local:
+                # yerel label: word'deki modül içi adres section'ın gerçek yerine taşınır
+                self.global_text[idx] = self._rebase(m, r.symbol, self.global_text[idx]) & 0xFFFF
+                continue
+            if r.symbol not in self.symbols:
+                raise Exception(f"Unresolved extern: {r.symbol}")
+            # ek word'ün tamamı sembolün 16 bit adresi olur
+            self.global_text[idx] = self.symbols[r.symbol] & 0xFFFF
 
-class MSP430AssemblerUI:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("MSP430 Assembler")
-        self.root.geometry("1600x800")
-        
-        self.main_frame = tk.Frame(root)
-        self.main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        self.title_label = tk.Label(self.main_frame, text="MSP430 Assembler", font=("Arial",16,"bold"))
-        self.title_label.pack(pady=5)
-        
-        self.split_frame = tk.PanedWindow(self.main_frame, orient=tk.HORIZONTAL, sashrelief=tk.RAISED, sashwidth=4, height=300)
-        self.split_frame.pack(fill=tk.BOTH, expand=True, pady=2)
-        
-        self.left_frame = tk.LabelFrame(self.split_frame, text="Assembler Kodu", font=("Arial",10,"bold"), height=300)
-        self.right_frame= tk.LabelFrame(self.split_frame, text="Dönüştürülmüş Kod", font=("Arial",10,"bold"), height=300)
-        self.split_frame.add(self.left_frame); self.split_frame.add(self.right_frame)
-        
-        self.code_text   = LineNumberedText(self.left_frame, wrap=tk.WORD, font=("Courier New",12))
-        self.code_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
-        self.result_text = scrolledtext.ScrolledText(self.right_frame, wrap=tk.WORD, font=("Courier New",12))
-        self.result_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
-        
-        self.bottom_frame = tk.Frame(self.main_frame)
-        self.bottom_frame.pack(fill=tk.BOTH, expand=True, pady=2)
-
-        self.add_example_code()
-
-        # Semboller Tablosu
-        self.symbols_frame = tk.LabelFrame(self.bottom_frame, text="Semboller", font=("Arial",10,"bold"))
-        self.symbols_frame.pack(fill=tk.BOTH, expand=True, side=tk.LEFT, padx=1, pady=1)
-        self.symbols_table = ttk.Treeview(self.symbols_frame, columns=("label","section","address"), show="headings")
-        self.symbols_table.heading("label", text="Sembol")
-        self.symbols_table.heading("section", text="Section")
-        self.symbols_table.heading("address",text="Adres")
-        self.symbols_table.pack(fill=tk.BOTH, expand=True)
-
-        # Exports (.def) Tablosu
-        self.exports_table = ttk.Treeview(self.symbols_frame, columns=("symbol","address"), show="headings", height=4)
-        self.exports_table.heading("symbol", text="Export Symbol (def)")
-        self.exports_table.heading("address", text="Address")
-        self.exports_table.pack(fill=tk.BOTH, expand=True, pady=(5,0))
-
-        # import (.ref) Tablosu
-        self.import_table = ttk.Treeview(self.symbols_frame, columns=("symbol","address"), show="headings", height=4)
-        self.import_table.heading("symbol", text="Import Symbol (ref)")
-        self.import_table.heading("address", text="Address")
-        self.import_table.pack(fill=tk.BOTH, expand=True, pady=(5,0))
-
-
-        # Section Tablosu
-        self.sections_frame = tk.LabelFrame(self.bottom_frame, text="Section Bilgileri", font=("Arial",10,"bold"))
-        self.sections_frame.pack(fill=tk.BOTH, expand=True, side=tk.RIGHT, padx=1, pady=1)
-        self.sections_table = ttk.Treeview(self.sections_frame, columns=("section","start","size"), show="headings")
-        self.sections_table.heading("section", text="Section")
-        self.sections_table.heading("start",   text="Başlangıç Adresi")
-        self.sections_table.heading("size",    text="Boyut")
-        self.sections_table.pack(fill=tk.BOTH, expand=True)
-
-        # ───── Detay Görünümü ─────
-        self.details_frame = tk.LabelFrame(self.bottom_frame, text="Section Details", font=("Arial",10,"bold"))
-        self.details_frame.pack(fill=tk.BOTH, expand=True, side=tk.BOTTOM, padx=1, pady=1)
-
-        cols_syms = ("symbol","address")
-        self.syms_detail = ttk.Treeview(self.details_frame, columns=cols_syms, show="headings", height=5)
-        self.syms_detail.heading("symbol", text="Symbol")
-        self.syms_detail.heading("address", text="Address")
-        self.syms_detail.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
-
-        cols_refs = ("symbol","line")
-        self.refs_detail = ttk.Treeview(self.details_frame, columns=cols_refs, show="headings", height=5)
-        self.refs_detail.heading("symbol", text="Referenced Symbol")
-        self.refs_detail.heading("line",   text="Line No")
-        self.refs_detail.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
-        # ────────────────
-
-        # Buton Çerçevesi
-        self.button_frame = tk.Frame(self.main_frame)
-        self.button_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=1)
-
-        self.load_button   = tk.Button(self.button_frame, text="Dosya Aç", command=self.load_file, bg="#007bff", fg="white")
-        self.load_button.pack(side=tk.LEFT, padx=5)
-        self.save_button   = tk.Button(self.button_frame, text="Kaydet", command=self.save_file, bg="#ffc107", fg="black")
-        self.save_button.pack(side=tk.LEFT, padx=5)
-        self.clear_button  = tk.Button(self.button_frame, text="Temizle",command=self.clear_all, bg="#dc3545", fg="white")
-        self.clear_button.pack(side=tk.RIGHT, padx=5)
-        self.convert_button= tk.Button(self.button_frame, text="Kodu Çevir",command=self.convert_code,bg="#28a745",fg="white")
-        self.convert_button.pack(side=tk.RIGHT, padx=5)
-        self.link_button= tk.Button(self.button_frame, text="Modülleri Link Et", command=self.link_modules, bg="#17a2b8",fg="white")
-        self.link_button.pack(side=tk.RIGHT, padx=5)
-
-        # Durum Çubuğu
-        self.status_bar = tk.Label(root, text="Hazır", bd=1, relief=tk.SUNKEN, anchor=tk.W)
-        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
-
-        # Bölüm seçimi için event
-        self.sections_table.bind("<<TreeviewSelect>>", self.on_section_select)
-
-    def add_example_code(self):
-        example_code = """;MSP430 Assembly Example Code
-; --- Tanımlar ---
-.def  start, equal_label, end
-.ref  external_func, extern_var
-
-; --- .data bölümünde veri ---
-.data
-val1:   .word 0x1234
-val2:   .byte 0xA
-
-; --- .bss bölümünde sıfırdan başlatılmış alan ---
-.bss
-temp:   .space 2
-
-; --- .text bölümünde kod ---
-.text
-start:  MOV.W #0x1234, R4      ; R4 = 0x1234
-        MOV.W #0x4567, R5         ; R5 = 0x4567
-        MOV.W #0x89AB, R6         ; R6 = 0x89AB
-        CALL external_func    ; dışarıdan gelen fonksiyonu çağır
-        ADD R5, R4           ; R4 = R4 + R5
-        MOV     extern_var, R5      ; extern_var değişkenine R5'i ata
-        SUB R6, R4           ; R4 = R4 - R6
-        CMP R4, R5             ; R4 ve R5'i karşılaştır
-        JEQ equal_label        ; Eğer eşitse 'equal_label'e atla
-        JMP not_equal_label    ; Değilse 'not_equal_label'e atla
-equal_label:
-        MOV R4, R7             ; R7 = R4
-        JMP end
-not_equal_label:
-        MOV R5, R7             ; R7 = R5
-end:    NOP
-"""
-        self.code_text.text.insert(tk.END, example_code)
-
-    def load_file(self):
-        path = filedialog.askopenfilename(filetypes=[("Assembly Dosyaları","*.asm")])
-        if path:
-            with open(path,'r') as f:
-                self.code_text.text.delete("1.0",tk.END)
-                self.code_text.text.insert(tk.END,f.read())
-
-    def save_file(self):
-        try:
-            path = filedialog.asksaveasfilename(defaultextension=".asm",
-                                                filetypes=[("Assembly Dosyaları","*.asm"),("Tüm Dosyalar","*.*")])
-            if path:
-                asm_code = self.code_text.text.get("1.0",tk.END)
-                mc_code  = self.result_text.get("1.0",tk.END)
-                with open(path,'w') as f:
-                    f.write("; Assembly Code\n"+asm_code+"\n; Machine Code\n"+mc_code)
-                self.status_bar.config(text=f"Dosya kaydedildi: {path}")
-                messagebox.showinfo("Başarılı","Dosya kaydedildi!")
-        except Exception as e:
-            messagebox.showerror("Hata",str(e))
-    
-    def link_modules(self):
-        try:
-            linker = LinkEditor("temp")
-            linker.link()
-            out = "temp/final.obj"
-            linker.write(out)
-            messagebox.showinfo("Link Başarılı", f"Final obj oluşturuldu:\n{out}")
-        except Exception as e:
-            messagebox.showerror("Link Hatası", str(e))
-
-
-    def clear_all(self):
-        if messagebox.askyesno("Onay","Tüm alanları temizlemek istediğinize emin misiniz?"):
-            self.code_text.text.delete("1.0",tk.END)
-            self.result_text.delete("1.0",tk.END)
-            for i in self.symbols_table.get_children(): self.symbols_table.delete(i)
-            for i in self.sections_table.get_children(): self.sections_table.delete(i)
-            self.status_bar.config(text="Temizlendi")
-
-    def write_cof_object(self, path, asm, data_codes, text_codes):
+    def relink(self):
         """
-        Common Object File Format (COFF) dosyası:
-        - Bölümler (text/data) ikili verileri (hex)
-        - EXPORTS: .def ile tanımlanan semboller ve adresleri
-        - RELOCATIONS: .ref ile toplanmış relocation girdileri
-        - EOF
+        obj_dir'i yeniden okur ve önceki link'in yerleşimini koruyarak sadece
+        değişen modülleri yazar (izleme modu). .text dizisi öncekiyle aynı
+        nesne olan modül değişmemiş sayılır (daemon'un önbellekli okuyucusu
+        içeriği paylaşan kopyalar verir). Değişen modüllerin word'leri ve
+        satırları kendi yerlerine yazılıp bütün relocation'ları uygulanır;
+        diğer modüllerde sadece extern'ler yeniden yamanır (yerel relocation'lar
+        zaten taşınmış). Modül listesi ya da değişen bir modülün section
+        boyutları farklıysa, arşivden üye çekilmişse, .data havuzlanıyorsa ya da
+        yeni bir extern çözülemiyorsa yerleşim geçersizdir: None döner, çağıran
+        baştan link eder. Aksi halde değişen modüllerin isimleri döner.
         """
+        if self.obj_dir is None or not self.region_origins or self.pool_data \
+                or any(lib.loaded for lib in self.archives):
+            return None
+        _, modules = self._scan_dir()
+        if [m.name for m in modules] != [m.name for m in self.modules]:
+            return None
+        changed = [i for i, (old, new) in enumerate(zip(self.modules, modules))
+                   if new.text is not old.text]
+        for i in changed:
+            if any(modules[i].section_size(s) != self.modules[i].section_size(s) for s in BASE_ADDRS):
+                return None
+        exports = {}
+        for i, m in enumerate(self.modules):
+            m = modules[i] if i in changed else m
+            for sym in m.exports.values():
+                if sym.address is None or sym.name in exports:
+                    return None     # hatayı baştan link raporlasın
+                exports[sym.name] = (m, sym)
+        if any(not r.local and r.symbol not in exports
+               for i in changed for r in modules[i].relocations):
+            return None
+        if not changed:
+            return []
+
+        text_origin = self.region_origins.get(".text", 0)
+        for i in changed:
+            old, new = self.modules[i], modules[i]
+            new.placement = old.placement
+            self.modules[i] = new
+            start = (new.placement[".text"] - text_origin) // 2
+            self.global_text[start:start + len(new.text)] = new.text
+            for sec in (".text", ".data"):
+                base = new.placement[sec]
+                self.global_lines.replace_range(base, base + new.section_size(sec), new.lines,
+                                                lambda a, m=new: self._rebase_line(m, a))
+        self._merge_data()
+        self.global_exports = exports
+        self.symbols = {name: self._rebase(mod, sym.section, sym.address)
+                        for name, (mod, sym) in exports.items()}
+        for i, m in enumerate(self.modules):
+            self._patch(m, text_origin, extern_only=i not in changed)
+        return [self.modules[i].name for i in changed]
+
+    def write(self, path, map_path=None):
+        with memory_phase("write"):
+            self._write(path, map_path)
+
+    def _write(self, path, map_path):
+        if map_path:
+            self.write_map(map_path, path)
         with open(path, "w") as f:
-            f.write("COFF\n")
-            # önce text
-            f.write("SECTION .text\n")
-            for binstr in text_codes:
-                h = hex(int(binstr,2))[2:].upper().zfill(len(binstr)//4)
-                f.write(f"0x{h}\n")
-            # sonra data
-            f.write("SECTION .data\n")
-            for binstr in data_codes:
-                h = hex(int(binstr,2))[2:].upper().zfill(len(binstr)//4)
-                f.write(f"0x{h}\n")
-            # exports
-            f.write("EXPORTS\n")
-            for sym, addr in asm.exports.items():
-                f.write(f"{sym} 0x{addr or '????'}\n")
-            # relocations
-            f.write("RELOCATIONS\n")
-            for sym, sec, off in asm.relocations:
-                f.write(f"{sym} {sec} 0x{off:04X}\n")
+            f.write("COFF_LINKED EXECUTABLE FILE\n")
+            f.write(f"SECTION .text 0x{self.region_origins.get('.text', 0):04X}\n")
+            f.writelines(iter_word_lines(self.global_text))
+            f.write(f"SECTION .data 0x{self.region_origins.get('.data', 0):04X}\n")
+            f.writelines(iter_data_word_lines(self.global_data))
+            f.write(f"SECTION .bss 0x{self.region_origins.get('.bss', 0):04X}\n")
+            for z in self.global_bss:
+                f.write(f"ZERO 0x{z.start:04X} 0x{z.length:04X}\n")
+            f.write("SYMBOLS\n")
+            for sym, addr in self.symbols.items():
+                f.write(f"{sym} 0x{addr:04X}\n")
+            f.write("LINES\n")
+            f.writelines(self.global_lines.iter_rows())
             f.write("EOF\n")
 
+    def write_map(self, path, output=""):
+        """
+        Link map dosyası: bölge kullanımı, modül başına section yerleşimi ve
+        boyutları, relocation sayıları ve tüm global semboller. Link sırasında
+        oluşturulan indekslerden (placements, symbols) tek geçişte üretilir.
+        """
+        out = ["MSP430 LINK MAP", f"Output: {output}", ""]
+
+        out.append("MEMORY REGIONS")
+        out.append(f"  {'Name':<10} {'Origin':<8} {'Length':<8} {'Used':<8} {'Free':<8}")
+        for r in self.memory_map:
+            used = self.region_usage.get(r.name, 0)
+            out.append(f"  {r.name:<10} 0x{r.origin:04X}   0x{r.length:04X}   "
+                       f"0x{used:04X}   0x{r.length - used:04X}")
+        out.append("")
+
+        out.append("SECTION PLACEMENT")
+        out.append(f"  {'Address':<8} {'Size':<8} {'Section':<9} Module")
+        for start, end, (i, sec) in self.placements:
+            out.append(f"  0x{start:04X}   0x{end - start:04X}   {sec:<9} {self.modules[i].name}")
+        out.append("")
+
+        if self.pooled:
+            out.append("POOLED DATA")
+            out.append(f"  {'Address':<8} {'Size':<8} Module -> Shared with")
+            for i, off, size, addr, first in self.pooled:
+                out.append(f"  0x{addr:04X}   0x{size:04X}   "
+                           f"{self.modules[i].name}+0x{off:04X} -> {self.modules[first].name}")
+            out.append(f"  Saved: {self.pool_saved} bytes")
+            out.append("")
+
+        out.append("MODULES")
+        out.append(f"  {'.text':>7} {'.data':>7} {'.bss':>7} {'Relocs':>7}  Module")
+        for m in self.modules:
+            out.append(f"  {m.section_size('.text'):>7} {m.section_size('.data'):>7} "
+                       f"{m.section_size('.bss'):>7} {len(m.relocations):>7}  {m.name}")
+        out.append("")
 
-    def convert_code(self):
-        raw_lines = self.code_text.text.get("1.0", tk.END).splitlines()
-        if not raw_lines:
-            messagebox.showwarning("Uyarı","Assembler kodu girin")
-            return
-
-        cleaned = []  # yorumlar temizlenmiş satırlar
-        mapping = []
-
-        for lineno, line in enumerate(raw_lines, start=1):
-            # yorumdan öncesini al, baş-son boşluğu sil
-            clean = line.split(";")[0].strip()
-            cleaned.append(clean)
-            mapping.append(lineno)
-            
-        asm=MSP430Assembler()
-        try:
-            labels, sections = asm.pass1(cleaned, mapping)
-            # detayları sakla
-            self.last_sections = sections
-            # sembol tablosu
-            for i in self.symbols_table.get_children(): self.symbols_table.delete(i)
-            for lbl,(sec,addr) in labels.items():
-                self.symbols_table.insert("","end",values=(lbl,sec,addr))
-            # exports (.def)
-            for iid in self.exports_table.get_children():
-                self.exports_table.delete(iid)
-            for sym, addr in asm.exports.items():
-                self.exports_table.insert("", "end", values=(sym, addr))
-
-            # imports (.ref)
-            for iid in self.import_table.get_children():
-                self.import_table.delete(iid)
-            for sym, addr in asm.imports.items():
-                self.import_table.insert("", "end", values=(sym, addr or "-"))
-            
-            # section tablosu
-            for i in self.sections_table.get_children(): self.sections_table.delete(i)
-            for sec,info in sections.items():
-                self.sections_table.insert("","end",values=(sec,info["start"],f"{info['size']} byte"))
-            self.status_bar.config(text=f"PASS1: {len(labels)} sembol, {len(sections)} section")
-        except Exception as e:
-            messagebox.showerror("Hata",f"PASS1: {e}")
-            return
-
-        try:
-            data_codes, text_codes, machine_codes = asm.pass2(cleaned)
-        except Exception as e:
-            messagebox.showerror("Hata",f"PASS2: {e}")
-            return
+        out.append("SYMBOLS")
+        out.append(f"  {'Address':<8} {'Symbol':<24} Module")
+        owners = {name: mod.name for name, (mod, _) in self.global_exports.items()}
+        for sym, addr in sorted(self.symbols.items(), key=lambda kv: kv[1]):
+            out.append(f"  0x{addr:04X}   {sym:<24} {owners[sym]}")
+        out.append("EOF")
 
-        def is_code_line(line):
-            r=line.strip()
-            if not r: return False
-            if r.startswith('.') and not r.startswith(('.word','.byte')): return False
-            if r.upper().startswith('ORG'): return False
-            if r.startswith(';'): return False
-            if ':' in r:
-                _,rest=r.split(':',1); r=rest.strip()
-                if not r: return False
-            tok=r.split()[0].upper()
-            return tok in asm.instructions or tok in ['.WORD','.BYTE']
-
-        self.result_text.delete("1.0",tk.END)
-        idx=0
-        for i,orig in enumerate(cleaned, start=1):
-            entry=''
-            if is_code_line(cleaned[i-1]) and idx<len(machine_codes):
-                b=machine_codes[idx]; h=asm.binary_to_hex(b)
-                entry=f"{b} -> 0x{h}"
-                idx+=1
-            self.result_text.insert(tk.END,f"{i}: {entry}\n")
-        self.status_bar.config(text="PASS2 tamamlandı")
-        try:
-            # temp/ klasörünü oluştur
-            os.makedirs("temp", exist_ok=True)
-            # dosya adı olarak timestamp veya sabit bir isim kullanabilirsiniz
-            uniq = int(time.time() * 1000)
-            obj_path = os.path.join("temp", f"module_{uniq}.obj")
-            # write_cof_object(self, path, asm, sections, machine_codes)
-            self.write_cof_object(obj_path, asm, data_codes, text_codes)
-            self.status_bar.config(text=f"PASS2 tamamlandı • Obj yazıldı: {obj_path}")
-        except Exception as e:
-            messagebox.showwarning("Uyarı", f"Obj dosyası yazılamadı: {e}")
-
-    def on_section_select(self, event):
-        sel = self.sections_table.selection()
-        if not sel: return
-        section = self.sections_table.item(sel[0],"values")[0]
-        data = getattr(self, 'last_sections', {}).get(section, {})
-        # symbols
-        for i in self.syms_detail.get_children(): self.syms_detail.delete(i)
-        for sym, addr in data.get("symbols",{}).items():
-            self.syms_detail.insert("","end",values=(sym,addr))
-        # references
-        for i in self.refs_detail.get_children(): self.refs_detail.delete(i)
-        for sym, ln in data.get("references",[]):
-            self.refs_detail.insert("","end",values=(sym,ln))
+        with open(path, "w") as f:
+            f.write("\n".join(l.rstrip() for l in out) + "\n")
 
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = MSP430AssemblerUI(root)
-    root.mainloop()
+    # arayüz ayrı modülde; çekirdeği import etmek tkinter gerektirmez
+    from msp430_ui import main
+    main()
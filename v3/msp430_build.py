@@ -0,0 +1,189 @@
+"""
+Paralel derleme: kaynak klasöründeki bütün modülleri ayrı süreçlerde derler,
+sonra linkler ve .bin üretir.
+
+Her .asm ayrı bir süreçte derlenip obj'si ve xref kaydı yazılır, biten modül
+bir kuyruğa konur. Ana süreç gelen modülün export'larını kaydeder; tanımı
+henüz gelmemiş extern'ler sayılır (hata mesajları ve arşiv çekimi için). Asıl
+link işi (yerleşim, birleştirme, relocation) modül sırası obj adına göre
+kesinleşmesi gerektiğinden son modül geldikten sonra tek seferde yapılır;
+derleme ile üst üste binmez. Toplam süre en yavaş modülün derlenmesi artı
+link/yazma süresine yaklaşır.
+
+    python msp430_build.py src/ [-o temp/] [--bin temp/final.bin] [-j 4]
+    python msp430_cli.py build src/ ...
+"""
+import argparse
+import os
+import queue
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from msp430_assembler import (LinkEditor, SegmentBuffer, XrefIndex, ZeroFill, assemble,
+                              read_profile, write_object)
+from msp430_watch import scan_sources
+from obj_to_bin import convert_to_bin
+
+
+def _portable(m):
+    """
+    Modülü süreçler arası gönderilebilir hale getirir: .incbin'den gelen mmap
+    görünümleri byte'a çevrilir, linker'ın kullanmadığı label tabloları atılır.
+    """
+    data = SegmentBuffer()
+    for c in m.data:
+        if isinstance(c, ZeroFill):
+            data.append_zeros(c.length)
+        else:
+            data.append(bytes(c))
+    m.close()
+    m.data = data
+    m.labels = {}
+    m.sections = {}
+    return m
+
+
+def _build_module(src, obj_path):
+    # işçi süreçte çalışır: derle, obj'yi ve xref kaydını yaz, modülü ve süreyi dön
+    t = time.perf_counter()
+    with open(src, encoding="utf-8") as f:
+        source = f.read()
+    m = assemble(source, os.path.basename(obj_path), os.path.dirname(src), 1, src)
+    write_object(obj_path, m)
+    XrefIndex.update_file(os.path.dirname(obj_path), src, src, m.labels, m.sections)
+    return _portable(m), time.perf_counter() - t
+
+
+class ParallelBuild:
+    def __init__(self, src_dir, obj_dir="temp", bin_path=None, output=None, map_path=None,
+                 libs=(), jobs=None, pool_data=False, order_calls=False, profile=None,
+                 log=print):
+        self.src_dir = os.path.abspath(src_dir)
+        self.obj_dir = os.path.abspath(obj_dir)
+        self.output = os.path.abspath(output or os.path.join(self.obj_dir, "final.obj"))
+        self.bin_path = os.path.abspath(bin_path or os.path.splitext(self.output)[0] + ".bin")
+        self.map_path = map_path
+        self.libs = libs
+        self.jobs = jobs or os.cpu_count() or 1
+        self.pool_data = pool_data
+        self.order_calls = order_calls
+        self.profile = profile
+        self.ordering = None
+        self.log = log
+        self.times = {}          # kaynak -> derleme süresi (işçide ölçülen)
+        self.stages = {}
+        self.pool_saved = 0
+
+    def obj_path(self, src):
+        rel = os.path.splitext(os.path.relpath(src, self.src_dir))[0]
+        return os.path.join(self.obj_dir, rel.replace(os.sep, "__") + ".obj")
+
+    def _executor(self):
+        # tek işte süreç açmanın maliyeti kazançtan büyük
+        if self.jobs == 1:
+            return ThreadPoolExecutor(max_workers=1)
+        return ProcessPoolExecutor(max_workers=self.jobs)
+
+    def run(self):
+        t0 = time.perf_counter()
+        os.makedirs(self.obj_dir, exist_ok=True)
+        sources = sorted(scan_sources(self.src_dir))
+        if not sources:
+            raise Exception(f"Kaynak dosyası yok: {self.src_dir}")
+        # link/watch ile aynı sıra: obj dosya adına göre (LinkEditor._load_modules)
+        order = {n: i for i, n in enumerate(sorted(os.path.basename(self.obj_path(p)) for p in sources))}
+        linker = LinkEditor(None, libs=self.libs, pool_data=self.pool_data)
+        done = queue.Queue()
+        errors = []
+
+        with self._executor() as ex:
+            for src in sources:
+                fut = ex.submit(_build_module, src, self.obj_path(src))
+                fut.src = src
+                fut.add_done_callback(done.put)
+            for _ in sources:
+                fut = done.get()
+                rel = os.path.relpath(fut.src, self.src_dir)
+                try:
+                    m, took = fut.result()
+                except Exception as e:
+                    errors.append(f"{rel}: {e}")
+                    continue
+                self.times[fut.src] = took
+                if errors:
+                    continue        # link yapılmayacak, sadece kalanları bekle
+                try:
+                    linker.add_module(m)
+                except Exception as e:
+                    errors.append(f"{rel}: {e}")
+                    continue
+                self.log(f"  {rel}: {took * 1000:.0f} ms, "
+                         f"{time.perf_counter() - t0:.3f} s'de geldi, bekleyen extern {len(linker.unresolved)}")
+        self.stages["assemble"] = time.perf_counter() - t0
+        if errors:
+            raise Exception("Derleme hataları:\n" + "\n".join(errors))
+
+        # yerleşim obj adı sırasına göre; gelme sırası süreçlere bağlı, imaj her seferinde aynı olmalı
+        t = time.perf_counter()
+        linker.resolve_archives()
+        linker.sort_modules(lambda m: order.get(m.name, len(order)))
+        if self.order_calls:
+            self.ordering = linker.order_by_call_graph(self.profile and read_profile(self.profile))
+        linker.link()
+        self.stages["link"] = time.perf_counter() - t
+        t = time.perf_counter()
+        linker.write(self.output, self.map_path)
+        convert_to_bin(self.output, self.bin_path)
+        self.stages["write"] = time.perf_counter() - t
+        self.stages["total"] = time.perf_counter() - t0
+        self.pool_saved = linker.pool_saved
+        return linker
+
+    def summary(self):
+        serial = sum(self.times.values())
+        slowest = max(self.times.values(), default=0)
+        out = (" ".join(f"{k} {v * 1000:.0f} ms" for k, v in self.stages.items())
+               + f" | {len(self.times)} modül, derleme toplamı {serial * 1000:.0f} ms,"
+                 f" en yavaş modül {slowest * 1000:.0f} ms")
+        if self.pool_data:
+            out += f" | havuzlanan veri {self.pool_saved} byte"
+        if self.ordering:
+            out += (f" | uzun referans {self.ordering['long_before']} -> {self.ordering['long_after']}"
+                    f" ({self.ordering['avoided']} önlendi)")
+        return out
+
+
+def add_arguments(ap):
+    ap.add_argument("src_dir", help="kaynak klasörü")
+    ap.add_argument("-o", "--obj-dir", default="temp", help="obj klasörü")
+    ap.add_argument("--output", help="linklenmiş çıktı (varsayılan OBJ_DIR/final.obj)")
+    ap.add_argument("--bin", help="binary çıktı (varsayılan final.bin)")
+    ap.add_argument("--map", help="link map dosyası")
+    ap.add_argument("--lib", action="append", default=[])
+    ap.add_argument("-j", "--jobs", type=int, help="derleme süreci sayısı (varsayılan CPU sayısı)")
+    ap.add_argument("--pool-data", action="store_true", help="aynı .data içeriğini tek kopyaya indir")
+    ap.add_argument("--order-calls", action="store_true", help="modülleri çağrı grafiğine göre sırala")
+    ap.add_argument("--profile", help="simülatör --profile çıktısı (--order-calls ağırlıkları)")
+
+
+def run_args(args):
+    b = ParallelBuild(args.src_dir, args.obj_dir, args.bin, args.output, args.map,
+                       args.lib, args.jobs, args.pool_data, args.order_calls, args.profile)
+    try:
+        b.run()
+    except Exception as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    print(f"{b.bin_path}: {b.summary()}")
+    return 0
+
+
+def main(argv=None, prog=None):
+    ap = argparse.ArgumentParser(prog=prog, description="MSP430 paralel derleme")
+    add_arguments(ap)
+    return run_args(ap.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+MSP430 assembler komut satırı istemcisi.
+
+Çalışan bir daemon varsa (msp430_daemon.py) isteği ona gönderir; yoksa ya da
+--local verilmişse aynı işi bu süreç içinde yapar.
+
+    python msp430_cli.py assemble main.asm [-o main.obj] [-l main.lst] [-j 4]
+    python msp430_cli.py link temp/ [-o final.obj] [--map final.map] [--lib hal.lib]
+    python msp430_cli.py convert final.obj [-o final.bin]
+    python msp430_cli.py xref SEMBOL [--dir temp/]
+    python msp430_cli.py addr2line final.obj 0x001C 0xC004 ...
+    python msp430_cli.py stats | shutdown
+    python msp430_cli.py watch src/ [-o temp/] [--bin temp/final.bin]
+    python msp430_cli.py build src/ [-o temp/] [--bin temp/final.bin] [-j 4]
+
+--memprofile RAPOR.json işi bu süreçte tracemalloc açıkken yapar; faz başına
+bellek raporu stderr'e yazılır, aynı rapor JSON olarak dosyaya kaydedilir.
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+
+# sadece standart kütüphane; assembler/daemon modülleri yerel çalışırken yüklenir
+from msp430_socket import DEFAULT_SOCKET
+
+
+def send_request(socket_path, req):
+    """İsteği daemon'a gönderir; daemon yoksa None döner."""
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+    with sock, sock.makefile("rwb") as f:
+        f.write(json.dumps(dict(req, id=1)).encode() + b"\n")
+        f.flush()
+        line = f.readline()
+    if not line:
+        raise Exception("Daemon bağlantıyı kapattı")
+    return json.loads(line)
+
+
+def run_local(req, memprofile=None):
+    from msp430_daemon import BuildState, handle_request
+    if memprofile:
+        from msp430_assembler import MemoryProfiler
+        with MemoryProfiler() as prof:
+            resp = run_local(req)
+        print(prof.format_report(), file=sys.stderr)
+        with open(memprofile, "w") as f:
+            json.dump(prof.report(), f, indent=2)
+        return resp
+    try:
+        return {"ok": True, "result": handle_request(BuildState(), req)}
+    except Exception as e:
+        return {"ok": False, "error": str(e)}
+
+
+def build_request(args):
+    # daemon farklı bir dizinde çalışabilir, yollar mutlak gönderilir
+    if args.op == "assemble":
+        src = os.path.abspath(args.source)
+        return {"op": "assemble", "path": src,
+                "output": os.path.abspath(args.output or os.path.splitext(src)[0] + ".obj"),
+                "listing": args.listing and os.path.abspath(args.listing), "workers": args.jobs}
+    if args.op == "link":
+        return {"op": "link", "obj_dir": os.path.abspath(args.obj_dir),
+                "output": args.output and os.path.abspath(args.output),
+                "map": args.map and os.path.abspath(args.map),
+                "libs": [os.path.abspath(p) for p in args.lib], "pool_data": args.pool_data,
+                "order_calls": args.order_calls, "profile": args.profile and os.path.abspath(args.profile)}
+    if args.op == "convert":
+        return {"op": "convert", "obj": os.path.abspath(args.obj),
+                "output": args.output and os.path.abspath(args.output)}
+    if args.op == "addr2line":
+        return {"op": "addr2line", "image": os.path.abspath(args.image), "addresses": args.addresses}
+    if args.op == "xref":
+        return {"op": "xref", "symbol": args.symbol, "obj_dir": os.path.abspath(args.dir)}
+    return {"op": args.op}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="MSP430 assembler istemcisi")
+    ap.add_argument("--socket", default=DEFAULT_SOCKET)
+    ap.add_argument("--local", action="store_true", help="daemon'u kullanma")
+    ap.add_argument("--memprofile", metavar="JSON", help="faz başına bellek profili (yerel çalışır)")
+    sub = ap.add_subparsers(dest="op", required=True)
+    p = sub.add_parser("assemble")
+    p.add_argument("source")
+    p.add_argument("-o", "--output")
+    p.add_argument("-l", "--listing", help="adres/kod/kaynak listing dosyası")
+    p.add_argument("-j", "--jobs", type=int, default=1,
+                   help="pass2 süreç sayısı (büyük dosyalar için, varsayılan 1)")
+    p = sub.add_parser("link")
+    p.add_argument("obj_dir")
+    p.add_argument("-o", "--output")
+    p.add_argument("--map")
+    p.add_argument("--lib", action="append", default=[])
+    p.add_argument("--pool-data", action="store_true", help="aynı .data içeriğini tek kopyaya indir")
+    p.add_argument("--order-calls", action="store_true", help="modülleri çağrı grafiğine göre sırala")
+    p.add_argument("--profile", help="simülatör --profile çıktısı (--order-calls ağırlıkları)")
+    p = sub.add_parser("convert")
+    p.add_argument("obj")
+    p.add_argument("-o", "--output")
+    p = sub.add_parser("xref")
+    p.add_argument("symbol")
+    p.add_argument("--dir", default="temp", help="xref indeksinin bulunduğu obj klasörü")
+    p = sub.add_parser("addr2line")
+    p.add_argument("image", help="obj ya da linklenmiş çıktı")
+    p.add_argument("addresses", nargs="+", help="hex adresler")
+    sub.add_parser("stats")
+    sub.add_parser("shutdown")
+    # watch/build argümanlarını kendi modülleri okur; modüller sadece o komutta yüklenir
+    sub.add_parser("watch", add_help=False, help="kaynakları izle, değişince derle/linkle/.bin üret")
+    sub.add_parser("build", add_help=False, help="bütün kaynakları paralel derle/linkle")
+    args, rest = ap.parse_known_args(argv)
+
+    if args.op == "watch":   # uzun süren döngü, her zaman bu süreçte çalışır
+        import msp430_watch
+        return msp430_watch.main(rest, f"{ap.prog} watch")
+    if args.op == "build":   # kendi süreç havuzunu kurar
+        import msp430_build
+        return msp430_build.main(rest, f"{ap.prog} build")
+    if rest:
+        ap.error(f"tanınmayan argümanlar: {' '.join(rest)}")
+
+    req = build_request(args)
+    resp = None if args.local or args.memprofile else send_request(args.socket, req)
+    if resp is None:
+        if args.op == "shutdown":
+            print("Daemon çalışmıyor", file=sys.stderr)
+            return 1
+        resp = run_local(req, args.memprofile)
+    if not resp["ok"]:
+        print(f"Hata: {resp['error']}", file=sys.stderr)
+        return 1
+    print(json.dumps(resp["result"], indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+"""
+MSP430 assembler daemon'u.
+
+Unix socket üzerinden satır başına bir JSON istek alır, satır başına bir JSON
+cevap döner. ISA tabloları, derleme önbelleği ve okunmuş obj dosyaları süreç
+boyunca bellekte kalır; her çağrıda interpreter ve import maliyeti ödenmez.
+
+İstek:  {"id": 1, "op": "assemble", "path": "/abs/main.asm", "output": "/abs/main.obj"}
+Cevap:  {"id": 1, "ok": true, "result": {...}}  ya da  {"id": 1, "ok": false, "error": "..."}
+
+İşlemler: assemble, link, convert, xref, addr2line, stats, ping, shutdown
+
+    python msp430_daemon.py [--socket YOL] [--workers N]
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import signal
+import threading
+from collections import OrderedDict
+
+from msp430_assembler import (MSP430Assembler, AssemblerPool, LinkEditor, XrefIndex, XREF_DIR,
+                              ENCODING_CACHE,
+                              read_object_file, read_line_table, read_profile, write_object, write_listing)
+from obj_to_bin import convert_to_bin
+from msp430_socket import DEFAULT_SOCKET
+
+ASM_CACHE_SIZE = 256          # önbellekte tutulacak derlenmiş modül sayısı
+MAX_REQUEST_BYTES = 64 << 20  # tek bir JSON satırının üst sınırı
+
+
+class BuildState:
+    """
+    İstekler arasında paylaşılan sıcak durum: kaynak özetine göre derlenmiş
+    modüller (LRU) ve mtime/boyuta göre okunmuş obj dosyaları. Havuzdaki
+    thread'ler aynı anda eriştiği için kilitle korunur.
+    """
+    def __init__(self, cache_size=ASM_CACHE_SIZE):
+        self.cache_size = cache_size
+        self.modules = OrderedDict()   # özet -> ObjectModule
+        self.objects = {}              # yol -> (mtime_ns, boyut, ObjectModule)
+        self.xrefs = {}                # obj klasörü -> (mtime_ns, XrefIndex)
+        self.line_tables = {}          # yol -> (mtime_ns, LineTable)
+        self.linkers = {}              # (obj klasörü, kütüphaneler) -> son artımlı link
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cacheable(source):
+        # .incbin dosyaları kaynağın dışında değişebilir, onları önbelleğe alma
+        return ".incbin" not in source.lower()
+
+    def assemble(self, source, name, base_dir, new_assembler=MSP430Assembler, source_file=None,
+                 workers=1):
+        cacheable = self.cacheable(source)
+        key = hashlib.sha1(f"{name}\0{base_dir}\0{source_file}\0{source}".encode()).hexdigest()
+        if cacheable:
+            with self._lock:
+                m = self.modules.get(key)
+                if m is not None:
+                    self.modules.move_to_end(key)
+                    self.hits += 1
+                    return m, True
+                self.misses += 1
+        m = new_assembler().assemble(source, name, base_dir, workers, source_file)
+        if cacheable:
+            with self._lock:
+                self.modules[key] = m
+                if len(self.modules) > self.cache_size:
+                    self.modules.popitem(last=False)
+        return m, False
+
+    def read_object(self, path):
+        st = os.stat(path)
+        with self._lock:
+            entry = self.objects.get(path)
+        if entry is None or entry[:2] != (st.st_mtime_ns, st.st_size):
+            entry = (st.st_mtime_ns, st.st_size, read_object_file(path))
+            with self._lock:
+                self.objects[path] = entry
+        # linker yerleşimi modüle yazdığı için her link kendi kopyasını alır
+        return entry[2].copy()
+
+    def _xref_locked(self, obj_dir):
+        path = os.path.join(obj_dir, XREF_DIR)
+        # kayıt eklemek/değiştirmek (os.replace) klasörün mtime'ını değiştirir
+        mtime = os.stat(path).st_mtime_ns if os.path.isdir(path) else None
+        entry = self.xrefs.get(obj_dir)
+        if entry is None or entry[0] != mtime:   # başka bir araç (GUI) güncellemiş olabilir
+            entry = self.xrefs[obj_dir] = (mtime, XrefIndex.load(path))
+        return path, entry[1]
+
+    def xref(self, obj_dir):
+        with self._lock:
+            return self._xref_locked(obj_dir)[1]
+
+    def update_xref(self, obj_dir, source, module):
+        with self._lock:
+            path, idx = self._xref_locked(obj_dir)
+            idx.update_module(source, source, module)
+            idx.save_module(path, source)
+            self.xrefs[obj_dir] = (os.stat(path).st_mtime_ns, idx)
+
+    def line_table(self, path):
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            entry = self.line_tables.get(path)
+        if entry is None or entry[0] != mtime:
+            entry = (mtime, read_line_table(path))
+            with self._lock:
+                self.line_tables[path] = entry
+        return entry[1]
+
+    def take_linker(self, key):
+        # aynı anda iki link aynı linker'ı yamamasın: alan sahiplenir, bitince geri koyar
+        with self._lock:
+            return self.linkers.pop(key, None)
+
+    def keep_linker(self, key, linker):
+        with self._lock:
+            self.linkers[key] = linker
+
+    def stats(self):
+        with self._lock:
+            out = {"cached_modules": len(self.modules), "cached_objects": len(self.objects),
+                   "hits": self.hits, "misses": self.misses}
+        # komut kodlama önbelleği süreç genelinde, bütün istekler paylaşır
+        out["encoding_cache"] = ENCODING_CACHE.stats()
+        return out
+
+
+def _assemble(state, req, new_assembler):
+    if "source" in req:
+        source = req["source"]
+        base_dir = req.get("base_dir", ".")
+    else:
+        with open(req["path"], encoding="utf-8") as f:
+            source = f.read()
+        base_dir = req.get("base_dir", os.path.dirname(req["path"]))
+    output = req.get("output")
+    name = req.get("name") or (os.path.basename(output) if output else "module.obj")
+    listing = req.get("listing")
+    workers = req.get("workers") or 1
+    if listing:
+        # listing pass2 satır çıktısına ihtiyaç duyar, önbellekteki modülde bu yok
+        asm = new_assembler()
+        m, cached = asm.assemble(source, name, base_dir, workers, req.get("path")), False
+        write_listing(listing, asm.iter_listing(source.splitlines()))
+    else:
+        m, cached = state.assemble(source, name, base_dir, new_assembler, req.get("path"), workers)
+    # önbellekteki modül başka isteklerle paylaşılır (copy()), onu kapatmak
+    # içeriğini paylaşanları bozar; sadece bu isteğe ait modül kapatılır
+    owned = listing or not state.cacheable(source)
+    try:
+        if output:
+            write_object(output, m)
+            state.update_xref(os.path.dirname(output), req.get("path") or name, m)
+    finally:
+        if owned:
+            m.close()    # .incbin'in mmap'lerini bırak
+    return {
+        "output": output,
+        "listing": listing,
+        "cached": cached,
+        "text": m.section_size(".text"),
+        "data": m.section_size(".data"),
+        "bss": m.section_size(".bss"),
+        "exports": {n: s.address for n, s in m.exports.items()},
+        "relocations": len(m.relocations),
+    }
+
+
+def _link(state, req):
+    """
+    incremental: önceki link'in yerleşimi saklanır, değişen modüller yerine
+    yazılır (LinkEditor.relink); yerleşim tutmuyorsa baştan link edilir.
+    Sıralama (order_calls) her seferinde baştan link ister.
+    """
+    obj_dir = req["obj_dir"]
+    output = req.get("output") or os.path.join(obj_dir, "final.obj")
+    libs = tuple(req.get("libs", ()))
+    incremental = req.get("incremental") and not req.get("order_calls")
+    key = (os.path.abspath(obj_dir), libs, bool(req.get("pool_data")))
+    linker = state.take_linker(key) if incremental else None
+    relinked = linker.relink() if linker is not None else None
+    ordering = None
+    if relinked is None:
+        linker = LinkEditor(obj_dir, libs=libs, reader=state.read_object,
+                            pool_data=req.get("pool_data", False))
+        if req.get("order_calls"):
+            profile = read_profile(req["profile"]) if req.get("profile") else None
+            ordering = linker.order_by_call_graph(profile)
+        linker.link()
+    linker.write(output, req.get("map"))
+    if incremental:
+        state.keep_linker(key, linker)
+    return {"output": output, "map": req.get("map"),
+            "modules": [m.name for m in linker.modules], "symbols": linker.symbols,
+            "data_pooled": linker.pool_saved, "ordering": ordering,
+            "relinked": relinked}
+
+
+def _xref(state, req):
+    return state.xref(req.get("obj_dir", ".")).lookup(req["symbol"])
+
+
+def _addr2line(state, req):
+    table = state.line_table(req["image"])
+    found = table.lookup_many([int(a, 16) if isinstance(a, str) else a for a in req["addresses"]])
+    return [None if f is None else {"file": f[0], "line": f[1]} for f in found]
+
+
+def _convert(req):
+    obj = req["obj"]
+    output = req.get("output") or os.path.splitext(obj)[0] + ".bin"
+    convert_to_bin(obj, output)
+    return {"output": output}
+
+
+def handle_request(state, req, new_assembler=MSP430Assembler):
+    """Tek bir isteği işler ve sonucunu döner; daemon ve istemcinin yerel modu ortak kullanır."""
+    op = req.get("op")
+    if op == "assemble":
+        return _assemble(state, req, new_assembler)
+    if op == "link":
+        return _link(state, req)
+    if op == "convert":
+        return _convert(req)
+    if op == "xref":
+        return _xref(state, req)
+    if op == "addr2line":
+        return _addr2line(state, req)
+    if op == "stats":
+        return state.stats()
+    if op == "ping":
+        return "pong"
+    raise Exception(f"Bilinmeyen işlem: {op}")
+
+
+class AssemblyDaemon:
+    def __init__(self, socket_path=DEFAULT_SOCKET, workers=None):
+        self.socket_path = socket_path
+        self.state = BuildState()
+        self.pool = AssemblerPool(workers or os.cpu_count() or 1)
+        self._stop = None
+
+    async def serve(self):
+        self._stop = asyncio.Event()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)   # önceki çalışmadan kalan socket
+        # socket sadece sahibine açık oluşturulur; bind ile chmod arasında boşluk kalmaz
+        old_umask = os.umask(0o077)
+        try:
+            server = await asyncio.start_unix_server(self._client, path=self.socket_path,
+                                                     limit=MAX_REQUEST_BYTES)
+        finally:
+            os.umask(old_umask)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._stop.set)
+        try:
+            async with server:
+                await self._stop.wait()
+        finally:
+            self.pool.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    async def _client(self, reader, writer):
+        # bir bağlantıdaki istekler paralel işlenir, cevaplar "id" ile eşleşir
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(self._respond(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            pass    # daemon kapanırken açık kalan bağlantılar
+        finally:
+            writer.close()
+
+    async def _respond(self, line, writer, write_lock):
+        req = {}
+        try:
+            req = json.loads(line)
+            if req.get("op") == "shutdown":
+                self._stop.set()
+                result = "bye"
+            else:
+                result = await asyncio.wrap_future(
+                    self.pool.call(handle_request, self.state, req, self.pool.assembler))
+            resp = {"id": req.get("id"), "ok": True, "result": result}
+        except Exception as e:
+            resp = {"id": req.get("id") if isinstance(req, dict) else None,
+                    "ok": False, "error": str(e)}
+        async with write_lock:
+            writer.write(json.dumps(resp).encode() + b"\n")
+            await writer.drain()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="MSP430 assembler daemon")
+    ap.add_argument("--socket", default=DEFAULT_SOCKET)
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args()
+    asyncio.run(AssemblyDaemon(args.socket, args.workers).serve())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,589 @@
+"""
+MSP430 assembly için Language Server (stdio).
+
+Editörler (VS Code, Neovim...) için tanılar, label'a gitme ve hover sağlar.
+Belge artımlı senkronize edilir: her satır için bir ara temsil (LineIR)
+önbellekte tutulur, değişiklikte sadece değişen satırlar yeniden çözülür.
+Adres ataması ve sembol tablosu önbellekteki IR üzerinden tek geçişte kurulur.
+Başka dosyalardaki `.def` sembolleri, o dosyalar assembler'ın pass1'inden
+geçirilerek bulunur.
+
+    python msp430_lsp.py
+"""
+import json
+import os
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from msp430_assembler import (MSP430Assembler, Symbol, INSTRUCTIONS, REGISTERS, BASE_ADDRS,
+                              clean_source, encode_data_values, line_size, parse_incbin)
+
+ERROR, WARNING = 1, 2
+
+# satır türleri
+EMPTY, DEF, REF, SECTION, ORG, CODE = range(6)
+
+SECTION_INDEX = {".text": 0, ".data": 1, ".bss": 2}
+DIRECTIVES = {".text", ".data", ".bss", ".word", ".byte", ".space", ".incbin",
+              ".def", ".ref", ".exdef", ".org", ".end"}
+DUAL_OPERAND = {"MOV", "MOV.W", "ADD", "ADD.W", "SUB", "SUB.W", "CMP"}
+JUMPS = {"JMP", "JEQ", "JNE", "JC", "JN", "JNC", "JGE", "JL"}
+ASM_SUFFIXES = (".asm", ".s", ".s43")
+
+_IDENT_RE = re.compile(r"[A-Za-z_]\w*")
+_OPERAND_RE = re.compile(r"[^\s,]+")
+
+
+class LineIR:
+    """
+    Tek bir kaynak satırının bağlamdan bağımsız çözümü. sizes: satır .text,
+    .data ve .bss içindeyken pass1'in vereceği boyutlar (label-only satırda None).
+    """
+    __slots__ = ("kind", "label", "label_col", "names", "section", "org", "sizes",
+                 "refs", "errors", "mnemonic", "body", "body_col", "incbin")
+
+    def __init__(self):
+        self.kind = EMPTY
+        self.label = None
+        self.label_col = 0
+        self.names = []      # .def/.ref: [(isim, başlangıç, bitiş)]
+        self.section = None
+        self.org = None
+        self.sizes = None
+        self.refs = []       # [(isim, başlangıç, bitiş)]
+        self.errors = []     # [(başlangıç, bitiş, mesaj, önem)]
+        self.mnemonic = None
+        self.body = ""
+        self.body_col = 0
+        self.incbin = False
+
+
+def _ident_refs(text, offset):
+    return [(m.group(), offset + m.start(), offset + m.end())
+            for m in _IDENT_RE.finditer(text) if m.group().upper() not in REGISTERS]
+
+
+def _is_number(text):
+    try:
+        int(text, 16)
+    except ValueError:
+        return False
+    return True
+
+
+def analyze_line(text, base_dir="."):
+    """Satırı pass1'in kurallarıyla LineIR'a çevirir (adres atamadan)."""
+    ir = LineIR()
+    code = text.split(";", 1)[0].rstrip()
+    stripped = code.lstrip()
+    if not stripped:
+        return ir
+    col = len(code) - len(stripped)
+    end = len(code)
+
+    head = stripped[:4]
+    if head.upper() == ".DEF" or head.lower() == ".ref" or stripped[:6].lower() == ".exdef":
+        ir.kind = DEF if head.upper() == ".DEF" else REF
+        n = 4 if ir.kind == DEF or head.lower() == ".ref" else 6
+        ir.names = [(m.group(), col + n + m.start(), col + n + m.end())
+                    for m in _IDENT_RE.finditer(stripped[n:])]
+        return ir
+
+    if stripped.startswith((".text", ".data", ".bss")):
+        ir.kind = SECTION
+        ir.section = stripped.split()[0]
+        if ir.section not in BASE_ADDRS:
+            ir.errors.append((col, end, f"Bilinmeyen section {ir.section}", ERROR))
+        return ir
+
+    if stripped[:3].upper() == "ORG":
+        ir.kind = ORG
+        try:
+            ir.org = int(stripped.split()[1], 16)
+        except (IndexError, ValueError):
+            ir.errors.append((col, end, "ORG için hex adres bekleniyor", ERROR))
+        return ir
+
+    ir.kind = CODE
+    if ":" in stripped:
+        lbl, rest = stripped.split(":", 1)
+        ir.label = lbl.strip()
+        ir.label_col = col + len(lbl) - len(lbl.lstrip())
+        if not _IDENT_RE.fullmatch(ir.label):
+            ir.errors.append((ir.label_col, col + len(lbl), f"Geçersiz label '{ir.label}'", ERROR))
+        col += len(lbl) + 1 + len(rest) - len(rest.lstrip())
+        stripped = rest.strip()
+        if not stripped:
+            return ir
+    ir.body, ir.body_col = stripped, col
+
+    tok0 = stripped.split(None, 1)[0]
+    if stripped.startswith((".word", ".byte")):
+        width = 2 if stripped.startswith(".word") else 1
+        values = stripped[5:]
+        # .word değerleri hex (ABCD gibi), .byte değerleri ondalık/0x; sayı olmayanlar sembol
+        base = 16 if width == 2 else 0
+        for m in _OPERAND_RE.finditer(values):
+            try:
+                int(m.group(), base)
+            except ValueError:
+                ir.refs.extend(_ident_refs(m.group(), col + 5 + m.start()))
+        try:
+            encode_data_values(values, width)
+        except Exception as e:
+            ir.errors.append((col, end, str(e), ERROR))
+    elif tok0.upper() in INSTRUCTIONS:
+        ir.mnemonic = tok0.upper()
+        operands = [(m.group(), col + m.start()) for m in _OPERAND_RE.finditer(stripped)][1:]
+        for opd, start in operands:
+            if opd.startswith("#") or _is_number(opd.lstrip("&@").split("(", 1)[0].rstrip("+")):
+                continue
+            ir.refs.extend(r for r in _ident_refs(opd, start) if r[0].upper() not in INSTRUCTIONS)
+        need = 2 if ir.mnemonic in DUAL_OPERAND else 1 if ir.mnemonic in JUMPS else 0
+        if len(operands) < need:
+            ir.errors.append((col, end, f"{ir.mnemonic} {need} operand bekliyor", ERROR))
+    elif stripped[:7].lower() == ".incbin":
+        ir.incbin = True
+        try:
+            parse_incbin(stripped, base_dir)
+        except Exception as e:
+            ir.errors.append((col, end, str(e), ERROR))
+    elif stripped.startswith(".space"):
+        try:
+            int(stripped.split(".space", 1)[1])
+        except ValueError:
+            ir.errors.append((col, end, ".space için sayı bekleniyor", ERROR))
+    else:
+        if tok0.startswith("."):
+            if tok0.lower() not in DIRECTIVES:
+                ir.errors.append((col, col + len(tok0), f"Bilinmeyen direktif {tok0}", WARNING))
+        else:
+            ir.errors.append((col, col + len(tok0), f"Bilinmeyen komut {tok0}", ERROR))
+    ir.sizes = _sizes(stripped, base_dir)
+    return ir
+
+
+def _sizes(body, base_dir):
+    # pass1'in boyut kuralı; satırın hangi section'da olduğu layout'ta belli olur
+    out = []
+    for sec in SECTION_INDEX:
+        try:
+            out.append(line_size(body, sec, base_dir))
+        except Exception:
+            out.append(0)     # hata zaten tanı olarak eklendi
+    return tuple(out)
+
+
+class Document:
+    def __init__(self, uri, text, version=0):
+        self.uri = uri
+        self.path = uri_to_path(uri)
+        self.base_dir = os.path.dirname(self.path) or "."
+        self.version = version
+        self.lines = text.split("\n")
+        self.ir = [analyze_line(ln, self.base_dir) for ln in self.lines]
+        self._entry = []    # satır başındaki (section, adres, section imleçleri); layout devam noktası
+        self.layout()
+
+    def apply_change(self, change):
+        """
+        LSP contentChange uygular; sadece etkilenen satırların IR'ı yeniden hesaplanır.
+        Değişen ilk satırı döner (layout oradan devam eder).
+        """
+        if "range" not in change:
+            self.lines = change["text"].split("\n")
+            self.ir = [analyze_line(ln, self.base_dir) for ln in self.lines]
+            return 0
+        start, end = change["range"]["start"], change["range"]["end"]
+        sl, el = start["line"], end["line"]
+        if sl >= len(self.lines):
+            self.lines.append("")
+            self.ir.append(LineIR())
+            sl = el = len(self.lines) - 1
+        el = min(el, len(self.lines) - 1)
+        head = self.lines[sl][:from_utf16(self.lines[sl], start["character"])]
+        tail = (self.lines[el][from_utf16(self.lines[el], end["character"]):]
+                if end["line"] < len(self.lines) else "")
+        new = (head + change["text"] + tail).split("\n")
+        self.lines[sl:el + 1] = new
+        self.ir[sl:el + 1] = [analyze_line(ln, self.base_dir) for ln in new]
+        return sl
+
+    def layout(self, start=0):
+        """
+        IR üzerinden adresleri, sembol tablosunu ve bağlama bağlı tanıları kurar.
+        start'tan önceki satırlar değişmediği için onların sonuçları korunur ve
+        yürüyüş start satırının başındaki durumdan devam eder. Tanımsız sembol
+        ve .def kontrolleri sembol tablosunun tamamına bağlı, her seferinde yapılır.
+        """
+        if 0 < start < len(self._entry):
+            labels = {n: s for n, s in self.labels.items() if s.line < start}
+            exports = {n: v for n, v in self.exports.items() if v[0] < start}
+            imports = {n: v for n, v in self.imports.items() if v[0] < start}
+            diags = [d for d in self._line_diags if d[0] < start]
+            ref_lines = self._ref_lines[:bisect_left(self._ref_lines, start)]
+            addrs, sections, entry = self.addresses[:start], self.sections[:start], self._entry[:start]
+            section, address, cursors = self._entry[start]
+        else:
+            start = 0
+            labels, exports, imports = {}, {}, {}
+            diags, ref_lines = [], []
+            addrs, sections, entry = array('l'), [], []
+            section, address = ".text", BASE_ADDRS[".text"]
+            cursors = dict(BASE_ADDRS)     # pass1 gibi: section'a dönünce kaldığı yerden
+        for i in range(start, len(self.ir)):
+            ir = self.ir[i]
+            # imleç sözlüğü yerinde değiştirilmez, kayıtlar onu paylaşabilir
+            entry.append((section, address, cursors))
+            addrs.append(-1)
+            sections.append(None)
+            for e in ir.errors:
+                diags.append((i,) + e)
+            kind = ir.kind
+            if kind == EMPTY:
+                continue
+            if kind == DEF:
+                for n in ir.names:
+                    exports.setdefault(n[0], (i,) + n[1:])
+                continue
+            if kind == REF:
+                for n in ir.names:
+                    imports.setdefault(n[0], (i,) + n[1:])
+                continue
+            if kind == SECTION:
+                if ir.section in BASE_ADDRS:
+                    cursors = {**cursors, section: address}
+                    section, address = ir.section, cursors[ir.section]
+                continue
+            if kind == ORG:
+                if ir.org is not None:
+                    if ir.org < address or (section == ".text" and (ir.org - address) & 1):
+                        diags.append((i, 0, len(self.lines[i]),
+                                      f"ORG 0x{ir.org:04X} geçersiz: adres 0x{address:04X}", ERROR))
+                    else:
+                        address = ir.org
+                continue
+            addrs[i] = address
+            sections[i] = section
+            if ir.label:
+                if ir.label in labels:
+                    diags.append((i, ir.label_col, ir.label_col + len(ir.label),
+                                  f"Label '{ir.label}' zaten tanımlı (satır {labels[ir.label].line + 1})", ERROR))
+                else:
+                    labels[ir.label] = Symbol(ir.label, section, address, i)
+            if ir.refs:
+                ref_lines.append(i)
+            if ir.incbin and section != ".data":
+                diags.append((i, ir.body_col, ir.body_col + len(ir.body),
+                              ".incbin sadece .data section'ında kullanılabilir", ERROR))
+            if ir.sizes:
+                address += ir.sizes[SECTION_INDEX[section]]
+        entry.append((section, address, cursors))
+        self._entry, self._line_diags, self._ref_lines = entry, list(diags), ref_lines
+
+        for i in ref_lines:
+            for name, s, e in self.ir[i].refs:
+                if name not in labels and name not in imports:
+                    diags.append((i, s, e, f"Tanımsız sembol {name}", ERROR))
+        for name, (i, s, e) in exports.items():
+            if name not in labels:
+                diags.append((i, s, e, f".def {name} için label yok", WARNING))
+
+        self.labels, self.exports, self.imports = labels, exports, imports
+        self.addresses, self.sections = addrs, sections
+        self.diagnostics = diags
+
+    def token_at(self, line, char):
+        """(isim, başlangıç, bitiş) ya da None."""
+        if line >= len(self.ir):
+            return None
+        ir = self.ir[line]
+        cands = list(ir.refs) + list(ir.names)
+        if ir.label:
+            cands.append((ir.label, ir.label_col, ir.label_col + len(ir.label)))
+        for tok in cands:
+            if tok[1] <= char <= tok[2]:
+                return tok
+        return None
+
+    def encode_line(self, line):
+        """Satırın makine kodu (hex word'ler) ya da hata mesajı; hover için."""
+        ir = self.ir[line]
+        asm = MSP430Assembler()
+        asm.labels = self.labels
+        asm.imports = {n: [] for n in self.imports}
+        asm.line_addresses = array('L', [max(self.addresses[line], 0)])
+        try:
+            binstr = asm._encode_text_line(ir.body, 0)
+        except Exception as e:
+            return f"kodlanamadı: {e}"
+        if binstr is None:
+            return None
+        return " ".join(f"0x{int(binstr[i:i+16], 2):04X}" for i in range(0, len(binstr), 16))
+
+
+def uri_to_path(uri):
+    p = urlparse(uri)
+    return url2pathname(p.path) if p.scheme == "file" else uri
+
+
+def path_to_uri(path):
+    return "file://" + os.path.abspath(path).replace(os.sep, "/")
+
+
+def to_utf16(text, col):
+    """Python str indeksini LSP'nin UTF-16 birim sütununa çevirir."""
+    if text.isascii():
+        return col
+    return col + sum(1 for ch in text[:col] if ord(ch) > 0xFFFF)
+
+
+def from_utf16(text, units):
+    """LSP'nin UTF-16 sütununu str indeksine çevirir."""
+    if text.isascii():
+        return min(units, len(text))
+    i = n = 0
+    while i < len(text) and n < units:
+        n += 2 if ord(text[i]) > 0xFFFF else 1
+        i += 1
+    return i
+
+
+def _range(text, line, start, end):
+    # içeride sütunlar str indeksi, protokolde UTF-16 birimi
+    return {"start": {"line": line, "character": to_utf16(text, start)},
+            "end": {"line": line, "character": to_utf16(text, end)}}
+
+
+class Workspace:
+    """
+    Açık olmayan kaynak dosyalardaki export'lar. Her dosya assembler'ın pass1'i
+    ile taranır (.def/.ref takibi oradan gelir), sonuç mtime'a göre önbellekte tutulur.
+    """
+    def __init__(self):
+        self.roots = []
+        self.files = {}   # yol -> (mtime_ns, {isim: Symbol}, satırlar)
+
+    def add_root(self, path):
+        if path and os.path.isdir(path) and path not in self.roots:
+            self.roots.append(path)
+
+    def _exports(self, path):
+        st = os.stat(path)
+        entry = self.files.get(path)
+        if entry is None or entry[0] != st.st_mtime_ns:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                lines = f.read().splitlines()
+            asm = MSP430Assembler()
+            asm.base_dir = os.path.dirname(path)
+            try:
+                asm.pass1(*clean_source(lines))
+                exports = {n: asm.labels[n] for n in asm.exports if n in asm.labels}
+            except Exception:
+                exports = {}
+            entry = self.files[path] = (st.st_mtime_ns, exports, lines)
+        return entry
+
+    def find_export(self, name, skip=()):
+        for root in self.roots:
+            for dirpath, _, filenames in os.walk(root):
+                for fn in filenames:
+                    path = os.path.join(dirpath, fn)
+                    if not fn.lower().endswith(ASM_SUFFIXES) or path in skip:
+                        continue
+                    _, exports, lines = self._exports(path)
+                    sym = exports.get(name)
+                    if sym is not None:
+                        row = sym.line - 1
+                        col = max(lines[row].find(name), 0)
+                        return path, row, col, lines[row], sym
+        return None
+
+
+class LanguageServer:
+    def __init__(self, rfile=None, wfile=None):
+        self.rfile = rfile or sys.stdin.buffer
+        self.wfile = wfile or sys.stdout.buffer
+        self.docs = {}
+        self.workspace = Workspace()
+        self.shutdown_requested = False
+        self.handlers = {
+            "initialize": self.initialize,
+            "shutdown": self.shutdown,
+            "textDocument/didOpen": self.did_open,
+            "textDocument/didChange": self.did_change,
+            "textDocument/didClose": self.did_close,
+            "textDocument/definition": self.definition,
+            "textDocument/hover": self.hover,
+        }
+
+    # --- JSON-RPC ---
+    def read_message(self):
+        length = None
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return None
+            line = line.strip()
+            if not line:
+                break
+            key, _, value = line.decode("ascii").partition(":")
+            if key.lower() == "content-length":
+                length = int(value)
+        return json.loads(self.rfile.read(length))
+
+    def send(self, msg):
+        body = json.dumps(dict(msg, jsonrpc="2.0")).encode("utf-8")
+        self.wfile.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+        self.wfile.flush()
+
+    def log_error(self, message):
+        self.send({"method": "window/logMessage", "params": {"type": ERROR, "message": message}})
+
+    def run(self):
+        while True:
+            msg = self.read_message()
+            if msg is None or msg.get("method") == "exit":
+                return 0 if self.shutdown_requested else 1
+            handler = self.handlers.get(msg.get("method"))
+            if "id" not in msg:         # notification: cevap yok, hata loglanır, döngü sürer
+                if handler:
+                    try:
+                        handler(msg.get("params") or {})
+                    except Exception as e:
+                        self.log_error(f"{msg.get('method')}: {type(e).__name__}: {e}")
+                continue
+            if handler is None:
+                self.send({"id": msg["id"], "error": {"code": -32601, "message": "Method not found"}})
+                continue
+            try:
+                self.send({"id": msg["id"], "result": handler(msg.get("params") or {})})
+            except Exception as e:
+                self.send({"id": msg["id"], "error": {"code": -32603, "message": str(e)}})
+
+    # --- lifecycle ---
+    def initialize(self, params):
+        for folder in params.get("workspaceFolders") or []:
+            self.workspace.add_root(uri_to_path(folder["uri"]))
+        if params.get("rootUri"):
+            self.workspace.add_root(uri_to_path(params["rootUri"]))
+        return {
+            "capabilities": {
+                "textDocumentSync": {"openClose": True, "change": 2},   # 2 = incremental
+                "definitionProvider": True,
+                "hoverProvider": True,
+            },
+            "serverInfo": {"name": "msp430-lsp"},
+        }
+
+    def shutdown(self, params):
+        self.shutdown_requested = True
+        return None
+
+    # --- belge senkronizasyonu ---
+    def did_open(self, params):
+        td = params["textDocument"]
+        doc = self.docs[td["uri"]] = Document(td["uri"], td["text"], td.get("version", 0))
+        self.workspace.add_root(doc.base_dir)
+        self.publish(doc)
+
+    def did_change(self, params):
+        td = params["textDocument"]
+        doc = self.docs.get(td["uri"])
+        if doc is None:
+            raise Exception(f"Açık olmayan belge: {td['uri']}")
+        first = len(doc.ir)
+        for change in params["contentChanges"]:
+            first = min(first, doc.apply_change(change))
+        doc.version = td.get("version", doc.version)
+        doc.layout(first)
+        self.publish(doc)
+
+    def did_close(self, params):
+        uri = params["textDocument"]["uri"]
+        self.docs.pop(uri, None)
+        self.send({"method": "textDocument/publishDiagnostics",
+                   "params": {"uri": uri, "diagnostics": []}})
+
+    def publish(self, doc):
+        diags = [{"range": _range(doc.lines[ln], ln, s, e), "severity": sev, "source": "msp430",
+                  "message": msg}
+                 for ln, s, e, msg, sev in doc.diagnostics]
+        self.send({"method": "textDocument/publishDiagnostics",
+                   "params": {"uri": doc.uri, "version": doc.version, "diagnostics": diags}})
+
+    # --- gezinme ---
+    def _resolve(self, doc, name):
+        """Sembolün tanımı: (uri, satır, sütun, satır metni, Symbol) ya da None."""
+        sym = doc.labels.get(name)
+        if sym is not None:
+            ir = doc.ir[sym.line]
+            return doc.uri, sym.line, ir.label_col, doc.lines[sym.line], sym
+        for other in self.docs.values():
+            if other is not doc and name in other.exports and name in other.labels:
+                sym = other.labels[name]
+                return other.uri, sym.line, other.ir[sym.line].label_col, other.lines[sym.line], sym
+        found = self.workspace.find_export(name, skip={d.path for d in self.docs.values()})
+        if found:
+            path, row, col, text, sym = found
+            return path_to_uri(path), row, col, text, sym
+        return None
+
+    def definition(self, params):
+        doc = self.docs[params["textDocument"]["uri"]]
+        pos = params["position"]
+        tok = doc.token_at(pos["line"], self._char(doc, pos))
+        if tok is None:
+            return None
+        found = self._resolve(doc, tok[0])
+        if found is None:
+            return None
+        uri, row, col, text, _ = found
+        return {"uri": uri, "range": _range(text, row, col, col + len(tok[0]))}
+
+    @staticmethod
+    def _char(doc, pos):
+        line = pos["line"]
+        return from_utf16(doc.lines[line], pos["character"]) if line < len(doc.lines) else 0
+
+    def hover(self, params):
+        doc = self.docs[params["textDocument"]["uri"]]
+        line = params["position"]["line"]
+        if line >= len(doc.ir):
+            return None
+        char = self._char(doc, params["position"])
+        tok = doc.token_at(line, char)
+        if tok is not None:
+            name = tok[0]
+            found = self._resolve(doc, name)
+            if found is None:
+                text = f"`{name}` tanımsız"
+            else:
+                uri, row, _, _, sym = found
+                text = f"`{name}` {sym.section} 0x{sym.address:04X}"
+                if name in doc.exports:
+                    text += " (.def)"
+                if uri != doc.uri:
+                    text += f"\n\n.ref — tanım: {os.path.basename(uri_to_path(uri))}:{row + 1}"
+            return {"contents": {"kind": "markdown", "value": text},
+                    "range": _range(doc.lines[line], line, tok[1], tok[2])}
+        ir = doc.ir[line]
+        if ir.mnemonic and doc.addresses[line] >= 0:
+            text = f"`{ir.mnemonic}` @ 0x{doc.addresses[line]:04X}"
+            enc = doc.encode_line(line)
+            if enc:
+                text += f"\n\n{enc}"
+            return {"contents": {"kind": "markdown", "value": text}}
+        return None
+
+
+def main():
+    return LanguageServer().run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,824 @@
+"""
+MSP430 komut seti simülatörü.
+
+Linklenmiş çıktıyı (final.obj) ya da obj_to_bin ile üretilmiş .bin dosyasını
+64 KB'lık belleğe yükler ve donanım olmadan çalıştırır. Her word ilk
+çalıştırıldığında bir kez çözülür ve adresine göre önbelleğe bağlanmış bir
+closure olarak konur; sonraki çalıştırmalar doğrudan bu closure'ı çağırır.
+Koda yapılan yazmalar ilgili önbellek girdilerini siler.
+
+Varsayılan olarak bu assembler'ın ürettiği kodlamalar kullanılır (compat):
+    0x0000 -> NOP, 0x1300 -> RET, iki operandlı komutlarda B/W biti yok
+    sayılır (hepsi word). CALL standart kodlamadır (CALL #hedef = 0x12B0 + word).
+--strict ile standart MSP430 kodlaması (RETI, PUSH, .B komutları) kullanılır.
+
+Çalışma CPUOFF biti set edildiğinde, kendine atlayan bir jump'ta (JMP $),
+--until adresinde ya da adım sınırında durur.
+
+    python msp430_sim.py temp/final.obj [--until end] [--max-steps N] [--json]
+    python msp430_sim.py temp/final.bin --base 0x0000 --entry 0x0000
+    python msp430_sim.py temp/final.obj --profile prof.json   # link --order-calls --profile için
+"""
+import argparse
+import json
+import sys
+import time
+from array import array
+from bisect import bisect_right
+
+from msp430_assembler import DEFAULT_MEMORY_MAP, read_line_table
+
+MEM_SIZE = 0x10000
+DEFAULT_MAX_STEPS = 10_000_000
+RESET_VECTOR = 0xFFFE
+
+# register numaraları ve SR bitleri
+PC, SP, SR, CG = 0, 1, 2, 3
+C, Z, N, GIE, CPUOFF, V = 0x1, 0x2, 0x4, 0x8, 0x10, 0x100
+FLAGS = C | Z | N | V
+
+# operand adresleme modları
+REG, CONST, IMM, IDX, SYM, ABS, IND, INC = range(8)
+
+FORMAT1 = {0x4: "MOV", 0x5: "ADD", 0x6: "ADDC", 0x7: "SUBC", 0x8: "SUB", 0x9: "CMP",
+           0xA: "DADD", 0xB: "BIT", 0xC: "BIC", 0xD: "BIS", 0xE: "XOR", 0xF: "AND"}
+FORMAT2 = ("RRC", "SWPB", "RRA", "SXT", "PUSH", "CALL", "RETI")
+JUMPS = ("JNE", "JEQ", "JNC", "JC", "JN", "JGE", "JL", "JMP")
+
+# cycle tabloları (MSP430x1xx user guide, bölüm 3.4.4)
+# iki operandlı: kaynak sınıfı -> (hedef Rm, hedef PC, hedef bellek)
+_SRC_CLASS = {REG: 0, CONST: 0, IND: 1, INC: 2, IMM: 2, IDX: 3, SYM: 3, ABS: 3}
+FORMAT1_CYCLES = ((1, 2, 4), (2, 2, 5), (2, 3, 5), (3, 3, 6))
+# tek operandlı: sınıf -> cycle (RRA/RRC/SWPB/SXT, PUSH, CALL)
+FORMAT2_CYCLES = {"RRC": (1, 3, 3, 4), "PUSH": (3, 4, 4, 5), "CALL": (4, 4, 5, 5)}
+RETI_CYCLES = 5
+JUMP_CYCLES = 2
+
+
+class Halt(Exception):
+    """Simülasyonun normal bitişi; args[0] sebebi verir."""
+
+
+class Operand:
+    __slots__ = ("mode", "reg", "value")
+
+    def __init__(self, mode, reg, value=0):
+        self.mode = mode
+        self.reg = reg
+        self.value = value   # ext word, sabit ya da SYM için etkin adres
+
+    def __str__(self):
+        m, r, v = self.mode, self.reg, self.value
+        if m == REG:
+            return f"R{r}"
+        if m in (CONST, IMM):
+            return f"#0x{v:X}"
+        if m == IDX:
+            return f"0x{v:X}(R{r})"
+        if m == SYM:
+            return f"0x{v:04X}"
+        if m == ABS:
+            return f"&0x{v:04X}"
+        return f"@R{r}" + ("+" if m == INC else "")
+
+
+class Instruction:
+    """Çözülmüş tek komut. target: jump/CALL hedefi (statik olarak biliniyorsa)."""
+    __slots__ = ("addr", "size", "mnemonic", "byte", "src", "dst", "cycles", "target", "word")
+
+    def __init__(self, addr, word, mnemonic, size=2, byte=False, src=None, dst=None,
+                 cycles=1, target=None):
+        self.addr = addr
+        self.word = word
+        self.mnemonic = mnemonic
+        self.size = size
+        self.byte = byte
+        self.src = src
+        self.dst = dst
+        self.cycles = cycles
+        self.target = target
+
+    def __str__(self):
+        name = self.mnemonic + (".B" if self.byte else "")
+        ops = [str(o) for o in (self.src, self.dst) if o is not None]
+        if self.target is not None and self.mnemonic in JUMPS:
+            ops = [f"0x{self.target:04X}"]
+        return f"{name} {', '.join(ops)}".rstrip()
+
+
+def _operand(mode_bits, reg, read_word, ptr):
+    # As/Ad bitlerini operand'a çevirir; ext word tüketilirse ptr ilerler
+    if reg == CG:
+        return Operand(CONST, reg, (0, 1, 2, 0xFFFF)[mode_bits]), ptr
+    if reg == SR and mode_bits >= 2:
+        return Operand(CONST, reg, 4 if mode_bits == 2 else 8), ptr
+    if mode_bits == 0:
+        return Operand(REG, reg), ptr
+    if mode_bits == 1:
+        x = read_word(ptr)
+        if reg == PC:
+            return Operand(SYM, reg, (ptr + x) & 0xFFFF), ptr + 2
+        if reg == SR:
+            return Operand(ABS, reg, x), ptr + 2
+        return Operand(IDX, reg, x), ptr + 2
+    if mode_bits == 3 and reg == PC:
+        return Operand(IMM, reg, read_word(ptr)), ptr + 2
+    return Operand(IND if mode_bits == 2 else INC, reg), ptr
+
+
+def decode(read_word, addr, compat=True):
+    """addr'daki komutu çözer; read_word(adres) -> 16 bit değer."""
+    w = read_word(addr)
+    if compat:
+        if w == 0x0000:
+            return Instruction(addr, w, "NOP")
+        if w == 0x1300:
+            return Instruction(addr, w, "RET", cycles=3)
+    if w & 0xE000 == 0x2000:
+        off = w & 0x3FF
+        if off & 0x200:
+            off -= 0x400
+        return Instruction(addr, w, JUMPS[(w >> 10) & 7], cycles=JUMP_CYCLES,
+                           target=(addr + 2 + 2 * off) & 0xFFFF)
+    if w & 0xFC00 == 0x1000:
+        sub = (w >> 7) & 7
+        if sub == 7:
+            raise Exception(f"Geçersiz komut 0x{w:04X} @ 0x{addr:04X}")
+        if sub == 6:
+            return Instruction(addr, w, "RETI", cycles=RETI_CYCLES)
+        op, ptr = _operand((w >> 4) & 3, w & 15, read_word, addr + 2)
+        name = FORMAT2[sub]
+        cls = _SRC_CLASS[op.mode]
+        cycles = FORMAT2_CYCLES.get(name, FORMAT2_CYCLES["RRC"])[min(cls, 3)]
+        target = op.value if name == "CALL" and op.mode == IMM else None
+        byte = bool(w & 0x40) and not compat and name not in ("SWPB", "SXT", "CALL")
+        return Instruction(addr, w, name, ptr - addr, byte, src=op, cycles=cycles, target=target)
+    if w < 0x4000:
+        raise Exception(f"Geçersiz komut 0x{w:04X} @ 0x{addr:04X}")
+    src, ptr = _operand((w >> 4) & 3, (w >> 8) & 15, read_word, addr + 2)
+    dst, ptr = _operand((w >> 7) & 1, w & 15, read_word, ptr)
+    dcls = 0 if dst.mode in (REG, CONST) and dst.reg != PC else 1 if dst.mode == REG else 2
+    cycles = FORMAT1_CYCLES[_SRC_CLASS[src.mode]][dcls]
+    return Instruction(addr, w, FORMAT1[w >> 12], ptr - addr, bool(w & 0x40) and not compat,
+                       src, dst, cycles)
+
+
+class Simulator:
+    """
+    Register'lar, SR bayrakları ve 64 KB bellek. cache[adres >> 1], o adresteki
+    komutu çalıştıran (closure, cycle) çiftidir; hits adres başına çalışma sayısı.
+    """
+    def __init__(self, compat=True):
+        self.compat = compat
+        self.mem = bytearray(MEM_SIZE)
+        self.regs = [0] * 16
+        self.cache = [None] * (MEM_SIZE >> 1)
+        self.hits = array('L', [0]) * (MEM_SIZE >> 1)
+        self.instructions = 0
+        self.cycles = 0
+        self.symbols = {}
+        self.lines = None
+        ram = next((r for r in DEFAULT_MEMORY_MAP if r.name == "RAM"), None)
+        self.stack_top = ram.end if ram else RESET_VECTOR & ~0x1F
+
+    # --- yükleme ---------------------------------------------------------
+
+    @classmethod
+    def from_file(cls, path, base=0, entry=None, compat=True):
+        """final.obj ya da .bin yükler, PC ve SP'yi ayarlar."""
+        sim = cls(compat)
+        with open(path, "rb") as f:
+            head = f.read(32)
+        if head.startswith(b"COFF_LINKED"):
+            sim.load_image(path)
+        elif head.startswith(b"COFF"):
+            raise Exception(f"{path} linklenmemiş bir obj; önce modülleri link edin")
+        else:
+            with open(path, "rb") as f:
+                sim.load(base, f.read())
+            sim.symbols.setdefault("__start", base)
+        sim.reset(entry)
+        return sim
+
+    def load(self, addr, data):
+        self.mem[addr:addr + len(data)] = data
+        for i in range(addr >> 1, min((addr + len(data) + 1) >> 1, len(self.cache))):
+            self.cache[i] = None
+
+    def load_image(self, path):
+        """Linklenmiş çıktının section'larını, sembollerini ve satır tablosunu yükler."""
+        section, addr, buf = None, 0, bytearray()
+        with open(path) as f:
+            for ln in f:
+                ln = ln.strip()
+                if ln.startswith("SECTION"):
+                    if buf:
+                        self.load(addr, buf)
+                    parts = ln.split()
+                    section, addr, buf = parts[1], int(parts[2], 16), bytearray()
+                elif ln.startswith("0x") and section in (".text", ".data"):
+                    v = int(ln, 16)
+                    buf += v.to_bytes(2 if len(ln) > 4 else 1, "little")
+                elif ln in ("SYMBOLS", "LINES", "EOF"):
+                    if buf:
+                        self.load(addr, buf)
+                    section, buf = ln, bytearray()
+                    if ln != "SYMBOLS":
+                        break
+                elif section == "SYMBOLS" and ln:
+                    name, value = ln.split()
+                    self.symbols[name] = int(value, 16)
+        self.lines = read_line_table(path)
+
+    def reset(self, entry=None):
+        """PC: verilen giriş, reset vektörü, 'start' sembolü ya da 0; SP: RAM sonu."""
+        if entry is None:
+            entry = self.read_word(RESET_VECTOR) or self.symbols.get("start", 0)
+        regs = self.regs
+        regs[:] = [0] * 16
+        regs[PC] = entry & 0xFFFE
+        regs[SP] = self.stack_top
+        self.instructions = self.cycles = 0
+        self.hits[:] = array('L', [0]) * (MEM_SIZE >> 1)
+
+    def resolve(self, value):
+        """Sembol adı ya da sayı -> adres."""
+        if isinstance(value, int):
+            return value
+        if value in self.symbols:
+            return self.symbols[value]
+        return int(value, 0)
+
+    # --- bellek ----------------------------------------------------------
+
+    def read_word(self, addr):
+        addr &= 0xFFFE
+        return self.mem[addr] | (self.mem[addr + 1] << 8)
+
+    def read_byte(self, addr):
+        return self.mem[addr & 0xFFFF]
+
+    def _memory_access(self):
+        # closure'ların kullandığı okuma/yazma fonksiyonları; yazmalar o adresi
+        # kapsayabilecek (en fazla 3 word'lük) komutların önbelleğini siler
+        mem, cache = self.mem, self.cache
+
+        def rw(a):
+            a &= 0xFFFE
+            return mem[a] | (mem[a + 1] << 8)
+
+        def ww(a, v):
+            a &= 0xFFFE
+            mem[a] = v & 0xFF
+            mem[a + 1] = v >> 8
+            i = a >> 1
+            cache[i] = cache[i - 1] = cache[i - 2] = None
+
+        def rb(a):
+            return mem[a & 0xFFFF]
+
+        def wb(a, v):
+            a &= 0xFFFF
+            mem[a] = v
+            i = a >> 1
+            cache[i] = cache[i - 1] = cache[i - 2] = None
+
+        return rw, ww, rb, wb
+
+    # --- çözme ve closure üretimi ----------------------------------------
+
+    def decode(self, addr):
+        return decode(self.read_word, addr, self.compat)
+
+    def _compile(self, addr):
+        ins = self.decode(addr)
+        name = ins.mnemonic
+        if name in JUMPS:
+            fn = self._jump(ins)
+        elif name in FORMAT1.values():
+            fn = self._format1(ins)
+        else:
+            fn = self._format2(ins)
+        return fn, ins.cycles
+
+    def _source(self, op, byte, ins):
+        # kaynak operandı okuyan fonksiyon (autoincrement dahil)
+        regs = self.regs
+        rw, ww, rb, wb = self._memory_access()
+        rd = rb if byte else rw
+        m, r, v = op.mode, op.reg, op.value
+        mask = 0xFF if byte else 0xFFFF
+        if m == REG and r == PC:
+            m, v = CONST, ins.addr + 2
+        if m in (CONST, IMM):
+            v &= mask
+            return lambda: v
+        if m == REG:
+            if byte:
+                return lambda: regs[r] & 0xFF
+            return lambda: regs[r]
+        if m in (SYM, ABS):
+            return lambda: rd(v)
+        if m == IDX:
+            return lambda: rd(regs[r] + v)
+        if m == IND:
+            return lambda: rd(regs[r])
+        step = 1 if byte and r != SP else 2
+
+        def post_inc():
+            a = regs[r]
+            regs[r] = (a + step) & 0xFFFF
+            return rd(a)
+        return post_inc
+
+    def _reg_writer(self, r, byte):
+        regs = self.regs
+        if r == CG:
+            return lambda x: None
+        if r == PC:
+            def set_pc(x):
+                regs[PC] = x & 0xFFFE
+            return set_pc
+        if r == SR:
+            def set_sr(x):
+                regs[SR] = x
+                if x & CPUOFF:
+                    raise Halt("cpuoff")
+            return set_sr
+        if byte:
+            def set_byte(x):
+                regs[r] = x & 0xFF
+            return set_byte
+
+        def set_word(x):
+            regs[r] = x
+        return set_word
+
+    def _address(self, op):
+        # bellek operandının etkin adresini hesaplayan fonksiyon
+        regs = self.regs
+        m, r, v = op.mode, op.reg, op.value
+        if m in (SYM, ABS):
+            return lambda: v
+        if m == IDX:
+            return lambda: (regs[r] + v) & 0xFFFF
+        if m == IND:
+            return lambda: regs[r]
+        step = 2 if r in (SP, PC) else 1
+
+        def post_inc():
+            a = regs[r]
+            regs[r] = (a + step) & 0xFFFF
+            return a
+        return post_inc
+
+    def _alu(self, name, byte):
+        """(kaynak, hedef) -> sonuç; sonuç None ise hedefe yazılmaz (CMP, BIT)."""
+        regs = self.regs
+        mask, sign = (0xFF, 0x80) if byte else (0xFFFF, 0x8000)
+        bits = 8 if byte else 16
+
+        def add0(s, d):
+            r = s + d
+            sr = regs[SR] & ~FLAGS
+            if r > mask:
+                sr |= C
+                r &= mask
+            if r == 0:
+                sr |= Z
+            elif r & sign:
+                sr |= N
+            if (s ^ r) & (d ^ r) & sign:
+                sr |= V
+            regs[SR] = sr
+            return r
+
+        def add(s, d, cin):
+            r = s + d + cin
+            sr = regs[SR] & ~FLAGS
+            if r > mask:
+                sr |= C
+                r &= mask
+            if r == 0:
+                sr |= Z
+            elif r & sign:
+                sr |= N
+            if (s ^ r) & (d ^ r) & sign:
+                sr |= V
+            regs[SR] = sr
+            return r
+
+        def logic(r, c, v):
+            sr = regs[SR] & ~FLAGS
+            if r == 0:
+                sr |= Z
+            elif r & sign:
+                sr |= N
+            if c:
+                sr |= C
+            if v:
+                sr |= V
+            regs[SR] = sr
+            return r
+
+        def sub(s, d):
+            # d - s = d + ~s + 1; ADD ile aynı gövde, sık kullanıldığı için açık yazıldı
+            s = ~s & mask
+            r = s + d + 1
+            sr = regs[SR] & ~FLAGS
+            if r > mask:
+                sr |= C
+                r &= mask
+            if r == 0:
+                sr |= Z
+            elif r & sign:
+                sr |= N
+            if (s ^ r) & (d ^ r) & sign:
+                sr |= V
+            regs[SR] = sr
+            return r
+
+        if name == "MOV":
+            return lambda s, d: s
+        if name == "ADD":
+            return add0
+        if name == "ADDC":
+            return lambda s, d: add(s, d, regs[SR] & C)
+        if name == "SUB":
+            return sub
+        if name == "SUBC":
+            return lambda s, d: add(~s & mask, d, regs[SR] & C)
+        if name == "CMP":
+            def cmp(s, d):
+                sub(s, d)
+            return cmp
+        if name == "BIT":
+            def bit(s, d):
+                r = s & d
+                logic(r, r, 0)
+            return bit
+        if name == "AND":
+            return lambda s, d: logic(s & d, s & d, 0)
+        if name == "XOR":
+            return lambda s, d: logic(s ^ d, s ^ d, s & d & sign)
+        if name == "BIC":
+            return lambda s, d: d & ~s & mask
+        if name == "BIS":
+            return lambda s, d: d | s
+
+        def dadd(s, d):
+            c, r = regs[SR] & C, 0
+            for shift in range(0, bits, 4):
+                t = ((s >> shift) & 15) + ((d >> shift) & 15) + c
+                c = t > 9
+                r |= (t - 10 if c else t) << shift
+            return logic(r & mask, c, 0)
+        return dadd
+
+    def _format1(self, ins):
+        regs = self.regs
+        nxt = (ins.addr + ins.size) & 0xFFFF
+        byte = ins.byte
+        alu = self._alu(ins.mnemonic, byte)
+        dst = ins.dst
+        if ins.mnemonic == "MOV" and ins.src.mode == REG and ins.src.reg != PC \
+                and dst.mode == REG and dst.reg > CG and not byte:
+            s, d = ins.src.reg, dst.reg      # en sık durum: MOV Rs, Rd
+
+            def mov_rr():
+                regs[PC] = nxt
+                regs[d] = regs[s]
+            return mov_rr
+        src = self._source(ins.src, byte, ins)
+        if ins.mnemonic == "MOV" and dst.mode == REG and dst.reg > CG:
+            d = dst.reg
+
+            def mov_xr():
+                regs[PC] = nxt
+                regs[d] = src()
+            return mov_xr
+        if dst.mode in (REG, CONST):
+            d = dst.reg
+            write = self._reg_writer(d, byte)
+            if d > CG and ins.mnemonic != "MOV":
+                mask = 0xFF if byte else 0xFFFF
+                sm, s = ins.src.mode, ins.src.reg
+                if sm == REG and s != PC and not byte:
+                    def op_rr():
+                        regs[PC] = nxt
+                        r = alu(regs[s], regs[d])
+                        if r is not None:
+                            regs[d] = r
+                    return op_rr
+                if sm in (CONST, IMM):
+                    k = ins.src.value & mask
+
+                    def op_kr():
+                        regs[PC] = nxt
+                        r = alu(k, regs[d] & mask)
+                        if r is not None:
+                            regs[d] = r
+                    return op_kr
+
+                def op_xr():
+                    regs[PC] = nxt
+                    r = alu(src(), regs[d] & mask)
+                    if r is not None:
+                        regs[d] = r
+                return op_xr
+            read = self._source(Operand(REG, d), byte, ins) if d != PC else (lambda: regs[PC])
+
+            def op_reg():
+                regs[PC] = nxt
+                s = src()
+                r = alu(s, read())
+                if r is not None:
+                    write(r)
+            return op_reg
+        rw, ww, rb, wb = self._memory_access()
+        rd, wr = (rb, wb) if byte else (rw, ww)
+        ea = self._address(dst)
+
+        def op_mem():
+            regs[PC] = nxt
+            s = src()
+            a = ea()
+            r = alu(s, rd(a))
+            if r is not None:
+                wr(a, r)
+        return op_mem
+
+    def _format2(self, ins):
+        regs = self.regs
+        nxt = (ins.addr + ins.size) & 0xFFFF
+        name = ins.mnemonic
+        rw, ww, rb, wb = self._memory_access()
+        if name == "NOP":
+            def nop():
+                regs[PC] = nxt
+            return nop
+        if name == "RET":
+            def ret():
+                sp = regs[SP]
+                regs[PC] = rw(sp) & 0xFFFE
+                regs[SP] = (sp + 2) & 0xFFFF
+            return ret
+        if name == "RETI":
+            def reti():
+                sp = regs[SP]
+                regs[SR] = rw(sp)
+                regs[PC] = rw(sp + 2) & 0xFFFE
+                regs[SP] = (sp + 4) & 0xFFFF
+            return reti
+        byte = ins.byte
+        src = self._source(ins.src, byte, ins)
+        if name == "CALL":
+            def call():
+                t = src()
+                sp = (regs[SP] - 2) & 0xFFFF
+                regs[SP] = sp
+                ww(sp, nxt)
+                regs[PC] = t & 0xFFFE
+            return call
+        if name == "PUSH":
+            wr = wb if byte else ww
+
+            def push():
+                regs[PC] = nxt
+                v = src()
+                sp = (regs[SP] - 2) & 0xFFFF
+                regs[SP] = sp
+                wr(sp, v)
+            return push
+
+        mask, sign = (0xFF, 0x80) if byte else (0xFFFF, 0x8000)
+
+        def flags(r, c):
+            sr = regs[SR] & ~FLAGS
+            if r == 0:
+                sr |= Z
+            elif r & sign:
+                sr |= N
+            if c:
+                sr |= C
+            regs[SR] = sr
+            return r
+
+        if name == "RRC":
+            top = sign
+            alu = lambda d: flags((d >> 1) | (top if regs[SR] & C else 0), d & 1)
+        elif name == "RRA":
+            alu = lambda d: flags((d >> 1) | (d & sign), d & 1)
+        elif name == "SWPB":
+            alu = lambda d: ((d & 0xFF) << 8) | (d >> 8)
+        else:  # SXT
+            def alu(d):
+                r = d & 0xFF
+                if r & 0x80:
+                    r |= 0xFF00
+                return flags(r, r)
+        op = ins.src
+        if op.mode in (REG, CONST, IMM):
+            write = self._reg_writer(op.reg, byte) if op.mode == REG else (lambda x: None)
+
+            def op_reg():
+                regs[PC] = nxt
+                write(alu(src()))
+            return op_reg
+        rd, wr = (rb, wb) if byte else (rw, ww)
+        ea = self._address(op)
+
+        def op_mem():
+            regs[PC] = nxt
+            a = ea()
+            wr(a, alu(rd(a)))
+        return op_mem
+
+    def _jump(self, ins):
+        regs = self.regs
+        nxt = (ins.addr + 2) & 0xFFFF
+        tgt = ins.target
+        name = ins.mnemonic
+        cond = {
+            "JNE": lambda sr: not sr & Z, "JEQ": lambda sr: sr & Z,
+            "JNC": lambda sr: not sr & C, "JC": lambda sr: sr & C,
+            "JN": lambda sr: sr & N,
+            "JGE": lambda sr: not (((sr >> 2) ^ (sr >> 8)) & 1),
+            "JL": lambda sr: ((sr >> 2) ^ (sr >> 8)) & 1,
+            "JMP": lambda sr: True,
+        }[name]
+        if tgt == ins.addr:
+            # JMP $ : program bitti (koşullu ise sadece atlandığında)
+            def self_loop():
+                if cond(regs[SR]):
+                    raise Halt("loop")
+                regs[PC] = nxt
+            return self_loop
+        if name == "JMP":
+            def jmp():
+                regs[PC] = tgt
+            return jmp
+        if name == "JEQ":
+            def jeq():
+                regs[PC] = tgt if regs[SR] & Z else nxt
+            return jeq
+        if name == "JNE":
+            def jne():
+                regs[PC] = nxt if regs[SR] & Z else tgt
+            return jne
+
+        def jcc():
+            regs[PC] = tgt if cond(regs[SR]) else nxt
+        return jcc
+
+    # --- çalıştırma ------------------------------------------------------
+
+    def run(self, max_steps=DEFAULT_MAX_STEPS, until=None):
+        """
+        Durana kadar çalıştırır ve sebebi döner: "cpuoff", "loop", "until" ya da
+        "limit". until verilirse o adresteki komut çalıştırılmadan durulur.
+        """
+        regs, cache, hits = self.regs, self.cache, self.hits
+        compile_ = self._compile
+        stop = brk = None
+        if until is not None:
+            stop = self.resolve(until) >> 1
+
+            def halt():
+                raise Halt("until")
+            brk = cache[stop] = (halt, 0)
+        cycles = done = 0
+        reason = "limit"
+        try:
+            for done in range(max_steps):
+                pc = regs[PC]
+                e = cache[pc >> 1]
+                if e is None:
+                    e = cache[pc >> 1] = compile_(pc)
+                e[0]()
+                cycles += e[1]
+                hits[pc >> 1] += 1
+            done = max_steps
+        except Halt as h:
+            reason = h.args[0]
+            if e is not brk:    # durduran komut (JMP $, SR yazması) da çalıştı
+                cycles += e[1]
+                hits[pc >> 1] += 1
+                done += 1
+        finally:
+            if brk is not None and cache[stop] is brk:
+                cache[stop] = None
+        self.instructions += done
+        self.cycles += cycles
+        return reason
+
+    # --- rapor -----------------------------------------------------------
+
+    def where(self, addr):
+        """Adresi 'sembol+ofset' ve varsa kaynak dosya/satır ile açıklar."""
+        names = sorted((a, n) for n, a in self.symbols.items())
+        i = bisect_right(names, (addr, "\uffff")) - 1
+        sym = None
+        if i >= 0:
+            base, name = names[i]
+            sym = name if base == addr else f"{name}+0x{addr - base:X}"
+        src = self.lines.lookup(addr) if self.lines is not None else None
+        return sym, src
+
+    def hot_spots(self, top=20):
+        """En çok çalışan adresler: [(adres, çalışma, cycle, komut)]."""
+        hits = self.hits
+        used = [(hits[i], i) for i in range(len(hits)) if hits[i]]
+        used.sort(reverse=True)
+        out = []
+        for count, i in used[:top]:
+            addr = i << 1
+            e = self.cache[i]
+            ins = self.decode(addr)
+            cyc = e[1] if e is not None else ins.cycles
+            out.append((addr, count, count * cyc, str(ins)))
+        return out
+
+    def line_profile(self):
+        """Kaynak satırı başına çalışma sayısı {"dosya:satır": sayı}; yerleşimden bağımsızdır."""
+        out = {}
+        if self.lines is None:
+            return out
+        hits = self.hits
+        for i in range(len(hits)):
+            if hits[i]:
+                src = self.lines.lookup(i << 1)
+                if src is not None:
+                    key = f"{src[0]}:{src[1]}"
+                    out[key] = out.get(key, 0) + hits[i]
+        return out
+
+    def report(self, reason, top=20, seconds=None):
+        out = {
+            "reason": reason,
+            "instructions": self.instructions,
+            "cycles": self.cycles,
+            "registers": {f"R{i}": self.regs[i] for i in range(16)},
+            "hot_spots": [],
+        }
+        if seconds:
+            out["seconds"] = round(seconds, 3)
+            out["instructions_per_second"] = int(self.instructions / seconds)
+        for addr, count, cycles, text in self.hot_spots(top):
+            sym, src = self.where(addr)
+            out["hot_spots"].append({
+                "address": addr, "count": count, "cycles": cycles, "instruction": text,
+                "symbol": sym, "source": src and f"{src[0]}:{src[1]}"})
+        return out
+
+
+def format_report(rep):
+    lines = [f"Durma sebebi: {rep['reason']}",
+             f"Komut: {rep['instructions']}  Cycle: {rep['cycles']}"]
+    if "seconds" in rep:
+        lines.append(f"Süre: {rep['seconds']} s  ({rep['instructions_per_second']} komut/s)")
+    regs = rep["registers"]
+    for i in range(0, 16, 4):
+        lines.append("  ".join(f"R{j:<2}={regs[f'R{j}']:04X}" for j in range(i, i + 4)))
+    if rep["hot_spots"]:
+        lines.append("")
+        lines.append(f"{'Adres':<6} {'Sayı':>10} {'Cycle':>10}  {'Komut':<22} Sembol / Kaynak")
+        for h in rep["hot_spots"]:
+            where = " ".join(x for x in (h["symbol"], h["source"]) if x)
+            lines.append(f"{h['address']:04X}   {h['count']:>10} {h['cycles']:>10}  "
+                         f"{h['instruction']:<22} {where}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="MSP430 simülatörü")
+    ap.add_argument("image", help="linklenmiş obj (final.obj) ya da .bin")
+    ap.add_argument("--base", default="0", help=".bin yükleme adresi")
+    ap.add_argument("--entry", help="başlangıç adresi ya da sembolü")
+    ap.add_argument("--until", help="bu adres/sembole gelince dur")
+    ap.add_argument("--max-steps", type=int, default=DEFAULT_MAX_STEPS)
+    ap.add_argument("--top", type=int, default=20, help="gösterilecek sıcak nokta sayısı")
+    ap.add_argument("--strict", action="store_true", help="standart MSP430 kodlaması")
+    ap.add_argument("--json", action="store_true")
+    ap.add_argument("--profile", help="satır başına çalışma sayılarını yaz (link --order-calls için)")
+    args = ap.parse_args(argv)
+
+    try:
+        sim = Simulator.from_file(args.image, int(args.base, 0), compat=not args.strict)
+        if args.entry:
+            sim.reset(sim.resolve(args.entry))
+        t = time.perf_counter()
+        reason = sim.run(args.max_steps, args.until)
+        rep = sim.report(reason, args.top, time.perf_counter() - t)
+        if args.profile:
+            with open(args.profile, "w") as f:
+                json.dump({"image": args.image, "lines": sim.line_profile()}, f, indent=1)
+    except Exception as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(rep, indent=2) if args.json else format_report(rep))
+    return 0 if reason != "limit" else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,11 @@
+"""
+İstemci ve daemon'un ortak socket ayarı. Sadece standart kütüphaneyi kullanır;
+istemci bunu içe aktarırken assembler, tkinter ve asyncio yüklenmez.
+"""
+import os
+import tempfile
+
+# istemci ve sunucunun ortak varsayılan socket yolu
+DEFAULT_SOCKET = os.environ.get(
+    "MSP430_DAEMON_SOCKET",
+    os.path.join(tempfile.gettempdir(), f"msp430asm-{os.getuid()}.sock"))
@@ -0,0 +1,627 @@
+"""
+MSP430 assembler arayüzü (Tkinter): satır numaralı editör, sanal tablolar ve
+derleme/link/xref ekranı. Assembler ve linker msp430_assembler'dadır; onu
+import eden araçlar (CLI, daemon, LSP, simülatör) tkinter gerektirmez.
+
+    python msp430_ui.py
+"""
+import codecs
+import os
+import queue
+import re
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk, scrolledtext, filedialog, messagebox
+
+from msp430_assembler import (MSP430Assembler, LinkEditor, ObjArchive, XrefIndex, XREF_DIR,
+                              clean_source, write_listing, write_object)
+
+# editöre dosya yükleme: okuma parçası, after() başına eklenen parça sayısı ve
+# yükleme sonrası bir seferde renklendirilen satır sayısı
+LOAD_CHUNK_BYTES = 128 * 1024
+LOAD_CHUNKS_PER_TICK = 4
+HIGHLIGHT_BATCH_LINES = 2000
+
+
+def read_text_chunks(path, cancel=None, chunk_bytes=LOAD_CHUNK_BYTES):
+    """
+    Dosyayı chunk_bytes'lık parçalar halinde okur: (metin, okunan byte, son mu).
+    Parçalar satır sınırında kesilir, UTF-8 karakterleri bölünmez; cancel
+    (threading.Event) set edilince okuma durur.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    tail = ""
+    with open(path, "rb") as f:
+        while cancel is None or not cancel.is_set():
+            raw = f.read(chunk_bytes)
+            text = tail + decoder.decode(raw, final=not raw)
+            if not raw:
+                yield text, f.tell(), True
+                return
+            cut = text.rfind("\n") + 1
+            tail = text[cut:]
+            if cut:
+                yield text[:cut], f.tell(), False
+
+
+class LineNumberedText(tk.Frame):
+    def __init__(self, parent, *args, **kwargs):
+        tk.Frame.__init__(self, parent)
+        self.text = scrolledtext.ScrolledText(self, *args, **kwargs)
+        self.linenumbers = tk.Canvas(self, width=30, bg='#f0f0f0')
+        
+        self.linenumbers.pack(side=tk.LEFT, fill=tk.Y)
+        self.text.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+
+        self.text.tag_config('label',     foreground='#499C81')
+        self.text.tag_config('directive', foreground='#FF8800')
+        self.text.tag_config('opcode',    foreground='blue')
+        self.text.tag_config('operand1',  foreground='green')
+        self.text.tag_config('operand2',  foreground='purple')
+        self.text.tag_config('error',     foreground='red')
+        
+        for seq in ('<KeyRelease>', '<ButtonRelease-1>', '<MouseWheel>'):
+            self.text.bind(seq, lambda e: self._on_text_change())
+
+        self.suspended = False
+        self._highlight_job = None
+
+        self.text.config(yscrollcommand=self.on_text_scroll)
+        self.textscroll = self.text.vbar
+        
+        self.update_line_numbers()
+
+    def on_text_scroll(self, *args):
+        self.textscroll.set(*args)
+        if not self.suspended:
+            self.update_line_numbers()
+
+    def _on_text_change(self):
+        if self.suspended:
+            return
+        self.update_line_numbers()
+        self._highlight_syntax()
+
+    def suspend(self):
+        """Büyük yüklemeler sırasında renklendirme ve satır numarası çizimini durdurur."""
+        self.suspended = True
+        self._highlight_job = None
+
+    def resume(self, on_done=None):
+        """
+        Renklendirmeyi tekrar açar. Belge HIGHLIGHT_BATCH_LINES'lık parçalar
+        halinde after() ile renklendirilir, arayüz bu sırada donmaz.
+        """
+        self.suspended = False
+        self.update_line_numbers()
+        job = self._highlight_job = object()
+        total = int(self.text.index('end-1c').split('.')[0])
+
+        def step(first):
+            if self._highlight_job is not job or self.suspended:
+                return      # yeni bir yükleme başladı
+            last = min(first + HIGHLIGHT_BATCH_LINES, total + 1)
+            self._highlight_rows(first, last)
+            if last <= total:
+                self.text.after(1, step, last)
+            elif on_done:
+                on_done()
+        step(1)
+
+    def _highlight_syntax(self):
+        for tag in ('label','directive','opcode','operand1','operand2','error'):
+            self.text.tag_remove(tag, '1.0', tk.END)
+        self._highlight_rows(1, None)
+
+    def _highlight_rows(self, first, last):
+        # [first, last) satırlarını renklendirir, last None ise belge sonuna kadar
+        end = f"{last}.0" if last else tk.END
+        lines = self.text.get(f"{first}.0", end).splitlines()
+        if last:
+            for tag in ('label','directive','opcode','operand1','operand2','error'):
+                self.text.tag_remove(tag, f"{first}.0", end)
+
+        asm = MSP430Assembler()
+
+        for row, line in enumerate(lines, start=first):
+            raw = line
+            m_label = re.match(r"\s*([A-Za-z_]\w*):", raw)
+            if m_label:
+                start, end = m_label.start(1), m_label.end(1)
+                self.text.tag_add('label', f"{row}.{start}", f"{row}.{end}")
+                offset = m_label.end()
+            else:
+                offset = 0
+
+            rest = raw[offset:]
+            if rest.lstrip().startswith(';'):
+                continue
+
+            m_dir = re.match(r"\s*(\.(?:word|byte|space|incbin|text|data|bss|org|end|def|ref))", rest, re.IGNORECASE)
+            if m_dir:
+                ds, de = m_dir.start(1)+offset, m_dir.end(1)+offset
+                self.text.tag_add('directive', f"{row}.{ds}", f"{row}.{de}")
+                continue
+
+            m_ins = re.match(
+                r"\s*(\w+(?:\.\w+)?)(?:\s+([^,\s]+))?"
+                r"(?:\s*,\s*([^,\s]+))?", rest
+            )
+            if not m_ins:
+                continue
+
+            op, opd1, opd2 = m_ins.group(1), m_ins.group(2), m_ins.group(3)
+            os_, oe = m_ins.start(1)+offset, m_ins.end(1)+offset
+
+            if op.upper() in asm.instructions:
+                self.text.tag_add('opcode', f"{row}.{os_}", f"{row}.{oe}")
+            else:
+                self.text.tag_add('error', f"{row}.{os_}", f"{row}.{oe}")
+
+            if opd1:
+                s1, e1 = m_ins.start(2)+offset, m_ins.end(2)+offset
+                self.text.tag_add('operand1', f"{row}.{s1}", f"{row}.{e1}")
+            if opd2:
+                s2, e2 = m_ins.start(3)+offset, m_ins.end(3)+offset
+                self.text.tag_add('operand2', f"{row}.{s2}", f"{row}.{e2}")
+
+    def update_line_numbers(self):
+        self.linenumbers.delete("all")
+        i = self.text.index("@0,0")
+        while True:
+            dline = self.text.dlineinfo(i)
+            if dline is None:
+                break
+            y = dline[1]
+            linenum = str(i).split(".")[0]
+            self.linenumbers.create_text(
+                15, y, anchor="n",
+                text=linenum,
+                font=self.text.cget("font")
+            )
+            i = self.text.index(f"{i}+1line")
+
+
+class VirtualTable(tk.Frame):
+    """
+    Büyük tablolar için ttk.Treeview sarmalayıcısı. Satırlar Python listesinde
+    tutulur, Treeview'da sadece görünen pencere kadar (+1) satır bulunur;
+    kaydırma bu pencereyi kaydırır. Güncellemelerde sadece değeri değişen
+    satırlar için Tcl çağrısı yapılır.
+    """
+    def __init__(self, parent, columns, height=10, **kwargs):
+        tk.Frame.__init__(self, parent)
+        self.tree = ttk.Treeview(self, columns=[c for c, _ in columns], show="headings",
+                                 height=height, **kwargs)
+        for col, title in columns:
+            self.tree.heading(col, text=title)
+        self.scroll = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._yview)
+        self.scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.rows = []
+        self.first = 0          # penceredeki ilk satırın indeksi
+        self.window = height    # Treeview'da tutulan satır sayısı
+        self.selected_index = None
+        self._shown = []        # slot -> gösterilen değerler
+        rowheight = ttk.Style().lookup("Treeview", "rowheight")
+        self._rowheight = int(rowheight) if rowheight else 20
+
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<MouseWheel>", lambda e: self._scroll(-1 if e.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda e: self._scroll(-1))
+        self.tree.bind("<Button-5>", lambda e: self._scroll(1))
+        self.tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+
+    def bind(self, sequence=None, func=None, add="+"):
+        # seçim gibi olaylar Treeview'dan gelir; varsayılan ekleme, _on_select bağlı kalmalı
+        return self.tree.bind(sequence, func, add)
+
+    def set_rows(self, rows):
+        """Tüm satırları değiştirir; ekranda sadece farklı olan slotlar güncellenir."""
+        self.rows = [tuple(r) for r in rows]
+        if self.selected_index is not None and self.selected_index >= len(self.rows):
+            self.selected_index = None
+        self.first = max(0, min(self.first, len(self.rows) - self.window))
+        self._render()
+
+    def selected(self):
+        """Seçili satırın değerleri ya da None."""
+        if self.selected_index is None:
+            return None
+        return self.rows[self.selected_index]
+
+    def _render(self):
+        tree = self.tree
+        for slot in range(max(self.window + 1, len(self._shown))):
+            idx = self.first + slot
+            vals = self.rows[idx] if slot <= self.window and idx < len(self.rows) else None
+            old = self._shown[slot] if slot < len(self._shown) else None
+            if vals == old:
+                continue
+            iid = f"s{slot}"
+            if vals is None:
+                tree.delete(iid)
+            elif old is None:
+                tree.insert("", slot, iid=iid, values=vals)
+            else:
+                tree.item(iid, values=vals)
+            if slot < len(self._shown):
+                self._shown[slot] = vals
+            else:
+                self._shown.append(vals)
+        while self._shown and self._shown[-1] is None:
+            self._shown.pop()
+
+        want = ()
+        if self.selected_index is not None and 0 <= self.selected_index - self.first < len(self._shown):
+            want = (f"s{self.selected_index - self.first}",)
+        if tuple(tree.selection()) != want:
+            tree.selection_set(want)
+
+        total = len(self.rows)
+        if total <= self.window:
+            self.scroll.set(0, 1)
+        else:
+            self.scroll.set(self.first / total, (self.first + self.window) / total)
+
+    def _scroll(self, delta):
+        self._move_to(self.first + delta)
+        return "break"
+
+    def _move_to(self, first):
+        first = max(0, min(first, len(self.rows) - self.window))
+        if first != self.first:
+            self.first = first
+            self._render()
+
+    def _yview(self, *args):
+        if args[0] == "moveto":
+            self._move_to(int(float(args[1]) * len(self.rows)))
+        elif args[0] == "scroll":
+            step = int(args[1]) * (self.window if args[2] == "pages" else 1)
+            self._move_to(self.first + step)
+
+    def _on_configure(self, event):
+        # başlık satırı da bir satır yüksekliğinde
+        window = max(1, event.height // self._rowheight - 1)
+        if window != self.window:
+            self.window = window
+            self.first = max(0, min(self.first, len(self.rows) - self.window))
+            self._render()
+
+    def _on_select(self, event):
+        sel = self.tree.selection()
+        if sel:
+            self.selected_index = self.first + int(sel[0][1:])
+
+
+class MSP430AssemblerUI:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("MSP430 Assembler")
+        self.root.geometry("1600x800")
+        self.source_path = None  # en son açılan .asm dosyası
+        self._load_cancel = None # sürmekte olan dosya yüklemesi
+        
+        self.main_frame = tk.Frame(root)
+        self.main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        self.title_label = tk.Label(self.main_frame, text="MSP430 Assembler", font=("Arial",16,"bold"))
+        self.title_label.pack(pady=5)
+        
+        self.split_frame = tk.PanedWindow(self.main_frame, orient=tk.HORIZONTAL, sashrelief=tk.RAISED, sashwidth=4, height=300)
+        self.split_frame.pack(fill=tk.BOTH, expand=True, pady=2)
+        
+        self.left_frame = tk.LabelFrame(self.split_frame, text="Assembler Kodu", font=("Arial",10,"bold"), height=300)
+        self.right_frame= tk.LabelFrame(self.split_frame, text="Dönüştürülmüş Kod", font=("Arial",10,"bold"), height=300)
+        self.split_frame.add(self.left_frame); self.split_frame.add(self.right_frame)
+        
+        self.code_text   = LineNumberedText(self.left_frame, wrap=tk.WORD, font=("Courier New",12))
+        self.code_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
+        self.result_text = scrolledtext.ScrolledText(self.right_frame, wrap=tk.WORD, font=("Courier New",12))
+        self.result_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
+        
+        self.bottom_frame = tk.Frame(self.main_frame)
+        self.bottom_frame.pack(fill=tk.BOTH, expand=True, pady=2)
+
+        self.add_example_code()
+
+        # Semboller Tablosu
+        self.symbols_frame = tk.LabelFrame(self.bottom_frame, text="Semboller", font=("Arial",10,"bold"))
+        self.symbols_frame.pack(fill=tk.BOTH, expand=True, side=tk.LEFT, padx=1, pady=1)
+        self.symbols_table = VirtualTable(self.symbols_frame, (("label","Sembol"),("section","Section"),("address","Adres")))
+        self.symbols_table.pack(fill=tk.BOTH, expand=True)
+
+        # Exports (.def) Tablosu
+        self.exports_table = VirtualTable(self.symbols_frame, (("symbol","Export Symbol (def)"),("address","Address")), height=4)
+        self.exports_table.pack(fill=tk.BOTH, expand=True, pady=(5,0))
+
+        # import (.ref) Tablosu
+        self.import_table = VirtualTable(self.symbols_frame, (("symbol","Import Symbol (ref)"),("address","Address")), height=4)
+        self.import_table.pack(fill=tk.BOTH, expand=True, pady=(5,0))
+
+
+        # Section Tablosu
+        self.sections_frame = tk.LabelFrame(self.bottom_frame, text="Section Bilgileri", font=("Arial",10,"bold"))
+        self.sections_frame.pack(fill=tk.BOTH, expand=True, side=tk.RIGHT, padx=1, pady=1)
+        self.sections_table = VirtualTable(self.sections_frame, (("section","Section"),("start","Başlangıç Adresi"),("size","Boyut")))
+        self.sections_table.pack(fill=tk.BOTH, expand=True)
+
+        # ───── Detay Görünümü ─────
+        self.details_frame = tk.LabelFrame(self.bottom_frame, text="Section Details", font=("Arial",10,"bold"))
+        self.details_frame.pack(fill=tk.BOTH, expand=True, side=tk.BOTTOM, padx=1, pady=1)
+
+        self.syms_detail = VirtualTable(self.details_frame, (("symbol","Symbol"),("address","Address")), height=5)
+        self.syms_detail.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
+
+        self.refs_detail = VirtualTable(self.details_frame, (("symbol","Referenced Symbol"),("line","Line No")), height=5)
+        self.refs_detail.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
+
+        # proje geneli sembol arama (temp/xref/)
+        self.xref_frame = tk.Frame(self.details_frame)
+        self.xref_frame.pack(fill=tk.X, padx=5, pady=(4,0))
+        self.xref_entry = tk.Entry(self.xref_frame)
+        self.xref_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.xref_entry.bind("<Return>", lambda e: self.search_xref())
+        self.xref_button = tk.Button(self.xref_frame, text="Sembol Ara", command=self.search_xref)
+        self.xref_button.pack(side=tk.RIGHT, padx=(5,0))
+        self.xref_results = VirtualTable(self.details_frame, (("kind","Tür"),("file","Dosya"),("line","Satır"),("address","Adres")), height=5)
+        self.xref_results.pack(fill=tk.BOTH, expand=True, padx=5, pady=2)
+        # ────────────────
+
+        # Buton Çerçevesi
+        self.button_frame = tk.Frame(self.main_frame)
+        self.button_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=1)
+
+        self.load_button   = tk.Button(self.button_frame, text="Dosya Aç", command=self.load_file, bg="#007bff", fg="white")
+        self.load_button.pack(side=tk.LEFT, padx=5)
+        self.save_button   = tk.Button(self.button_frame, text="Kaydet", command=self.save_file, bg="#ffc107", fg="black")
+        self.save_button.pack(side=tk.LEFT, padx=5)
+        self.clear_button  = tk.Button(self.button_frame, text="Temizle",command=self.clear_all, bg="#dc3545", fg="white")
+        self.clear_button.pack(side=tk.RIGHT, padx=5)
+        self.convert_button= tk.Button(self.button_frame, text="Kodu Çevir",command=self.convert_code,bg="#28a745",fg="white")
+        self.convert_button.pack(side=tk.RIGHT, padx=5)
+        self.link_button= tk.Button(self.button_frame, text="Modülleri Link Et", command=self.link_modules, bg="#17a2b8",fg="white")
+        self.link_button.pack(side=tk.RIGHT, padx=5)
+        self.archive_button= tk.Button(self.button_frame, text="Arşiv Oluştur", command=self.create_archive, bg="#6f42c1",fg="white")
+        self.archive_button.pack(side=tk.RIGHT, padx=5)
+
+        # Durum Çubuğu
+        self.status_bar = tk.Label(root, text="Hazır", bd=1, relief=tk.SUNKEN, anchor=tk.W)
+        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+
+        # Bölüm seçimi için event
+        self.sections_table.bind("<<TreeviewSelect>>", self.on_section_select)
+
+    def add_example_code(self):
+        example_code = """;MSP430 Assembly Example Code
+; --- Tanımlar ---
+.def  start, equal_label, end
+.ref  external_func, extern_var
+
+; --- .data bölümünde veri ---
+.data
+val1:   .word 0x1234
+val2:   .byte 0xA
+
+; --- .bss bölümünde sıfırdan başlatılmış alan ---
+.bss
+temp:   .space 2
+
+; --- .text bölümünde kod ---
+.text
+start:  MOV.W #0x1234, R4      ; R4 = 0x1234
+        MOV.W #0x4567, R5         ; R5 = 0x4567
+        MOV.W #0x89AB, R6         ; R6 = 0x89AB
+        CALL external_func    ; dışarıdan gelen fonksiyonu çağır
+        ADD R5, R4           ; R4 = R4 + R5
+        MOV     extern_var, R5      ; extern_var değişkenine R5'i ata
+        SUB R6, R4           ; R4 = R4 - R6
+        CMP R4, R5             ; R4 ve R5'i karşılaştır
+        JEQ equal_label        ; Eğer eşitse 'equal_label'e atla
+        JMP not_equal_label    ; Değilse 'not_equal_label'e atla
+equal_label:
+        MOV R4, R7             ; R7 = R4
+        JMP end
+not_equal_label:
+        MOV R5, R7             ; R7 = R5
+end:    NOP
+"""
+        self.code_text.text.insert(tk.END, example_code)
+
+    def load_file(self):
+        path = filedialog.askopenfilename(filetypes=[("Assembly Dosyaları","*.asm")])
+        if path:
+            self.start_load(path)
+
+    def start_load(self, path):
+        """
+        Dosyayı arka plandaki bir thread'de LOAD_CHUNK_BYTES'lık parçalar
+        halinde okur; parçalar ana thread'de after() ile editöre eklenir.
+        Yükleme bitene kadar renklendirme kapalıdır, ilerleme status bar'da
+        gösterilir. Yükleme sürerken yeni bir dosya açılırsa eskisi bırakılır.
+        """
+        total = os.path.getsize(path)
+        chunks = queue.Queue()
+        cancel = threading.Event()
+        if self._load_cancel:
+            self._load_cancel.set()
+        self._load_cancel = cancel
+
+        def reader():
+            try:
+                for item in read_text_chunks(path, cancel):
+                    chunks.put(item)
+            except Exception as e:
+                chunks.put(e)
+
+        editor = self.code_text
+        editor.suspend()
+        editor.text.delete("1.0", tk.END)
+        self.source_path = None
+        threading.Thread(target=reader, daemon=True).start()
+        name = os.path.basename(path)
+
+        def pump():
+            if cancel.is_set():
+                return
+            for _ in range(LOAD_CHUNKS_PER_TICK):
+                try:
+                    item = chunks.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, Exception):
+                    editor.resume()
+                    self.status_bar.config(text=f"Yükleme hatası: {item}")
+                    messagebox.showerror("Hata", f"Dosya okunamadı:\n{item}")
+                    return
+                text, done, last = item
+                editor.text.insert(tk.END, text)
+                if last:
+                    self.source_path = path
+                    self._load_cancel = None
+                    self.status_bar.config(text=f"{name} yüklendi, renklendiriliyor...")
+                    editor.resume(lambda: self.status_bar.config(
+                        text=f"Yüklendi: {path} ({total} bayt)"))
+                    return
+                self.status_bar.config(
+                    text=f"{name} yükleniyor... %{done * 100 // max(total, 1)}")
+            self.root.after(1, pump)
+        self.root.after(1, pump)
+
+    def save_file(self):
+        try:
+            path = filedialog.asksaveasfilename(defaultextension=".asm",
+                                                filetypes=[("Assembly Dosyaları","*.asm"),("Tüm Dosyalar","*.*")])
+            if path:
+                asm_code = self.code_text.text.get("1.0",tk.END)
+                mc_code  = self.result_text.get("1.0",tk.END)
+                with open(path,'w') as f:
+                    f.write("; Assembly Code\n"+asm_code+"\n; Machine Code\n"+mc_code)
+                self.status_bar.config(text=f"Dosya kaydedildi: {path}")
+                messagebox.showinfo("Başarılı","Dosya kaydedildi!")
+        except Exception as e:
+            messagebox.showerror("Hata",str(e))
+    
+    def link_modules(self):
+        try:
+            linker = LinkEditor("temp")
+            linker.link()
+            out = "temp/final.obj"
+            map_out = "temp/final.map"
+            linker.write(out, map_out)
+            messagebox.showinfo("Link Başarılı", f"Final obj oluşturuldu:\n{out}\nMap dosyası:\n{map_out}")
+        except Exception as e:
+            messagebox.showerror("Link Hatası", str(e))
+
+
+    def create_archive(self):
+        objs = filedialog.askopenfilenames(initialdir="temp", filetypes=[("OBJ Dosyaları","*.obj")])
+        if not objs:
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".lib", filetypes=[("Kütüphane Arşivi","*.lib")])
+        if not path:
+            return
+        try:
+            ObjArchive.create(path, objs)
+            self.status_bar.config(text=f"Arşiv oluşturuldu: {path} ({len(objs)} modül)")
+        except Exception as e:
+            messagebox.showerror("Arşiv Hatası", str(e))
+
+    def clear_all(self):
+        if messagebox.askyesno("Onay","Tüm alanları temizlemek istediğinize emin misiniz?"):
+            self.code_text.text.delete("1.0",tk.END)
+            self.result_text.delete("1.0",tk.END)
+            self.symbols_table.set_rows([])
+            self.sections_table.set_rows([])
+            self.status_bar.config(text="Temizlendi")
+
+    def convert_code(self):
+        raw_lines = self.code_text.text.get("1.0", tk.END).splitlines()
+        if not raw_lines:
+            messagebox.showwarning("Uyarı","Assembler kodu girin")
+            return
+
+        cleaned, mapping = clean_source(raw_lines)  # yorumlar temizlenmiş satırlar
+
+        asm=MSP430Assembler()
+        asm.source_file = self.source_path or "<editör>"
+        if self.source_path:
+            asm.base_dir = os.path.dirname(self.source_path)
+        try:
+            labels, sections = asm.pass1(cleaned, mapping)
+            # detayları sakla
+            self.last_sections = sections
+            # sembol tablosu
+            self.symbols_table.set_rows((lbl,sym.section,f"{sym.address:04X}") for lbl,sym in labels.items())
+            # exports (.def)
+            self.exports_table.set_rows((sym, "None" if addr is None else f"{addr:04X}")
+                                        for sym, addr in asm.exports.items())
+
+            # imports (.ref)
+            self.import_table.set_rows((sym, addr or "-") for sym, addr in asm.imports.items())
+            
+            # section tablosu
+            self.sections_table.set_rows((sec,f"{info.start:04X}",f"{info.size} byte") for sec,info in sections.items())
+            self.status_bar.config(text=f"PASS1: {len(labels)} sembol, {len(sections)} section")
+        except Exception as e:
+            messagebox.showerror("Hata",f"PASS1: {e}")
+            return
+
+        try:
+            data_codes, text_codes, bss_codes = asm.pass2(cleaned, workers=1)
+        except Exception as e:
+            messagebox.showerror("Hata",f"PASS2: {e}")
+            return
+        # listing bir kez üretilir, panele tek insert ile basılır
+        listing = "".join(asm.iter_listing(raw_lines))
+        self.result_text.delete("1.0",tk.END)
+        self.result_text.insert("1.0", listing)
+        self.status_bar.config(text="PASS2 tamamlandı")
+        try:
+            # temp/ klasörünü oluştur
+            os.makedirs("temp", exist_ok=True)
+            # dosya adı olarak timestamp veya sabit bir isim kullanabilirsiniz
+            uniq = int(time.time() * 1000)
+            obj_path = os.path.join("temp", f"module_{uniq}.obj")
+            module = asm.to_module(os.path.basename(obj_path), data_codes, text_codes, bss_codes)
+            try:
+                write_object(obj_path, module)
+            finally:
+                module.close()
+            write_listing(os.path.splitext(obj_path)[0] + ".lst", [listing])
+            source = self.source_path or "<editör>"
+            XrefIndex.update_file("temp", source, source, module.labels, module.sections)
+            self.status_bar.config(text=f"PASS2 tamamlandı • Obj yazıldı: {obj_path}")
+        except Exception as e:
+            messagebox.showwarning("Uyarı", f"Obj dosyası yazılamadı: {e}")
+
+    def search_xref(self):
+        sym = self.xref_entry.get().strip()
+        if not sym:
+            return
+        idx = XrefIndex.load(os.path.join("temp", XREF_DIR))
+        defs, refs = idx.definitions(sym), idx.references(sym)
+        self.xref_results.set_rows(
+            [(f"tanım {sec}", os.path.basename(f), ln, f"{addr:04X}") for f, ln, addr, sec in defs] +
+            [("referans", os.path.basename(f), ln, f"{addr:04X}") for f, ln, addr in refs])
+        self.status_bar.config(text=f"{sym}: {len(defs)} tanım, {len(refs)} referans")
+
+    def on_section_select(self, event):
+        row = self.sections_table.selected()
+        if not row: return
+        data = getattr(self, 'last_sections', {}).get(row[0])
+        self.syms_detail.set_rows((sym,f"{addr:04X}") for sym, addr in (data.symbols.items() if data else ()))
+        self.refs_detail.set_rows((sym,ln) for sym, ln, _ in (data.references if data else ()))
+
+
+def main():
+    root = tk.Tk()
+    app = MSP430AssemblerUI(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Kaynak klasörünü izleyip değişen modülleri yeniden derleyen, linkleyen ve
+.bin üreten izleme modu.
+
+Klasör belirli aralıklarla taranır (mtime + boyut); bir değişiklik görülünce
+kaydetme patlamaları bitene kadar kısa bir süre beklenir (debounce). Sadece
+değişen .asm dosyaları derlenir; link, okunmuş obj'leri bellekte tutan
+BuildState ile yapılır, değişmeyen modüller tekrar okunmaz. Modüllerin
+boyutları değişmedikçe önceki yerleşim korunur, sadece değişen modüller
+imaja yazılıp yamanır; boyut değişince baştan link edilir. Her turda
+aşamaların süresi ve kaydetmeden yeni imaja kadar geçen süre yazılır.
+
+    python msp430_watch.py src/ [-o temp/] [--bin temp/final.bin] [--once]
+    python msp430_cli.py watch src/ ...
+"""
+import argparse
+import os
+import sys
+import time
+
+from msp430_daemon import BuildState, handle_request
+
+ASM_SUFFIXES = (".asm", ".s", ".s43")
+POLL_INTERVAL = 0.1     # saniye
+DEBOUNCE = 0.15         # son değişiklikten sonra beklenen süre
+
+
+def scan_sources(src_dir):
+    """Kaynak ağacındaki .asm dosyaları: {yol: (mtime_ns, boyut)}."""
+    out = {}
+    stack = [src_dir]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for e in it:
+                if e.is_dir():
+                    if not e.name.startswith("."):
+                        stack.append(e.path)
+                elif e.name.lower().endswith(ASM_SUFFIXES):
+                    st = e.stat()
+                    out[e.path] = (st.st_mtime_ns, st.st_size)
+    return out
+
+
+class Watcher:
+    def __init__(self, src_dir, obj_dir="temp", bin_path=None, output=None,
+                 interval=POLL_INTERVAL, debounce=DEBOUNCE, log=print):
+        self.src_dir = os.path.abspath(src_dir)
+        self.obj_dir = os.path.abspath(obj_dir)
+        self.output = os.path.abspath(output or os.path.join(self.obj_dir, "final.obj"))
+        self.bin_path = os.path.abspath(bin_path or os.path.splitext(self.output)[0] + ".bin")
+        self.interval = interval
+        self.debounce = debounce
+        self.log = log
+        self.state = BuildState()
+        self.known = {}          # yol -> (mtime_ns, boyut), son derlenen (ya da denenen) hal
+        self.failed = set()      # derlenemeyen kaynaklar; değişene kadar tekrar denenmez
+
+    def obj_path(self, src):
+        # aynı isimli dosyalar farklı klasörlerde olabilir, göreli yol obj adına katılır
+        rel = os.path.splitext(os.path.relpath(src, self.src_dir))[0]
+        return os.path.join(self.obj_dir, rel.replace(os.sep, "__") + ".obj")
+
+    def initial(self):
+        """İlk tur: obj'si olmayan ya da kaynaktan eski olan dosyalar derlenir."""
+        os.makedirs(self.obj_dir, exist_ok=True)
+        current = scan_sources(self.src_dir)
+        stale = [p for p, (mtime, _) in current.items()
+                 if not os.path.exists(self.obj_path(p))
+                 or os.stat(self.obj_path(p)).st_mtime_ns < mtime]
+        if stale or not os.path.exists(self.output):
+            self.build(stale, [], current)
+        else:
+            self.known = current
+
+    def poll(self):
+        """Değişen ve silinen kaynaklar; değişiklik yoksa None."""
+        current = scan_sources(self.src_dir)
+        if current == self.known:
+            return None
+        changed = [p for p, sig in current.items() if self.known.get(p) != sig]
+        removed = [p for p in self.known if p not in current]
+        return changed, removed, current
+
+    def wait_quiet(self, found):
+        # debounce: editörler bir kayıtta birkaç yazma yapar, ağaç durulana kadar bekle
+        deadline = time.monotonic() + self.debounce
+        while time.monotonic() < deadline:
+            time.sleep(min(self.interval, self.debounce) / 2)
+            again = self.poll()
+            if again is not None and again[2] != found[2]:
+                found = again
+                deadline = time.monotonic() + self.debounce
+        return found
+
+    def build(self, changed, removed, current, from_poll=False):
+        """
+        changed'i derler, linkler ve .bin üretir. Derlenemeyen dosyaların imzası
+        known'da kalır; değişmeden her turda tekrar derlenmezler ve düzeltilene
+        kadar link yapılmaz. from_poll: tur bir kayıtla tetiklendi (süre raporu için).
+        """
+        t0 = time.perf_counter()
+        saved = None
+        if from_poll:
+            saved = max((current[p][0] for p in changed if p in current), default=None)
+        times = {}
+        errors = []
+        for p in removed:
+            self.failed.discard(p)
+            obj = self.obj_path(p)
+            if os.path.exists(obj):
+                os.unlink(obj)
+        t = time.perf_counter()
+        for p in sorted(changed):
+            try:
+                handle_request(self.state, {"op": "assemble", "path": p, "output": self.obj_path(p)})
+                self.failed.discard(p)
+            except Exception as e:
+                errors.append(f"{os.path.relpath(p, self.src_dir)}: {e}")
+                self.failed.add(p)
+        times["assemble"] = time.perf_counter() - t
+        self.known = current
+        if self.failed:
+            for e in errors:
+                self.log(f"  Hata: {e}")
+            pending = ", ".join(os.path.relpath(p, self.src_dir) for p in sorted(self.failed))
+            self.log(f"  Link atlandı ({pending}), dosya değişince tekrar denenecek")
+            return False
+        try:
+            t = time.perf_counter()
+            res = handle_request(self.state, {"op": "link", "obj_dir": self.obj_dir,
+                                              "output": self.output, "incremental": True})
+            times["link" if res["relinked"] is None else "relink"] = time.perf_counter() - t
+            t = time.perf_counter()
+            handle_request(self.state, {"op": "convert", "obj": self.output, "output": self.bin_path})
+            times["bin"] = time.perf_counter() - t
+        except Exception as e:
+            self.log(f"  Hata: {e}")
+            return False
+        total = time.perf_counter() - t0
+        names = ", ".join(os.path.relpath(p, self.src_dir) for p in sorted(changed + removed)) or "-"
+        line = (f"[{time.strftime('%H:%M:%S')}] {names}: "
+                + " ".join(f"{k} {v * 1000:.0f} ms" for k, v in times.items())
+                + f" | toplam {total * 1000:.0f} ms")
+        if saved is not None:
+            line += f", kayıttan imaja {(time.time_ns() - saved) / 1e6:.0f} ms"
+        self.log(line)
+        return True
+
+    def run(self, once=False):
+        self.log(f"İzleniyor: {self.src_dir} -> {self.bin_path} (Ctrl+C ile çık)")
+        self.initial()
+        if once:
+            return
+        try:
+            while True:
+                found = self.poll()
+                if found is None:
+                    time.sleep(self.interval)
+                    continue
+                changed, removed, current = self.wait_quiet(found)
+                if changed or removed:
+                    self.build(changed, removed, current, from_poll=True)
+                else:
+                    self.known = current
+        except KeyboardInterrupt:
+            pass
+
+
+def add_arguments(ap):
+    ap.add_argument("src_dir", help="izlenecek kaynak klasörü")
+    ap.add_argument("-o", "--obj-dir", default="temp", help="obj klasörü")
+    ap.add_argument("--output", help="linklenmiş çıktı (varsayılan OBJ_DIR/final.obj)")
+    ap.add_argument("--bin", help="binary çıktı (varsayılan final.bin)")
+    ap.add_argument("--interval", type=float, default=POLL_INTERVAL)
+    ap.add_argument("--debounce", type=float, default=DEBOUNCE)
+    ap.add_argument("--once", action="store_true", help="tek tur derle/linkle ve çık")
+
+
+def run_args(args):
+    w = Watcher(args.src_dir, args.obj_dir, args.bin, args.output, args.interval, args.debounce)
+    w.run(args.once)
+    return 0
+
+
+def main(argv=None, prog=None):
+    ap = argparse.ArgumentParser(prog=prog, description="MSP430 izleme modu")
+    add_arguments(ap)
+    return run_args(ap.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,37 +1,57 @@
-import tkinter as tk
-from tkinter import filedialog, messagebox
 import os
 
+# imajda section'lar arasındaki boşluklar silinmiş flash değeriyle doldurulur
+FILL_BYTE = 0xFF
+
 def parse_obj_file(file_path):
+    # [(başlangıç adresi, [word'ler])]; adresi olmayan (linklenmemiş) section
+    # bir öncekinin hemen arkasından gelir
     with open(file_path, 'r') as f:
         lines = f.readlines()
 
-    data = []
+    sections = []
     reading = False
+    end = 0
     for line in lines:
         line = line.strip()
         if line.startswith("SECTION .text") or line.startswith("SECTION .data"):
+            parts = line.split()
+            if sections:
+                end = sections[-1][0] + 2 * len(sections[-1][1])
+            sections.append((int(parts[2], 16) if len(parts) > 2 else end, []))
             reading = True
             continue
         elif line == "EOF":
             break
-        elif line.startswith("SECTION"):
+        elif line.startswith("SECTION") or line in ("SYMBOLS", "LINES"):
             reading = False
             continue
 
         if reading and line.startswith("0x"):
             value = int(line, 16)
-            data.append(value)
+            sections[-1][1].append(value)
 
-    return data
+    return [s for s in sections if s[1]]
 
-def convert_to_bin(obj_path, output_path):
-    data = parse_obj_file(obj_path)
+def convert_to_bin(obj_path, output_path, fill=FILL_BYTE):
+    # imaj en düşük section adresinden başlar, her section kendi adresine yazılır
+    sections = parse_obj_file(obj_path)
+    base = min((addr for addr, _ in sections), default=0)
+    image = bytearray()
+    for addr, words in sorted(sections, key=lambda s: s[0]):
+        offset = addr - base
+        if offset < len(image):
+            raise Exception(f"Section 0x{addr:04X} önceki section ile çakışıyor")
+        image.extend(bytes([fill]) * (offset - len(image)))
+        for word in words:
+            image += word.to_bytes(2, byteorder='little')  # MSP430 = little endian
     with open(output_path, 'wb') as f:
-        for word in data:
-            f.write(word.to_bytes(2, byteorder='little'))  # MSP430 = little endian
+        f.write(image)
+    return base
 
 def select_obj_file():
+    # tkinter sadece arayüzde; convert_to_bin'i kullanan araçlar onsuz çalışır
+    from tkinter import filedialog, messagebox
     filepath = filedialog.askopenfilename(filetypes=[("OBJ Dosyaları", "*.obj")])
     if filepath:
         try:
@@ -42,56 +62,62 @@ def select_obj_file():
             messagebox.showerror("Hata", f"Bir hata oluştu:\n{e}")
 
 # === GUI ===
-root = tk.Tk()
-root.title("📦 OBJ ➜ BIN Dönüştürücü")
-root.geometry("420x200")
-root.configure(bg="#f2f2f2")
+def main():
+    import tkinter as tk
+    root = tk.Tk()
+    root.title("📦 OBJ ➜ BIN Dönüştürücü")
+    root.geometry("420x200")
+    root.configure(bg="#f2f2f2")
+
+    # Başlık
+    title_label = tk.Label(
+        root,
+        text="MSP430 OBJ ➜ BIN Dönüştürücü",
+        font=("Segoe UI", 14, "bold"),
+        fg="#333",
+        bg="#f2f2f2"
+    )
+    title_label.pack(pady=(20, 10))
+
+    # Açıklama
+    desc_label = tk.Label(
+        root,
+        text="Bir .obj dosyası seçin ve .bin dosyasına dönüştürün.",
+        font=("Segoe UI", 10),
+        fg="#555",
+        bg="#f2f2f2",
+        wraplength=360
+    )
+    desc_label.pack()
 
-# Başlık
-title_label = tk.Label(
-    root,
-    text="MSP430 OBJ ➜ BIN Dönüştürücü",
-    font=("Segoe UI", 14, "bold"),
-    fg="#333",
-    bg="#f2f2f2"
-)
-title_label.pack(pady=(20, 10))
+    # Buton
+    button = tk.Button(
+        root,
+        text="📁 OBJ Dosyasını Seç",
+        command=select_obj_file,
+        font=("Segoe UI", 11),
+        bg="#4CAF50",
+        fg="white",
+        activebackground="#45a049",
+        padx=10,
+        pady=5,
+        relief="raised",
+        bd=2
+    )
+    button.pack(pady=20)
 
-# Açıklama
-desc_label = tk.Label(
-    root,
-    text="Bir .obj dosyası seçin ve .bin dosyasına dönüştürün.",
-    font=("Segoe UI", 10),
-    fg="#555",
-    bg="#f2f2f2",
-    wraplength=360
-)
-desc_label.pack()
+    # Footer
+    footer = tk.Label(
+        root,
+        text="obj to bin converter",
+        font=("Segoe UI", 8),
+        fg="#aaa",
+        bg="#f2f2f2"
+    )
+    footer.pack(side="bottom", pady=5)
 
-# Buton
-button = tk.Button(
-    root,
-    text="📁 OBJ Dosyasını Seç",
-    command=select_obj_file,
-    font=("Segoe UI", 11),
-    bg="#4CAF50",
-    fg="white",
-    activebackground="#45a049",
-    padx=10,
-    pady=5,
-    relief="raised",
-    bd=2
-)
-button.pack(pady=20)
+    root.mainloop()
 
-# Footer
-footer = tk.Label(
-    root,
-    text="obj to bin converter",
-    font=("Segoe UI", 8),
-    fg="#aaa",
-    bg="#f2f2f2"
-)
-footer.pack(side="bottom", pady=5)
 
-root.mainloop()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Statik analiz kontrolleri: rutin başına en kötü cycle (çağrılar dahil),
+yığın derinliği ve döngü/özyineleme/extern işaretleri.
+
+    python -m pytest v3/tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from msp430_analysis import LISTING_TITLE, analyze, format_routines  # noqa: E402
+
+# cycle'lar: MOV/CMP/SUB #x 2; ADD Rn,Rm 1; CALL #x 5; RET 3; jump 2
+SOURCE = """\
+.ref ext
+.text
+main:   MOV #3, R4
+        CALL #inner
+        CMP #0, R4
+        JEQ done
+        CALL #leaf
+done:   JMP done
+inner:  CALL #leaf
+        RET
+leaf:   ADD R4, R5
+        RET
+loop:   SUB #1, R4
+        JNE loop
+        RET
+rec:    CALL #rec
+        RET
+far:    CALL ext
+        RET
+"""
+
+
+class AnalysisTest(unittest.TestCase):
+    def setUp(self):
+        self.an, self.asm = analyze(SOURCE, "a.obj")
+        self.routines = {r["label"]: r for r in self.an.routines()}
+
+    def summary(self, label):
+        r = self.routines[label]
+        return r["cycles"], r["stack"], r["calls"], r["flags"]
+
+    def test_worst_case_through_calls(self):
+        self.assertEqual(self.summary("leaf"), (1 + 3, 0, [], []))
+        self.assertEqual(self.summary("inner"), (5 + 4 + 3, 2, ["leaf"], []))
+        # MOV, CALL inner, CMP, JEQ; sonra uzun kol: CALL leaf + JMP $
+        self.assertEqual(self.summary("main"), (2 + 5 + 12 + 2 + 2 + 5 + 4 + 2, 4, ["inner", "leaf"], []))
+
+    def test_flags(self):
+        self.assertEqual(self.summary("loop"), (2 + 2 + 3, 0, [], ["loop"]))
+        self.assertEqual(self.summary("rec"), (5 + 3, 2, ["rec"], ["recursion"]))
+        self.assertEqual(self.summary("far"), (5 + 3, 2, ["ext"], ["extern:ext"]))
+
+    def test_reports(self):
+        self.assertEqual(self.an.call_graph(), {"main": ["inner", "leaf"], "inner": ["leaf"],
+                                                "rec": ["rec"], "far": ["ext"]})
+        table = format_routines(self.an.routines()).splitlines()
+        self.assertEqual(table[1].split(), ["main", "0000", "34", "4", "inner,", "leaf", "|", "-"])
+        rows = list(self.asm.iter_listing(SOURCE.splitlines(), self.an.listing_columns(), LISTING_TITLE))
+        self.assertIn("  2     34c    4B  main:", rows[4])     # MOV #3 2 cycle, rutin 34
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Arşiv (.lib) kontrolleri: üye isimleri boşluk içerebilir, indeks üyeleri
+parse etmeden bulur, linker sadece gereken üyeleri çeker.
+
+    python -m pytest v3/tests
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from msp430_assembler import LinkEditor, ObjArchive, assemble, write_object  # noqa: E402
+
+MAIN = """\
+.def start
+.ref mul2
+.text
+start:  CALL mul2
+        RET
+"""
+
+MATH = """\
+.def mul2
+.text
+mul2:   ADD R4, R4
+        RET
+"""
+
+UTIL = """\
+.def clear
+.text
+clear:  MOV #0, R4
+        RET
+"""
+
+
+class ArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.lib = os.path.join(self.tmp, "lib", "my lib.lib")
+        os.makedirs(os.path.dirname(self.lib))
+        paths = []
+        for name, src in (("math funcs.obj", MATH), ("util  funcs.obj", UTIL)):
+            paths.append(os.path.join(self.tmp, name))
+            write_object(paths[-1], assemble(src, name))
+        ObjArchive.create(self.lib, paths)
+        self.paths = paths
+
+    def test_round_trip_with_spaced_names(self):
+        lib = ObjArchive(self.lib)
+        self.assertEqual([m[0] for m in lib.members], ["math funcs.obj", "util  funcs.obj"])
+        self.assertEqual(lib.index, {"mul2": 0, "clear": 1})
+        for i, path in enumerate(self.paths):
+            with open(path) as f:
+                self.assertEqual(lib.read_member(i), (os.path.basename(path), f.read()))
+
+    def test_linker_pulls_only_needed_members(self):
+        objs = os.path.join(self.tmp, "objs")
+        os.makedirs(objs)
+        write_object(os.path.join(objs, "main.obj"), assemble(MAIN, "main.obj"))
+        ld = LinkEditor(objs, libs=[self.lib])
+        ld.link()
+        self.assertEqual([m.name for m in ld.modules], ["main.obj", "my lib.lib(math funcs.obj)"])
+        self.assertEqual(ld.archives[0].loaded, {0})
+        self.assertEqual(ld.global_text[1], ld.symbols["mul2"])
+
+    def test_duplicate_export(self):
+        dup = os.path.join(self.tmp, "dup.obj")
+        write_object(dup, assemble(MATH, "dup.obj"))
+        with self.assertRaisesRegex(Exception, "Duplicate export mul2"):
+            ObjArchive.create(os.path.join(self.tmp, "bad.lib"), self.paths + [dup])
+
+
+if __name__ == "__main__":
+    unittest.main()
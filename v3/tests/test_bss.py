@@ -0,0 +1,67 @@
+"""
+.bss/.space kontrolleri: sıfır alanlar ZeroFill olarak kalır, obj'ye ZERO
+satırı olarak yazılır ve linker'da komşu modüllerin .bss'leri birleşir.
+
+    python -m pytest v3/tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from msp430_assembler import (LinkEditor, MSP430Assembler, ZeroFill, read_object_file,  # noqa: E402
+                              write_object)
+
+SOURCE = """\
+.text
+        MOV #buf, R4
+        RET
+.data
+tab:    .word 1
+gap:    .space 3
+end:    .byte 7
+.bss
+buf:    .space 4
+flag:   .word 0
+big:    .space 100
+"""
+
+
+class BssTest(unittest.TestCase):
+    def setUp(self):
+        self.asm = MSP430Assembler()
+        self.m = self.asm.assemble(SOURCE, "b.obj")
+
+    def test_zero_fill_descriptors(self):
+        labels = {k: v.address for k, v in self.asm.labels.items()}
+        self.assertEqual(labels, {"tab": 0xC000, "gap": 0xC002, "end": 0xC008,
+                                  "buf": 0xE000, "flag": 0xE008, "big": 0xE00A})
+        self.assertEqual([(z.start, z.length) for z in self.m.bss], [(0, 210)])
+        # .data'daki .space de byte üretmez
+        self.assertEqual([type(c) for c in self.m.data], [bytearray, ZeroFill, bytearray])
+        self.assertEqual(bytes(self.m.data), b"\x01\x00" + bytes(6) + b"\x07")
+
+    def test_object_file_and_link(self):
+        fd, path = tempfile.mkstemp(suffix=".obj")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        write_object(path, self.m)
+        with open(path) as f:
+            text = f.read()
+        self.assertIn("SECTION .bss\nZERO 0x0000 0x00D2\nEXPORTS", text)
+        back = read_object_file(path)
+        self.assertEqual(back.section_size(".bss"), 210)
+
+        ld = LinkEditor(None)
+        ld.add_module(self.m)
+        ld.add_module(back)
+        ld.link()
+        # iki modülün .bss'i art arda, tek ZeroFill
+        self.assertEqual([(z.start, z.length) for z in ld.global_bss], [(0xE000, 420)])
+        self.assertEqual(ld.global_text[4], 0xE0D2)     # ikinci modülün #buf'ı
+
+
+if __name__ == "__main__":
+    unittest.main()
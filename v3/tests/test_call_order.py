@@ -0,0 +1,84 @@
+"""
+order_by_call_graph kontrolleri: relocation ofsetleri komut sırasıdır, byte
+ofsetine satır tablosundan çevrilir; uzun referans azalmıyorsa sıra değişmez.
+
+    python -m pytest v3/tests
+"""
+import os
+import sys
+import unittest
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from msp430_assembler import LinkEditor, ObjectModule, Relocation, Symbol  # noqa: E402
+
+
+def module(name, sizes, exports=(), calls=()):
+    """
+    sizes: komut başına word sayısı. exports: [(sembol, komut sırası)],
+    calls: [(sembol, komut sırası)]. Satır tablosunda komut i, satır i + 1'dir.
+    """
+    m = ObjectModule(name + ".obj")
+    fid = m.lines.file_id(name + ".asm")
+    starts = []
+    for i, n in enumerate(sizes):
+        starts.append(2 * len(m.text))
+        m.lines.add(starts[-1], fid, i + 1)
+        m.text.extend(array('H', [0x4304]) * n)
+    for sym, k in exports:
+        m.exports[sym] = Symbol(sym, ".text", starts[k], k + 1)
+    m.relocations = [Relocation(sym, ".text", k) for sym, k in calls]
+    return m
+
+
+def linker(*modules):
+    ld = LinkEditor(None)
+    for m in modules:
+        ld.add_module(m)
+    return ld
+
+
+class CallOrderTest(unittest.TestCase):
+    def test_mixed_size_offsets(self):
+        # üçüncü komut 2 + 2 word'lük komutlardan sonra: byte 8 (komut sırası * 2 = 4 değil)
+        a = module("a", [2, 2, 1, 1], exports=[("start", 0)], calls=[("far", 2)])
+        b = module("b", [1, 1], exports=[("far", 1)])
+        ld = linker(a, b)
+        self.assertEqual(ld._text_refs(), [(0, 8, 1, 2, 1)])
+        # profil ağırlığı referansın kendi satırından (3) gelir
+        refs = ld._text_refs({"a.asm:3": 10, "a.asm:2": 99})
+        self.assertEqual(refs, [(0, 8, 1, 2, 11)])
+
+    def test_distance_uses_byte_offsets(self):
+        # çağrı 1028. byte'ta, hedef 1030'da; komut sırası * 2 (4) ile 1026 byte uzak görünürdü
+        a = module("a", [1, 513, 1], exports=[("start", 0)], calls=[("f", 2)])
+        b = module("b", [1], exports=[("f", 0)])
+        ld = linker(a, b)
+        refs = ld._text_refs()
+        self.assertEqual(refs[0][1], 1028)
+        self.assertEqual(ld._long_refs(refs, [0, 1]), 0)
+
+    def test_keeps_order_when_nothing_avoided(self):
+        # a -> c kenarı c'yi a'nın yanına çekerdi, ama hiçbir referans uzun değil
+        a = module("a", [1, 1], exports=[("start", 0)], calls=[("cf", 1)])
+        b = module("b", [1], exports=[("bf", 0)])
+        c = module("c", [1], exports=[("cf", 0)])
+        ld = linker(a, b, c)
+        result = ld.order_by_call_graph()
+        self.assertEqual((result["long_before"], result["long_after"], result["avoided"]), (0, 0, 0))
+        self.assertEqual(result["order"], ["a.obj", "b.obj", "c.obj"])
+
+    def test_moves_callee_when_it_avoids_long_refs(self):
+        # b büyük; a -> c çağrısı b'nin üzerinden erişimi aşıyor
+        a = module("a", [1, 1], exports=[("start", 0)], calls=[("cf", 1)])
+        b = module("b", [600], exports=[("bf", 0)])
+        c = module("c", [1], exports=[("cf", 0)])
+        ld = linker(a, b, c)
+        result = ld.order_by_call_graph()
+        self.assertEqual((result["long_before"], result["long_after"]), (1, 0))
+        self.assertEqual(result["order"], ["a.obj", "c.obj", "b.obj"])
+
+
+if __name__ == "__main__":
+    unittest.main()
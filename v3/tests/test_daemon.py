@@ -0,0 +1,82 @@
+"""
+Daemon kontrolleri: çekirdek modüller tkinter yüklemez, socket sadece
+sahibine açık oluşturulur, önbellekte paylaşılan modüller kapatılmaz.
+
+    python -m pytest v3/tests
+"""
+import json
+import os
+import shutil
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+V3 = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, V3)
+
+from msp430_assembler import MSP430Assembler  # noqa: E402
+from msp430_daemon import BuildState, handle_request  # noqa: E402
+
+SOURCE = """\
+.text
+start:  MOV #0x10, R4
+        RET
+"""
+
+
+class ImportTest(unittest.TestCase):
+    def test_core_does_not_import_tkinter(self):
+        code = ("import sys, msp430_assembler, msp430_daemon, msp430_build, obj_to_bin; "
+                "sys.exit('tkinter' in sys.modules)")
+        self.assertEqual(subprocess.run([sys.executable, "-c", code], cwd=V3).returncode, 0)
+
+
+class SocketTest(unittest.TestCase):
+    def test_socket_is_private(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, "d.sock")
+        proc = subprocess.Popen([sys.executable, os.path.join(V3, "msp430_daemon.py"),
+                                 "--socket", path, "--workers", "1"])
+        self.addCleanup(proc.wait, 10)
+        deadline = time.monotonic() + 10
+        while not os.path.exists(path):
+            self.assertLess(time.monotonic(), deadline, "daemon başlamadı")
+            time.sleep(0.05)
+        try:
+            self.assertEqual(stat.S_IMODE(os.stat(path).st_mode) & 0o077, 0)
+        finally:
+            with socket.socket(socket.AF_UNIX) as s:
+                s.connect(path)
+                s.sendall(json.dumps({"id": 1, "op": "shutdown"}).encode() + b"\n")
+                self.assertEqual(json.loads(s.makefile().readline())["result"], "bye")
+
+
+class CacheTest(unittest.TestCase):
+    def test_shared_module_is_not_closed(self):
+        closed = []
+
+        class Tracking(MSP430Assembler):
+            def assemble(self, *args):
+                m = super().assemble(*args)
+                m.data.close = lambda: closed.append(m)   # ObjectModule.close buraya iner
+                return m
+
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        state = BuildState()
+        req = {"op": "assemble", "source": SOURCE, "output": os.path.join(tmp, "m.obj")}
+        self.assertFalse(handle_request(state, req, Tracking)["cached"])
+        self.assertTrue(handle_request(state, req, Tracking)["cached"])
+        self.assertEqual(closed, [])
+        # listing'li derleme önbelleğe girmez, modül isteğe aittir
+        handle_request(state, dict(req, listing=os.path.join(tmp, "m.lst")), Tracking)
+        self.assertEqual(len(closed), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+"""
+.word/.byte değer çözme kontrolleri: sabit genişlikli hex hızlı yolu ve genel
+yol aynı byte'ları üretir, aralık dışı değerler hata verir.
+
+    python -m pytest v3/tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from msp430_assembler import encode_data_values  # noqa: E402
+
+
+class DataValuesTest(unittest.TestCase):
+    def test_words(self):
+        self.assertEqual(encode_data_values("0x1021, 0x8408", 2), b"\x21\x10\x08\x84")
+        self.assertEqual(encode_data_values("1021,8408", 2), b"\x21\x10\x08\x84")
+        self.assertEqual(encode_data_values("1, 0x20", 2), b"\x01\x00\x20\x00")
+
+    def test_bytes(self):
+        self.assertEqual(encode_data_values("0x01, 0xFF", 1), b"\x01\xff")
+        self.assertEqual(encode_data_values("1, 2, 255", 1), b"\x01\x02\xff")
+        self.assertEqual(encode_data_values("0x10, 16,, 3", 1), b"\x10\x10\x03")
+        self.assertEqual(encode_data_values(" ", 1), b"")
+
+    def test_invalid_values(self):
+        with self.assertRaisesRegex(Exception, r"Geçersiz \.byte"):
+            encode_data_values("1, 256", 1)
+        with self.assertRaisesRegex(Exception, r"Geçersiz \.word"):
+            encode_data_values("0x10000", 2)
+        with self.assertRaisesRegex(Exception, r"Geçersiz \.word"):
+            encode_data_values("zz", 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""
+Komut kodlama önbelleği kontrolleri: sadece konumdan bağımsız komutlar
+saklanır, önbellekli ve önbelleksiz derleme aynı modülü üretir, LRU sınırı
+en eski girdiyi atar.
+
+    python -m pytest v3/tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from msp430_assembler import EncodingCache, MSP430Assembler  # noqa: E402
+
+SOURCE = """\
+.ref ext
+.text
+start:  MOV R4, R7
+        MOV R4, R7
+        NOP
+        RET
+        MOV #0x10, R5
+        MOV #start, R5
+        CALL ext
+        CALL #0x20
+        JMP start
+        NOP
+"""
+
+
+def build(source, cache):
+    asm = MSP430Assembler()
+    asm.encoding_cache = cache
+    return asm.assemble(source, "c.obj")
+
+
+class EncodingCacheTest(unittest.TestCase):
+    def test_only_position_independent_lines(self):
+        cache = EncodingCache()
+        build(SOURCE, cache)
+        # label'lı operandlar, extern CALL ve jump'lar önbelleğe girmez; son NOP
+        # isabeti girdiyi en yeni konuma taşır
+        self.assertEqual(list(cache._data), ["MOV R4, R7", "RET", "MOV #0x10, R5", "CALL #0x20", "NOP"])
+        self.assertEqual(cache.stats()["hits"], 2)     # ikinci MOV R4, R7 ve NOP
+
+    def test_same_output_as_uncached(self):
+        cache = EncodingCache()
+        build(SOURCE, cache)
+        cached, plain = build(SOURCE, cache), build(SOURCE, None)
+        self.assertEqual(list(cached.text), list(plain.text))
+        self.assertEqual([(r.symbol, r.offset) for r in cached.relocations],
+                         [(r.symbol, r.offset) for r in plain.relocations])
+
+    def test_register_like_label_disables_cache(self):
+        # "ADD" label'ı hex/register karakterlerinden oluşur, operandlarda geçebilir
+        cache = EncodingCache()
+        build(".text\nADD:    NOP\n        MOV R4, R7\n", cache)
+        self.assertEqual(cache.stats()["entries"], 0)
+        self.assertEqual(cache.stats()["misses"], 0)
+
+    def test_lru_eviction(self):
+        cache = EncodingCache(size=2)
+        cache.put("NOP", (0x0000,))
+        cache.put("RET", (0x1300,))
+        self.assertEqual(cache.get("NOP"), (0x0000,))     # NOP en yeni olur
+        cache.put("MOV R4, R5", (0x4445,))
+        self.assertIsNone(cache.get("RET"))
+        self.assertEqual(cache.stats(), {"entries": 2, "capacity": 2, "hits": 1, "misses": 1,
+                                         "hit_rate": 0.5})
+        cache.clear()
+        self.assertEqual(cache.stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
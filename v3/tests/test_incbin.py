@@ -0,0 +1,66 @@
+"""
+.incbin kontrolleri: küçük dosyalar kopyalanır, büyükleri mmap dilimi olarak
+kopyasız tutulur; offset/uzunluk, sonraki label'ların adresi ve obj çıktısı
+dosyanın byte'larıyla aynıdır.
+
+    python -m pytest v3/tests
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import msp430_assembler  # noqa: E402
+from msp430_assembler import BASE_ADDRS, MSP430Assembler, read_object, write_object  # noqa: E402
+
+BLOB = bytes(range(256)) * 3 + b"\xAA"    # tek sayıda byte
+
+
+class IncbinTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        with open(os.path.join(self.tmp, "blob.bin"), "wb") as f:
+            f.write(BLOB)
+
+    def assemble(self, body):
+        asm = MSP430Assembler()
+        m = asm.assemble(".data\n" + body, "t.obj", self.tmp)
+        self.addCleanup(m.close)
+        return asm, m
+
+    def test_whole_file_and_following_label(self):
+        asm, m = self.assemble('img:    .incbin "blob.bin"\nafter:  .word 0x1234\n')
+        self.assertEqual(bytes(m.data), BLOB + b"\x34\x12")
+        # label'lar pass1'de dosya boyutundan yerleşir, dosya okunmaz
+        self.assertEqual(asm.labels["after"].address, BASE_ADDRS[".data"] + len(BLOB))
+
+    def test_offset_and_length(self):
+        _, m = self.assemble('        .incbin "blob.bin", 0x10, 4\n')
+        self.assertEqual(bytes(m.data), BLOB[0x10:0x14])
+
+    def test_large_file_is_mapped(self):
+        with mock.patch.object(msp430_assembler, "INCBIN_COPY_MAX", 64):
+            _, m = self.assemble('        .incbin "blob.bin", 1\n')
+        self.assertTrue(any(isinstance(c, memoryview) for c in m.data))
+        self.assertEqual(bytes(m.data), BLOB[1:])
+        path = os.path.join(self.tmp, "t.obj")
+        write_object(path, m)
+        with open(path) as f:
+            self.assertEqual(bytes(read_object(f, "t.obj").data), BLOB[1:])
+        m.close()
+        self.assertEqual(m.data.maps, [])
+
+    def test_errors(self):
+        with self.assertRaisesRegex(Exception, "dosya dışında"):
+            self.assemble('        .incbin "blob.bin", 0x300, 2\n')
+        with self.assertRaisesRegex(Exception, "sadece .data"):
+            MSP430Assembler().assemble('.text\n        .incbin "blob.bin"\n', "t.obj", self.tmp)
+
+
+if __name__ == "__main__":
+    unittest.main()
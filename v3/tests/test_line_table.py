@@ -0,0 +1,140 @@
+"""
+Satır tablosu kontrolü: her kayıt, o satırdan üretilmiş bir word'ü (ya da
+data byte'ını) göstermeli; pass1'in satır adresleri (label'lar, listing)
+pass2'nin yazdığı konumlarla aynı olmalı.
+
+    python -m pytest v3/tests
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from array import array
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from msp430_assembler import (BASE_ADDRS, LinkEditor, MSP430Assembler,  # noqa: E402
+                              read_line_table, write_object)
+
+EXAMPLES = os.path.join(os.path.dirname(HERE), "example_codes")
+
+# farklı boyutta komutlar: CALL #x ve &x birer ek word, x(Rn) kaynak + &x hedef iki
+MIXED = """\
+.text
+start:  CALL #helper
+        ADD R5, R4
+        MOV R4, &0x0200
+        CALL #helper
+helper: SUB R6, R4
+        RET
+.data
+tab:    .word 0x1111, 0x2222
+        .byte 0x33
+"""
+
+# section'a geri dönüş, ORG boşluğu ve kod üretmeyen direktifler
+LAYOUT = """\
+.ref ext
+.text
+a:      MOV #tab, R4
+        MOV 2(R4), &0x0200
+.data
+tab:    .word 0x1111
+        ORG C008
+more:   .byte 1, 2
+.text
+        .exdef other
+b:      CALL ext
+        ORG 0020
+c:      MOV @R4+, R5
+        JMP a
+.bss
+buf:    .space 2
+"""
+
+
+def check_line_table(asm, module):
+    """Tabloda satırına ait olmayan bir konumu gösteren kayıtları döner."""
+    first = {}
+    for i, no in enumerate(asm.line_numbers):
+        first.setdefault(no, i)
+    data = bytes(module.data)
+    bad = []
+    for addr, no in zip(module.lines.addrs, module.lines.lines):
+        out = asm.line_output[first[no]]
+        if addr >= BASE_ADDRS[".data"]:
+            off = addr - BASE_ADDRS[".data"]
+            ok = out is not None and not isinstance(out, (int, array)) and data[off:off + 1] == bytes(out)[:1]
+        else:
+            off = (addr - BASE_ADDRS[".text"]) // 2
+            ok = isinstance(out, array) and off < len(module.text) and module.text[off] == out[0]
+        if not ok:
+            bad.append((addr, no))
+    return bad
+
+
+class LineTableTest(unittest.TestCase):
+    def assemble(self, source, name="test.asm"):
+        asm = MSP430Assembler()
+        return asm, asm.assemble(source, name, EXAMPLES, 1, name)
+
+    def test_mixed_sizes(self):
+        asm, m = self.assemble(MIXED)
+        self.assertEqual(check_line_table(asm, m), [])
+        self.assertEqual(m.lines.lookup(BASE_ADDRS[".text"] + 2), ("test.asm", 2))
+        self.assertEqual(m.lines.lookup(BASE_ADDRS[".text"] + 4), ("test.asm", 3))
+        self.assertEqual(asm.labels["helper"].address, BASE_ADDRS[".text"] + 14)
+        # son text satırı modülün son word'ünü gösterir
+        self.assertEqual(m.lines.lookup(BASE_ADDRS[".text"] + 2 * (len(m.text) - 1)), ("test.asm", 7))
+
+    def test_pass1_addresses_match_emission(self):
+        asm, m = self.assemble(LAYOUT)
+        self.assertEqual(check_line_table(asm, m), [])
+        for i, out in enumerate(asm.line_output):
+            if out is not None and not isinstance(out, int):
+                # satır tablosu pass2 konumundan kurulur
+                self.assertEqual(m.lines.lookup(asm.source_addresses[i]), ("test.asm", i + 1), i + 1)
+        labels = {k: v.address for k, v in asm.labels.items()}
+        self.assertEqual(labels, {"a": 0x0000, "tab": 0xC000, "more": 0xC008, "b": 0x000A,
+                                  "c": 0x0020, "buf": 0xE000})
+        self.assertEqual(m.section_size(".text"), 0x0024)
+        self.assertEqual(m.section_size(".data"), 0x000A)
+        self.assertEqual(list(m.text[5:7]), [0x12B0, 0x0000])    # CALL #ext, linker yamar
+        self.assertEqual(list(m.text[7:16]), [0] * 9)             # ORG boşluğu
+
+    def test_addr2line_of_symbols(self):
+        # link çıktısında her sembolün adresi kendi label satırına düşer
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        lines = {}
+        for name in ("main_code.asm", "extra_fonc.asm"):
+            with open(os.path.join(EXAMPLES, name), encoding="utf-8") as f:
+                asm, m = self.assemble(f.read(), name)
+            write_object(os.path.join(tmp, name[:-4] + ".obj"), m)
+            for sym in asm.labels.values():
+                # label tek başına bir satırdaysa adresi sonraki komutun satırıdır
+                no = min(n for n, a in zip(asm.line_numbers, asm.source_addresses)
+                         if n >= sym.line and a == sym.address
+                         and asm.line_output[n - 1] is not None)
+                lines[sym.name] = (name, no)
+        ld = LinkEditor(tmp)
+        ld.link()
+        ld.write(os.path.join(tmp, "final.obj"))
+        table = read_line_table(os.path.join(tmp, "final.obj"))
+        self.assertTrue(ld.symbols)
+        for name, addr in ld.symbols.items():
+            self.assertEqual(table.lookup(addr), lines[name], name)
+        self.assertEqual(table.lookup(ld.symbols["end"]), ("main_code.asm", 33))
+
+    def test_examples(self):
+        for name in sorted(os.listdir(EXAMPLES)):
+            if name.endswith(".asm"):
+                with open(os.path.join(EXAMPLES, name), encoding="utf-8") as f:
+                    asm, m = self.assemble(f.read(), name)
+                self.assertEqual(check_line_table(asm, m), [], name)
+
+
+if __name__ == "__main__":
+    unittest.main()
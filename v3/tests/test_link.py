@@ -0,0 +1,239 @@
+"""
+Linker kontrolleri: relocation'lar komutun ek word'üne tam 16 bit adres
+yazar (komut sırası satır tablosundan word ofsetine çevrilir), yerel label
+referansları section yerleşimine taşınır, bellek haritası çakışmaları hata verir.
+
+    python -m pytest v3/tests
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from msp430_assembler import (DEFAULT_MEMORY_MAP, LinkEditor, MemoryRegion,  # noqa: E402
+                              assemble, read_object, write_object)
+from msp430_daemon import BuildState, handle_request  # noqa: E402
+from obj_to_bin import convert_to_bin  # noqa: E402
+
+CALLER = """\
+.def start
+.ref func, ext_var
+.text
+start:  MOV #0x1234, R4
+        CALL func
+        MOV ext_var, R5
+        MOV #table, R6
+        CALL #local
+        RET
+local:  NOP
+        RET
+.data
+table:  .word 0xBEEF
+"""
+
+CALLEE = """\
+.def func, ext_var
+.data
+pad:    .byte 1, 2
+ext_var: .word 0x5555
+.text
+        NOP
+        NOP
+func:   ADD R5, R4
+        RET
+"""
+
+
+# iki modülde aynı tablo, farklı konumlarda ve farklı komşu verilerle
+TABLE_A = """\
+.def crc_a
+.data
+crc_a:  .word 0x1021, 0x8408
+msg_a:  .byte 1, 2
+.text
+get_a:  MOV #msg_a, R4
+        MOV #crc_a, R5
+        RET
+"""
+
+TABLE_B = """\
+.def crc_b
+.data
+msg_b:  .byte 7, 8
+crc_b:  .word 0x1021, 0x8408
+.text
+get_b:  MOV #crc_b, R6
+        MOV #msg_b, R7
+        RET
+"""
+
+
+def link(*sources, memory_map=DEFAULT_MEMORY_MAP, pool_data=False):
+    ld = LinkEditor(None, memory_map=memory_map, pool_data=pool_data)
+    for i, src in enumerate(sources):
+        ld.add_module(assemble(src, f"m{i}.obj"))
+    ld.link()
+    return ld
+
+
+class RelocationTest(unittest.TestCase):
+    def test_imm_before_imported_call(self):
+        # callee önce yerleşir: .text 0x0000-0x0008, .data 0xC000-0xC004
+        ld = link(CALLEE, CALLER)
+        text = ld.global_text
+        start = ld.symbols["start"] // 2
+        self.assertEqual(ld.symbols["func"], 0x0004)
+        self.assertEqual(ld.symbols["ext_var"], 0xC002)
+        # MOV #0x1234, R4 iki word; CALL func'un ek word'ü dördüncü word
+        self.assertEqual(list(text[start:start + 4]), [0x4074, 0x1234, 0x12B0, 0x0004])
+        # mutlak operand: alt byte değil, adresin tamamı
+        self.assertEqual(list(text[start + 4:start + 6]), [0x4255, 0xC002])
+        # yerel label'lar modülün yerleşimine taşınır
+        self.assertEqual(text[start + 7], 0xC004)              # table
+        self.assertEqual(text[start + 9], 2 * start + 0x0016)  # local
+        self.assertEqual(text[text[start + 9] // 2], 0x0000)   # local: NOP
+
+    def test_relocations_survive_object_files(self):
+        m = assemble(CALLER, "caller.obj")
+        fd, path = tempfile.mkstemp(suffix=".obj")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        write_object(path, m)
+        with open(path) as f:
+            back = read_object(f, "caller.obj")
+        self.assertEqual([(r.symbol, r.section, r.offset, r.word) for r in back.relocations],
+                         [(r.symbol, r.section, r.offset, r.word) for r in m.relocations])
+        self.assertEqual([(r.symbol, r.offset, r.word) for r in m.relocations],
+                         [("func", 1, 1), ("ext_var", 2, 1), (".data", 3, 1), (".text", 4, 1)])
+
+
+class PoolingTest(unittest.TestCase):
+    def test_labeled_block_is_shared(self):
+        ld = link(TABLE_A, TABLE_B, pool_data=True)
+        self.assertEqual(ld.pool_saved, 4)
+        self.assertEqual(ld.symbols["crc_b"], ld.symbols["crc_a"])
+        # A: crc_a 0xC000, msg_a 0xC004; B'nin sadece msg_b'si yazılır
+        self.assertEqual(bytes(ld.global_data), b"\x21\x10\x08\x84\x01\x02\x07\x08")
+        text = ld.global_text
+        b = ld.modules[1].placement[".text"] // 2
+        self.assertEqual(text[b + 1], ld.symbols["crc_a"])     # #crc_b ilk kopyaya
+        self.assertEqual(text[b + 3], 0xC006)                  # #msg_b
+        self.assertEqual([p[:4] for p in ld.pooled], [(1, 2, 4, 0xC000)])
+
+    def test_without_pooling(self):
+        ld = link(TABLE_A, TABLE_B)
+        self.assertEqual(ld.pool_saved, 0)
+        self.assertEqual(ld.symbols["crc_b"], 0xC008)
+        self.assertEqual(len(ld.global_data), 12)
+
+
+class ImageTest(unittest.TestCase):
+    def test_data_lands_at_mapped_address(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        ld = link(CALLEE, CALLER)
+        ld.write(os.path.join(tmp, "final.obj"))
+        base = convert_to_bin(os.path.join(tmp, "final.obj"), os.path.join(tmp, "final.bin"))
+        with open(os.path.join(tmp, "final.bin"), "rb") as f:
+            image = f.read()
+        self.assertEqual(base, 0x0000)
+        ext_var = ld.symbols["ext_var"] - base
+        self.assertEqual(image[ext_var:ext_var + 2], b"\x55\x55")
+        # table (0xBEEF) ikinci modülün .data'sında, ext_var'dan sonra
+        table = ld.global_text[ld.symbols["start"] // 2 + 7] - base
+        self.assertEqual(image[table:table + 2], b"\xEF\xBE")
+        # .text ile .data arası doldurulur
+        self.assertEqual(image[2 * len(ld.global_text):2 * len(ld.global_text) + 2], b"\xFF\xFF")
+
+
+class MapTest(unittest.TestCase):
+    def write_map(self, ld):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        ld.write(os.path.join(tmp, "final.obj"), os.path.join(tmp, "final.map"))
+        with open(os.path.join(tmp, "final.map")) as f:
+            return f.read().splitlines()
+
+    def test_placement_sizes_and_symbols(self):
+        lines = self.write_map(link(CALLEE, CALLER))
+        self.assertIn("  FLASH      0x0000   0xC000   0x0022   0xBFDE", lines)
+        self.assertIn("  DATA       0xC000   0x2000   0x0006   0x1FFA", lines)
+        placement = lines[lines.index("SECTION PLACEMENT") + 2:lines.index("MODULES") - 1]
+        self.assertEqual(placement, ["  0x0000   0x0008   .text     m0.obj",
+                                     "  0x0008   0x001A   .text     m1.obj",
+                                     "  0xC000   0x0004   .data     m0.obj",
+                                     "  0xC004   0x0002   .data     m1.obj"])
+        self.assertIn("       26       2       0       4  m1.obj", lines)
+        # semboller adrese göre sıralı, sahibi modülüyle
+        symbols = lines[lines.index("SYMBOLS") + 2:-1]
+        self.assertEqual([l.split() for l in symbols], [["0x0004", "func", "m0.obj"],
+                                                        ["0x0008", "start", "m1.obj"],
+                                                        ["0xC002", "ext_var", "m0.obj"]])
+        self.assertNotIn("POOLED DATA", lines)
+
+    def test_pooled_blocks(self):
+        lines = self.write_map(link(TABLE_A, TABLE_B, pool_data=True))
+        i = lines.index("POOLED DATA")
+        self.assertEqual(lines[i + 2:i + 4], ["  0xC000   0x0004   m1.obj+0x0002 -> m0.obj",
+                                              "  Saved: 4 bytes"])
+
+
+class RelinkTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.state = BuildState()
+        self.put("callee", CALLEE)
+        self.put("caller", CALLER)
+
+    def put(self, name, source):
+        path = os.path.join(self.tmp, name + ".obj")
+        write_object(path, assemble(source, name + ".obj"))
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))   # aynı ns'de iki yazma
+
+    def link(self, incremental=True):
+        out = os.path.join(self.tmp, "final.obj")
+        res = handle_request(self.state, {"op": "link", "obj_dir": self.tmp, "output": out,
+                                          "incremental": incremental})
+        with open(out) as f:
+            return res["relinked"], f.read()
+
+    def test_same_size_change_is_patched(self):
+        self.assertIsNone(self.link()[0])
+        # func iki komut yer değiştirir, boyutlar aynı: sadece callee yazılır
+        self.put("callee", CALLEE.replace("        NOP\nfunc:", "func:   NOP\n       ")
+                                 .replace("0x5555", "0x6666"))
+        relinked, image = self.link()
+        self.assertEqual(relinked, ["callee.obj"])
+        self.assertEqual(image, self.link(incremental=False)[1])
+        self.assertIn("func 0x0002", image)
+        self.assertEqual(self.link()[0], [])
+
+    def test_size_change_links_from_scratch(self):
+        self.link()
+        self.put("callee", CALLEE.replace("RET", "NOP\n        RET"))
+        relinked, image = self.link()
+        self.assertIsNone(relinked)
+        self.assertEqual(image, self.link(incremental=False)[1])
+
+
+class LayoutTest(unittest.TestCase):
+    def test_overlapping_regions(self):
+        regions = (MemoryRegion("FLASH", 0x0000, 0x1000, (".text",)),
+                   MemoryRegion("DATA", 0x0800, 0x1000, (".data", ".bss")))
+        with self.assertRaisesRegex(Exception, "Overlap"):
+            link(CALLEE, memory_map=regions)
+
+    def test_region_overflow(self):
+        regions = (MemoryRegion("FLASH", 0x0000, 0x0006, (".text",)),
+                   MemoryRegion("DATA", 0xC000, 0x2000, (".data", ".bss")))
+        with self.assertRaisesRegex(Exception, "FLASH overflow"):
+            link(CALLEE, memory_map=regions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Listing kontrolleri: her satırın adresi ve ürettiği kod, uzun satırların
+devam satırları ve daemon'un yazdığı .lst dosyası.
+
+    python -m pytest v3/tests
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from msp430_assembler import MSP430Assembler  # noqa: E402
+from msp430_daemon import BuildState, handle_request  # noqa: E402
+
+SOURCE = """\
+.text
+start:  MOV #0x1234, R4 ; yorum
+        RET
+.data
+tab:    .word 1, 2, 3, 4, 5
+        .byte 7
+.bss
+buf: .space 2
+"""
+
+EXPECTED = """\
+; MSP430 listing: l.asm
+ Satır  Adres  Kod                  Kaynak
+     1                              .text
+     2  0000   4074 1234            start:  MOV #0x1234, R4 ; yorum
+     3  0004   1300                         RET
+     4                              .data
+     5  C000   0001 0002 0003 0004  tab:    .word 1, 2, 3, 4, 5
+        C008   0005
+     6  C00A   07                           .byte 7
+     7                              .bss
+     8  E000                        buf: .space 2
+"""
+
+
+class ListingTest(unittest.TestCase):
+    def test_rows(self):
+        asm = MSP430Assembler()
+        asm.assemble(SOURCE, "l.obj", ".", 1, "l.asm")
+        self.assertEqual("".join(asm.iter_listing(SOURCE.splitlines())), EXPECTED)
+
+    def test_extra_column(self):
+        asm = MSP430Assembler()
+        asm.assemble(SOURCE, "l.obj", ".", 1, "l.asm")
+        rows = list(asm.iter_listing(SOURCE.splitlines(), {1: "3"}, "Cyc"))
+        self.assertTrue(rows[1].endswith("Cyc  Kaynak\n"))
+        self.assertIn("1234            3    start:", rows[3])
+
+    def test_daemon_writes_listing(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        src = os.path.join(tmp, "l.asm")
+        with open(src, "w") as f:
+            f.write(SOURCE)
+        lst = os.path.join(tmp, "l.lst")
+        res = handle_request(BuildState(), {"op": "assemble", "path": src, "listing": lst,
+                                            "output": os.path.join(tmp, "l.obj")})
+        self.assertEqual(res["listing"], lst)
+        with open(lst) as f:
+            self.assertEqual(f.read(), EXPECTED.replace("l.asm", src, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+Editöre parça parça yükleme kontrolleri: parçalar satır sınırında kesilir,
+parça sınırına düşen UTF-8 karakterleri bölünmez, iptal okumayı durdurur.
+
+    python -m pytest v3/tests
+"""
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from msp430_ui import read_text_chunks
+except ImportError:     # tkinter kurulu değil
+    read_text_chunks = None
+
+TEXT = "".join(f"satır {i}: çığüşöİ ; yorum\n" for i in range(200)) + "son satır"
+
+
+@unittest.skipIf(read_text_chunks is None, "tkinter yok")
+class LoadChunksTest(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".asm")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(TEXT)
+        self.addCleanup(os.remove, self.path)
+
+    def test_chunks_end_at_lines(self):
+        # 7 byte: hemen her parça çok byte'lı bir karakterin ortasında biter
+        chunks = list(read_text_chunks(self.path, chunk_bytes=7))
+        self.assertEqual("".join(c[0] for c in chunks), TEXT)
+        self.assertTrue(all(text.endswith("\n") for text, _, last in chunks if not last))
+        self.assertEqual([last for _, _, last in chunks], [False] * (len(chunks) - 1) + [True])
+        self.assertEqual(chunks[-1][1], os.path.getsize(self.path))
+        self.assertEqual(len(chunks), TEXT.count("\n") + 1)
+
+    def test_cancel_stops_reading(self):
+        cancel = threading.Event()
+        it = read_text_chunks(self.path, cancel, chunk_bytes=64)
+        next(it)
+        cancel.set()
+        self.assertEqual(list(it), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Language server kontrolleri: hatalı bir bildirim döngüyü durdurmaz, artımlı
+layout baştan kurulan belgeyle aynı sonucu verir.
+
+    python -m pytest v3/tests
+"""
+import io
+import json
+import os
+import sys
+import unittest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from msp430_lsp import Document, LanguageServer  # noqa: E402
+
+EXAMPLE = os.path.join(os.path.dirname(HERE), "example_codes", "main_code.asm")
+URI = "file:///tmp/main_code.asm"
+
+
+def frame(msg):
+    body = json.dumps(msg).encode("utf-8")
+    return b"Content-Length: %d\r\n\r\n" % len(body) + body
+
+
+def read_frames(raw):
+    out = []
+    while raw:
+        head, _, raw = raw.partition(b"\r\n\r\n")
+        length = int(head.split(b":")[1])
+        out.append(json.loads(raw[:length]))
+        raw = raw[length:]
+    return out
+
+
+def change(line, text, end_line=None):
+    end = line if end_line is None else end_line
+    return {"range": {"start": {"line": line, "character": 0},
+                      "end": {"line": end, "character": 0}}, "text": text}
+
+
+def state(doc):
+    labels = {n: (s.section, s.address, s.line) for n, s in doc.labels.items()}
+    return list(doc.addresses), doc.sections, labels, sorted(doc.diagnostics)
+
+
+class NotificationTest(unittest.TestCase):
+    def test_bad_notification_keeps_loop_running(self):
+        msgs = [
+            {"jsonrpc": "2.0", "method": "textDocument/didChange",
+             "params": {"textDocument": {"uri": "file:///yok.asm", "version": 2},
+                        "contentChanges": [{"text": ""}]}},
+            {"jsonrpc": "2.0", "id": 1, "method": "shutdown"},
+            {"jsonrpc": "2.0", "method": "exit"},
+        ]
+        out = io.BytesIO()
+        server = LanguageServer(io.BytesIO(b"".join(frame(m) for m in msgs)), out)
+        self.assertEqual(server.run(), 0)
+        replies = read_frames(out.getvalue())
+        self.assertEqual(replies[0]["method"], "window/logMessage")
+        self.assertIn("yok.asm", replies[0]["params"]["message"])
+        self.assertEqual(replies[1], {"jsonrpc": "2.0", "id": 1, "result": None})
+
+
+class IncrementalLayoutTest(unittest.TestCase):
+    def setUp(self):
+        with open(EXAMPLE, encoding="utf-8") as f:
+            self.doc = Document(URI, f.read())
+
+    def apply(self, *changes):
+        first = min(self.doc.apply_change(c) for c in changes)
+        self.doc.layout(first)
+        self.assertEqual(state(self.doc), state(Document(URI, "\n".join(self.doc.lines))))
+
+    def test_insert_instruction_shifts_later_labels(self):
+        end = self.doc.labels["end"].address
+        self.apply(change(20, "        MOV #0x10, R8\n"))
+        self.assertEqual(self.doc.labels["end"].address, end + 4)
+
+    def test_section_and_label_edits(self):
+        self.apply(change(16, ".data\n"))                # .text öncesine .data
+        self.apply(change(9, "val2:   .word 1, 2\n"))    # aynı label ikinci kez
+        self.apply(change(9, "", 10))                    # ilk tanımı sil
+        self.apply(change(0, "", len(self.doc.lines) - 1))
+
+    def test_change_at_end(self):
+        self.apply(change(len(self.doc.lines) - 1, "tail:   RET"))
+        self.assertIn("tail", self.doc.labels)
+
+
+if __name__ == "__main__":
+    unittest.main()
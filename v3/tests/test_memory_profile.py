@@ -0,0 +1,55 @@
+"""
+Bellek profili kontrolleri: açıkken derleme ve link fazları ölçülür, en çok
+ayıran satırlar raporlanır; kapalıyken fazlar hiçbir şey yapmaz ve
+tracemalloc çalışmaz.
+
+    python -m pytest v3/tests
+"""
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import msp430_assembler  # noqa: E402
+from msp430_assembler import LinkEditor, MemoryProfiler, assemble, memory_phase, write_object  # noqa: E402
+
+SOURCE = ".def start\n.text\nstart:  NOP\n" + "".join(
+    f"l{i}:     MOV #0x{i:04X}, R4\n        ADD R4, R5\n" for i in range(200)) + \
+    ".data\n" + "".join(f"        .word 0x{i:04X}, 0x1234\n" for i in range(50))
+
+
+class MemoryProfileTest(unittest.TestCase):
+    def test_phases_and_report(self):
+        self.assertFalse(tracemalloc.is_tracing())
+        fd, path = tempfile.mkstemp(suffix=".obj")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        with MemoryProfiler(top=3) as prof:
+            m = assemble(SOURCE, "big.obj")
+            write_object(path, m)
+            ld = LinkEditor(None)
+            ld.add_module(m)
+            ld.link()
+        rep = prof.report()
+        phases = {p["phase"]: p for p in rep["phases"]}
+        self.assertTrue({"pass1", "pass2", "write_object", "link"} <= set(phases))
+        self.assertGreater(rep["peak"], 0)
+        for p in phases.values():
+            self.assertEqual(p["calls"], 1)
+            self.assertLessEqual(len(p["top"]), 3)
+        # pass2'nin bıraktığı (modülde kalan) bellek assembler satırlarına yazılır
+        self.assertGreater(phases["pass2"]["delta"], 0)
+        self.assertIn("msp430_assembler.py", {t["file"] for t in phases["pass2"]["top"]})
+        json.dumps(rep)
+        self.assertIn("[pass1] x1", prof.format_report())
+        # profil kapanınca tracemalloc durur, fazlar boş context'e döner
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertIs(memory_phase("link"), msp430_assembler._NO_PHASE)
+
+
+if __name__ == "__main__":
+    unittest.main()
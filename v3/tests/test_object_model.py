@@ -0,0 +1,94 @@
+"""
+Obj modeli kontrolleri: adresler bellekte düz integer'dır, hex sadece dosya
+okuma/yazmada kullanılır; tanımsız export'lar None olarak taşınır. Kayıtlar
+__slots__ kullanır, önbellek kopyaları içeriği paylaşır.
+
+    python -m pytest v3/tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from msp430_assembler import (LineTable, LinkEditor, MSP430Assembler, ObjectModule,  # noqa: E402
+                              Relocation, Section, Symbol, ZeroFill, read_object_file,
+                              write_object)
+
+SOURCE = """\
+.def start, tab
+.text
+start:  NOP
+        MOV #tab, R4
+        RET
+.data
+tab:    .word 1
+"""
+
+
+def round_trip(m):
+    fd, path = tempfile.mkstemp(suffix=".obj")
+    os.close(fd)
+    try:
+        write_object(path, m)
+        with open(path) as f:
+            text = f.read()
+        return text, read_object_file(path)
+    finally:
+        os.remove(path)
+
+
+class AddressModelTest(unittest.TestCase):
+    def test_integer_addresses(self):
+        asm = MSP430Assembler()
+        m = asm.assemble(SOURCE, "a.obj")
+        self.assertEqual({k: (v.section, v.address) for k, v in asm.labels.items()},
+                         {"start": (".text", 0x0000), "tab": (".data", 0xC000)})
+        self.assertTrue(all(type(v.address) is int for v in m.exports.values()))
+        text, back = round_trip(m)
+        self.assertIn("start 0x0000 .text\ntab 0xC000 .data\n", text)
+        self.assertEqual({k: (v.section, v.address) for k, v in back.exports.items()},
+                         {"start": (".text", 0x0000), "tab": (".data", 0xC000)})
+
+    def test_undefined_export(self):
+        m = MSP430Assembler().assemble(".def start, missing\n.text\nstart: NOP\n", "a.obj")
+        self.assertIsNone(m.exports["missing"].address)
+        text, back = round_trip(m)
+        self.assertIn("missing 0x????\n", text)
+        self.assertIsNone(back.exports["missing"].address)
+        ld = LinkEditor(None)
+        with self.assertRaisesRegex(Exception, "Undefined exported symbol missing"):
+            ld.add_module(back)
+
+    def test_linked_symbols(self):
+        ld = LinkEditor(None)
+        ld.add_module(MSP430Assembler().assemble(".def pad\n.text\npad: NOP\n.data\n.byte 1", "p.obj"))
+        ld.add_module(MSP430Assembler().assemble(SOURCE, "a.obj"))
+        ld.link()
+        self.assertEqual(ld.symbols, {"pad": 0x0000, "start": 0x0002, "tab": 0xC002})
+        self.assertEqual(ld.global_text[3], 0xC002)     # MOV #tab'ın ek word'ü
+
+
+class SlotsTest(unittest.TestCase):
+    def test_records_have_no_dict(self):
+        for obj in (Symbol("a", ".text", 0), Relocation("a", ".text", 0), Section(".text", 0),
+                    ObjectModule("m.obj"), ZeroFill(0, 2), LineTable()):
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj).__name__)
+            with self.assertRaises(AttributeError):
+                obj.extra = 1
+
+    def test_copy_shares_content(self):
+        asm = MSP430Assembler()
+        m = asm.assemble(SOURCE, "a.obj")
+        m.placement = {".text": 0x100}
+        c = m.copy()
+        for attr in ("text", "data", "bss", "exports", "relocations", "labels", "sections", "lines"):
+            self.assertIs(getattr(c, attr), getattr(m, attr), attr)
+        self.assertEqual(c.placement, {})
+        # section adları intern edilir (modüller arasında tek string nesnesi)
+        self.assertIs(asm.sections[".data"].name, sys.intern(".data"))
+
+
+if __name__ == "__main__":
+    unittest.main()
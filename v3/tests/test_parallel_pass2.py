@@ -0,0 +1,62 @@
+"""
+Paralel pass2 kontrolleri: parçalara bölünmüş kodlama seri kodlamayla aynı
+modülü üretir; eşiğin altındaki kaynaklarda process pool açılmaz.
+
+    python -m pytest v3/tests
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import msp430_assembler  # noqa: E402
+from msp430_assembler import MSP430Assembler, assemble  # noqa: E402
+
+
+def source(blocks):
+    # parça sınırlarına label'lar, extern çağrılar, yorumlar ve boş satırlar düşsün
+    out = [".def start", ".ref ext", ".text", "start:  NOP"]
+    for i in range(blocks):
+        out += [f"l{i}:     MOV #0x{i:04X}, R4",
+                "        ; yorum",
+                f"        ADD R4, R{5 + i % 8}",
+                "",
+                "        CALL ext",
+                f"        MOV #l{i}, R6",
+                f"        MOV &0x{0x200 + 2 * i:04X}, 2(R7)",
+                f"        JMP l{i}"]
+    out += ["        RET", ".data", "tab:    .word 0x1234, 0x5678"]
+    return "\n".join(out) + "\n"
+
+
+def dump(m):
+    return (list(m.text), bytes(m.data), list(m.lines.iter_rows()),
+            [(r.symbol, r.section, r.offset, r.word) for r in m.relocations],
+            {n: (s.section, s.address) for n, s in m.exports.items()})
+
+
+class ParallelPass2Test(unittest.TestCase):
+    def test_same_module_as_serial(self):
+        src = source(40)
+        spy = mock.patch.object(MSP430Assembler, "_encode_text_parallel", autospec=True,
+                                side_effect=MSP430Assembler._encode_text_parallel)
+        with mock.patch.object(msp430_assembler, "PASS2_PARALLEL_MIN_LINES", 10), \
+                mock.patch.object(msp430_assembler, "PASS2_CHUNK_LINES", 7), spy as encode:
+            parallel = assemble(src, "p.obj", workers=2)
+        encode.assert_called_once()
+        serial = assemble(src, "p.obj", workers=1)
+        self.assertEqual(dump(parallel), dump(serial))
+        self.assertGreater(len(serial.relocations), 40)
+
+    def test_small_sources_stay_serial(self):
+        def fail(*args):
+            raise AssertionError("process pool açılmamalı")
+        with mock.patch.object(MSP430Assembler, "_encode_text_parallel", fail):
+            m = assemble(source(2), "s.obj", workers=4)
+        self.assertEqual(dump(m), dump(assemble(source(2), "s.obj")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+AssemblerPool kontrolleri: bir assembler örneği art arda derlemelerde önceki
+durumu taşımaz, havuzdaki thread'ler eş zamanlı derlemede seri derlemeyle
+aynı modülleri üretir ve kendi örneklerini tekrar kullanır.
+
+    python -m pytest v3/tests
+"""
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from msp430_assembler import AssemblerPool, MSP430Assembler, assemble  # noqa: E402
+
+
+def source(i):
+    return (f".def f{i}\n.ref g\n.text\nf{i}:    MOV #0x{i:04X}, R4\n"
+            f"        CALL g\n        JMP f{i}\n.data\nv{i}:    .word 0x{i:04X}\n")
+
+
+def dump(m):
+    return (m.name, list(m.text), bytes(m.data), list(m.lines.iter_rows()),
+            [(r.symbol, r.offset) for r in m.relocations],
+            {n: s.address for n, s in m.exports.items()})
+
+
+class PoolTest(unittest.TestCase):
+    def test_instance_is_reentrant(self):
+        asm = MSP430Assembler()
+        first = dump(asm.assemble(source(1), "m1.obj"))
+        asm.assemble(source(2) + "extra:  NOP\n", "m2.obj")
+        self.assertEqual(dump(asm.assemble(source(1), "m1.obj")), first)
+        self.assertNotIn("extra", asm.labels)
+
+    def test_concurrent_matches_serial(self):
+        sources = {f"m{i}.obj": source(i) for i in range(64)}
+        with AssemblerPool(4) as pool:
+            results = pool.map(sources)
+        self.assertEqual({n: dump(m) for n, m in results.items()},
+                         {n: dump(assemble(src, n)) for n, src in sources.items()})
+
+    def test_thread_local_instances(self):
+        seen = {}
+        with AssemblerPool(2) as pool:
+            def record():
+                seen.setdefault(threading.get_ident(), set()).add(id(pool.assembler()))
+            for f in [pool.call(record) for _ in range(20)]:
+                f.result()
+        # her thread tek bir örnek kullanır
+        self.assertTrue(all(len(ids) == 1 for ids in seen.values()))
+        self.assertLessEqual(len(seen), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
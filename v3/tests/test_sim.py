@@ -0,0 +1,93 @@
+"""
+Simülatör kontrolleri: linklenmiş imajı çalıştırır; register'lar, bellek,
+cycle sayıları (user guide tabloları), satır profili, --until ve koda yazma
+sonrası önbelleğin geçersizlenmesi.
+
+    python -m pytest v3/tests
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from msp430_assembler import LinkEditor, MSP430Assembler, assemble  # noqa: E402
+from msp430_sim import Simulator  # noqa: E402
+
+# cycle'lar: MOV #x,Rn 2; ADD Rn,Rm 1; SUB #x,Rn 2; JNE 2; CALL #x 5;
+# MOV Rn,&x 4; RET 3; JMP $ 2
+PROGRAM = """\
+.def start, sub
+.text
+start:  MOV #5, R4
+        MOV #0, R5
+loop:   ADD R4, R5
+        SUB #1, R4
+        JNE loop
+        CALL #sub
+end:    JMP end
+sub:    MOV R5, &0x0200
+        RET
+"""
+
+
+class SimulatorTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def load(self, source):
+        ld = LinkEditor(None)
+        ld.add_module(MSP430Assembler().assemble(source, "s.obj", ".", 1, "s.asm"))
+        ld.link()
+        path = os.path.join(self.tmp, "final.obj")
+        ld.write(path)
+        return Simulator.from_file(path)
+
+    def test_run_and_cycles(self):
+        sim = self.load(PROGRAM)
+        self.assertEqual(sim.run(), "loop")
+        self.assertEqual((sim.regs[4], sim.regs[5], sim.read_word(0x0200)), (0, 15, 15))
+        self.assertEqual(sim.regs[1], sim.stack_top)          # CALL/RET yığını dengeler
+        self.assertEqual(sim.instructions, 21)
+        self.assertEqual(sim.cycles, 2 + 2 + 5 * (1 + 2 + 2) + 5 + 4 + 3 + 2)
+        self.assertEqual(sim.line_profile(), {"s.asm:3": 1, "s.asm:4": 1, "s.asm:5": 5,
+                                              "s.asm:6": 5, "s.asm:7": 5, "s.asm:8": 1,
+                                              "s.asm:9": 1, "s.asm:10": 1, "s.asm:11": 1})
+        # döngü gövdesi: JNE, SUB #1 ve ADD beşer kez
+        self.assertEqual([(count, cycles) for _, count, cycles, _ in sim.hot_spots(3)],
+                         [(5, 10), (5, 10), (5, 5)])
+
+    def test_until_stops_before_instruction(self):
+        sim = self.load(PROGRAM)
+        self.assertEqual(sim.run(until="sub"), "until")
+        self.assertEqual(sim.regs[0], sim.symbols["sub"])
+        self.assertEqual(sim.read_word(0x0200), 0)
+        self.assertEqual(sim.cycles, 2 + 2 + 5 * 5 + 5)
+        self.assertEqual(sim.run(max_steps=1), "limit")
+        self.assertEqual(sim.read_word(0x0200), 15)
+
+    def test_code_write_invalidates_cache(self):
+        word = assemble(".text\nMOV R4, R6\n", "w.obj").text[0]
+        sim = self.load(f"""\
+.def start
+.text
+start:  MOV #7, R4
+        MOV #0, R6
+        MOV #0, R7
+patch:  NOP
+        ADD #1, R7
+        MOV #0x{word:04X}, &patch
+        CMP #2, R7
+        JNE patch
+end:    JMP end
+""")
+        self.assertEqual(sim.run(), "loop")
+        # ikinci turda NOP'un yerine yazılan MOV R4, R6 çalışır
+        self.assertEqual((sim.regs[6], sim.regs[7]), (7, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Çapraz referans indeksi kontrolleri: tanım ve referans sorguları, bir modülün
+yeniden derlenmesinin sadece kendi kayıtlarını değiştirmesi ve modül başına
+kayıt dosyalarının birleştirilerek okunması.
+
+    python -m pytest v3/tests
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from msp430_assembler import XREF_DIR, MSP430Assembler, XrefIndex  # noqa: E402
+from msp430_daemon import BuildState, handle_request  # noqa: E402
+
+MAIN = """\
+.def start
+.ref helper
+.text
+start:  CALL helper
+        MOV #tab, R4
+        CALL helper
+.data
+tab:    .word 1
+"""
+
+HELPER = """\
+.def helper
+.text
+helper: RET
+"""
+
+
+def module(source, name):
+    return MSP430Assembler().assemble(source, name)
+
+
+class XrefTest(unittest.TestCase):
+    def setUp(self):
+        self.idx = XrefIndex()
+        self.idx.update_module("main.asm", "main.asm", module(MAIN, "main.obj"))
+        self.idx.update_module("helper.asm", "helper.asm", module(HELPER, "helper.obj"))
+
+    def test_definitions_and_references(self):
+        self.assertEqual(self.idx.definitions("helper"), [("helper.asm", 3, 0x0000, ".text")])
+        self.assertEqual(self.idx.references("helper"), [("main.asm", 4, 0x0000), ("main.asm", 6, 0x0008)])
+        self.assertEqual(self.idx.definitions("tab"), [("main.asm", 8, 0xC000, ".data")])
+        self.assertEqual(self.idx.symbols(), ["helper", "start", "tab"])
+        self.assertEqual(self.idx.lookup("yok"), {"symbol": "yok", "definitions": [], "references": []})
+
+    def test_update_replaces_only_that_module(self):
+        self.idx.update_module("main.asm", "main.asm",
+                               module(MAIN.replace("        CALL helper\n.data", ".data"), "main.obj"))
+        self.assertEqual(self.idx.references("helper"), [("main.asm", 4, 0x0000)])
+        self.assertEqual(len(self.idx.definitions("helper")), 1)
+        self.idx.remove("helper.asm")
+        self.assertEqual(self.idx.definitions("helper"), [])
+        self.assertNotIn("helper", self.idx._defs)
+
+    def test_per_module_records(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, XREF_DIR)
+        self.idx.save(path)
+        self.assertEqual(len(os.listdir(path)), 2)
+        # tek modülün kaydı diğerlerini okumadan yazılır
+        m = module(HELPER.replace("helper: RET", "        NOP\nhelper: RET"), "helper.obj")
+        XrefIndex.update_file(tmp, "helper.asm", "helper.asm", m.labels, m.sections)
+        loaded = XrefIndex.load(path)
+        self.assertEqual(loaded.definitions("helper"), [("helper.asm", 4, 0x0002, ".text")])
+        self.assertEqual(loaded.references("helper"), self.idx.references("helper"))
+        # daemon aynı kayıtları okur
+        self.assertEqual(handle_request(BuildState(), {"op": "xref", "obj_dir": tmp, "symbol": "start"}),
+                         loaded.lookup("start"))
+
+
+if __name__ == "__main__":
+    unittest.main()